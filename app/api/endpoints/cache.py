@@ -1,13 +1,29 @@
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
-from fastapi.responses import JSONResponse
-
+import json
+from typing import TYPE_CHECKING, List, Optional
+
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, UploadFile, status
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+
+from app.core.config import settings
+from app.core.http_cache import CachedResponse, conditional_response, not_modified
+from app.core.inference_client import backend_snapshot
+from app.core.inference_executor import inference_executor
+from app.core.job_queue import JobQueue
+from app.core.local_cache import local_cache
 from app.core.redis_client import RedisService, get_redis_service
-from app.services.inference_service import InferenceService
+from app.schemas.cache import CacheMultiSet
+
+if TYPE_CHECKING:
+    from app.services.inference_service import InferenceService
 
 router = APIRouter(tags=["Cache & Inference API"])
 
 
-def get_inference_service(redis_service: RedisService = Depends(get_redis_service)) -> InferenceService:
+def get_inference_service(redis_service: RedisService = Depends(get_redis_service)) -> "InferenceService":
+    # The inference stack (numpy, OpenCV, the backend) is imported on the first inference
+    # request, so importing the app and serving CRUD/cache routes never pays for it.
+    from app.services.inference_service import InferenceService
+
     return InferenceService(redis_service=redis_service)
 
 
@@ -19,26 +35,155 @@ async def set_cache_value(key: str, value: str, redis_service: RedisService = De
 
 
 @router.get("/cache/get/{key}", summary="Отримати значення з Redis (Monitor enabled)")
-async def get_cache_value(key: str, redis_service: RedisService = Depends(get_redis_service)):
+async def get_cache_value(key: str, request: Request, redis_service: RedisService = Depends(get_redis_service)):
+
+    async def render() -> CachedResponse:
+        value = await redis_service.get(key)
+
+        if value is None:
+
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Key '{key}' not found in cache")
+
+        return CachedResponse.build(json.dumps({"key": key, "value": value}).encode())
+
+    return await conditional_response(request, render)
+
+
+@router.post("/cache/mset", summary="Встановити кілька значень за один запит до Redis (TTL на ключ)")
+async def set_cache_values(payload: CacheMultiSet, redis_service: RedisService = Depends(get_redis_service)):
 
-    value = await redis_service.get(key)
+    ex = {key: payload.ttl.get(key, payload.ex) for key in payload.values} if payload.ttl else payload.ex
+    await redis_service.set_many(payload.values, ex=ex)
+    return {"message": f"{len(payload.values)} keys set successfully"}
 
-    if value is None:
 
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Key '{key}' not found in cache")
+@router.get("/cache/mget", summary="Отримати кілька значень з Redis одним MGET")
+async def get_cache_values(keys: List[str] = Query(...), redis_service: RedisService = Depends(get_redis_service)):
 
-    return {"key": key, "value": value}
+    values = await redis_service.mget(keys)
+    return {"values": dict(zip(keys, values)), "missing": [key for key, value in zip(keys, values) if value is None]}
+
+
+@router.get("/cache/local/stats", summary="Статистика локального L1 кешу воркера (hit/miss/eviction)")
+async def local_cache_stats():
+
+    return local_cache.snapshot()
 
 
 @router.post("/infer/raw", summary="Виконати Inference (Roboflow) та кешувати сирий результат")
-async def infer_raw(file: UploadFile = File(...), service: InferenceService = Depends(get_inference_service)):
+async def infer_raw(file: UploadFile = File(...), service: "InferenceService" = Depends(get_inference_service)):
 
-    data = await service.run_inference_with_cache(file)
-    return JSONResponse(content=data)
+    if settings.FAST_SERIALIZATION:
+        body, content_hash = await service.run_inference_json(file)
+    else:
+        data = await service.run_inference_with_cache(file)
+        body, content_hash = JSONResponse(content=data).body, data["content_hash"]
 
+    # Weak: the same image always maps to this result, but a refresh may change its bytes.
+    return Response(content=body, media_type="application/json", headers={"ETag": f'W/"{content_hash}"'})
 
-@router.post("/infer/summary", summary="Виконати Inference, кешувати та повернути зведення")
-async def infer_processed(file: UploadFile = File(...), service: InferenceService = Depends(get_inference_service)):
 
-    summary = await service.run_processed_with_cache(file)
+@router.post("/infer/summary", summary="Виконати Inference, кешувати та повернути зведення")
+async def infer_processed(
+    file: UploadFile = File(...),
+    min_confidence: Optional[float] = Query(None, ge=0, le=1, description="Відкинути детекції з меншою впевненістю"),
+    iou: Optional[float] = Query(None, gt=0, le=1, description="Поріг IoU для додаткового NMS по класах"),
+    heatmap_grid: Optional[int] = Query(None, ge=1, le=64, description="Розмір сітки карти щільності"),
+    details: bool = Query(True, description="Включити впевненість кожної детекції"),
+    service: "InferenceService" = Depends(get_inference_service),
+):
+
+    from app.core.prediction_summary import SummaryOptions
+
+    options = SummaryOptions(min_confidence=min_confidence, iou=iou, heatmap_grid=heatmap_grid, details=details)
+    summary = await service.run_processed_with_cache(file, options)
     return JSONResponse(content=summary)
+
+
+@router.post(
+    "/infer/batch", summary="Пакетний Inference: кеш для кожного файлу, результати NDJSON у порядку завершення"
+)
+async def infer_batch(
+    files: List[UploadFile] = File(default=[]),
+    archive: Optional[UploadFile] = File(default=None),
+    service: "InferenceService" = Depends(get_inference_service),
+):
+
+    items = await service.read_batch(files, archive)
+
+    async def ndjson_lines():
+        async for line in service.stream_batch(items):
+            yield json.dumps(line) + "\n"
+
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+
+
+@router.get("/infer/executor", summary="Стан пулу виконання Inference (черга, час очікування та виконання)")
+async def inference_executor_stats():
+
+    return inference_executor.snapshot()
+
+
+@router.get("/infer/backend", summary="Активний бекенд Inference (roboflow/local) та статистика мікробатчів")
+async def inference_backend_stats():
+
+    return backend_snapshot()
+
+
+def get_job_queue(redis_service: RedisService = Depends(get_redis_service)) -> JobQueue:
+    return JobQueue(redis_service)
+
+
+@router.post(
+    "/infer/jobs",
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Поставити Inference у чергу: повертає id задачі одразу, результат через опитування",
+)
+async def submit_inference_job(
+    file: UploadFile = File(...), service: "InferenceService" = Depends(get_inference_service)
+):
+
+    job = await service.submit_job(file)
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED, content=job.to_dict(), headers={"Location": f"/infer/jobs/{job.id}"}
+    )
+
+
+@router.get("/infer/jobs/{job_id}", summary="Стан задачі Inference (wait > 0 — long-poll до завершення)")
+async def get_inference_job(
+    job_id: str,
+    request: Request,
+    wait: float = Query(0, ge=0, le=settings.JOB_MAX_WAIT),
+    jobs: JobQueue = Depends(get_job_queue),
+):
+
+    job = await (jobs.wait(job_id, wait) if wait else jobs.get(job_id))
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Job '{job_id}' not found")
+
+    # Every state change bumps updated_at, so pollers get 304 until something happens.
+    headers = {"ETag": f'"{job.id}-{job.attempts}-{job.updated_at}"', "Cache-Control": settings.HTTP_CACHE_CONTROL}
+    return not_modified(request, headers["ETag"], headers) or JSONResponse(content=job.to_dict(), headers=headers)
+
+
+@router.get("/infer/jobs/{job_id}/events", summary="Потік змін стану задачі Inference (Server-Sent Events)")
+async def stream_inference_job(job_id: str, jobs: JobQueue = Depends(get_job_queue)):
+
+    job = await jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Job '{job_id}' not found")
+
+    async def events():
+        current = job
+        last_status = None
+        while current is not None:
+            if current.status != last_status:
+                last_status = current.status
+                yield f"event: {current.status}\ndata: {json.dumps(current.to_dict())}\n\n"
+            else:
+                yield ": keep-alive\n\n"
+            if current.done:
+                return
+            current = await jobs.wait(job_id, settings.JOB_MAX_WAIT)
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
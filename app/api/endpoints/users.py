@@ -1,40 +1,136 @@
-from fastapi import APIRouter, Depends, status
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, Query, Request, status
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db_session
+from app.core.config import settings
+from app.core.database import get_db_session, get_read_session
+from app.core.http_cache import CachedResponse, ResponseCache, conditional_response
+from app.core.redis_client import get_redis_service, redis_manager
+from app.core.serialization import model_response
 from app.repositories.user_repo import UserRepository
-from app.schemas.user import UserCreate, UserRead, UserUpdate
+from app.schemas.user import UserBulkDelete, UserBulkResult, UserBulkUpdate, UserCreate, UserRead, UserUpdate
+from app.services.user_cache import UserCache
 from app.services.user_service import UserService
 
 router = APIRouter(prefix="/users", tags=["Users (SQL CRUD)"])
 
+USER_LIST = TypeAdapter(list[UserRead])
+
+
+async def get_user_cache() -> Optional[UserCache]:
+    # Users are served straight from the database when Redis is unavailable.
+    if not settings.USER_CACHE_ENABLED or redis_manager.client is None:
+        return None
+    return UserCache(await get_redis_service(), ttl=settings.USER_CACHE_TTL, list_ttl=settings.USER_LIST_CACHE_TTL)
+
 
-def get_user_service(session: AsyncSession = Depends(get_db_session)):
-    repo = UserRepository(session)
-    return UserService(repo)
+def get_user_service(
+    session: AsyncSession = Depends(get_db_session),
+    read_session: Optional[AsyncSession] = Depends(get_read_session),
+    cache: Optional[UserCache] = Depends(get_user_cache),
+):
+    repo = UserRepository(session, read_session)
+    return UserService(repo, cache)
 
 
 @router.post("/", response_model=UserRead, status_code=status.HTTP_201_CREATED)
 async def create_user(user_data: UserCreate, service: UserService = Depends(get_user_service)):
-    return await service.create_user(user_data)
+    return model_response(await service.create_user(user_data), status.HTTP_201_CREATED)
 
 
-@router.get("/", response_model=list[UserRead])
-async def read_users(skip: int = 0, limit: int = 100, service: UserService = Depends(get_user_service)):
+@router.post("/bulk", response_model=UserBulkResult, summary="Масове створення або оновлення користувачів за email")
+async def bulk_upsert_users(
+    users: list[UserCreate],
+    on_conflict: Literal["update", "skip"] = "update",
+    use_copy: bool = Query(False, description="Імпорт через PostgreSQL COPY для дуже великих обсягів"),
+    service: UserService = Depends(get_user_service),
+):
+    return model_response(await service.bulk_upsert_users(users, on_conflict, use_copy))
+
+
+@router.patch("/bulk", response_model=UserBulkResult, summary="Масове оновлення користувачів за id")
+async def bulk_update_users(items: list[UserBulkUpdate], service: UserService = Depends(get_user_service)):
+    return model_response(await service.bulk_update_users(items))
 
-    return await service.get_all_users(skip, limit)
+
+@router.post("/bulk/delete", response_model=UserBulkResult, summary="Масове видалення користувачів за id")
+async def bulk_delete_users(payload: UserBulkDelete, service: UserService = Depends(get_user_service)):
+    return model_response(await service.bulk_delete_users(payload.ids))
+
+
+def get_response_cache(cache: Optional[UserCache] = Depends(get_user_cache)) -> Optional[ResponseCache]:
+    return None if cache is None else ResponseCache(cache.redis)
+
+
+@router.get("/", response_model=list[UserRead])
+async def read_users(
+    request: Request,
+    skip: int = Query(0, ge=0, description="Застарілий офсетний режим, використовуйте cursor"),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="Значення заголовка X-Next-Cursor з попередньої сторінки"),
+    is_active: Optional[bool] = None,
+    email_prefix: Optional[str] = None,
+    service: UserService = Depends(get_user_service),
+    cache: Optional[UserCache] = Depends(get_user_cache),
+    response_cache: Optional[ResponseCache] = Depends(get_response_cache),
+):
+    async def render() -> CachedResponse:
+        if skip and cursor is None:
+            users, headers = await service.get_all_users(skip, limit, is_active, email_prefix), {}
+        else:
+            users, next_cursor = await service.get_users_page(cursor, limit, is_active, email_prefix)
+            headers = {"X-Next-Cursor": next_cursor} if next_cursor else {}
+        return CachedResponse.build(USER_LIST.dump_json(users), headers)
+
+    params = {"skip": skip, "limit": limit, "cursor": cursor, "is_active": is_active, "email_prefix": email_prefix}
+    key = await cache.list_response_key(params) if cache else None
+    return await conditional_response(request, render, response_cache, key)
+
+
+@router.get("/export", summary="Потоковий експорт усіх користувачів (NDJSON або CSV)")
+async def export_users(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    is_active: Optional[bool] = None,
+    email_prefix: Optional[str] = None,
+    service: UserService = Depends(get_user_service),
+):
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        service.export_users(format, is_active, email_prefix),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="users.{format}"'},
+    )
+
+
+@router.get("/by-email/{email}", response_model=UserRead, summary="Отримати користувача за email (з кешем)")
+async def read_user_by_email(email: str, service: UserService = Depends(get_user_service)):
+
+    return model_response(await service.get_user_by_email(email))
 
 
 @router.get("/{user_id}", response_model=UserRead)
-async def read_user(user_id: int, service: UserService = Depends(get_user_service)):
+async def read_user(
+    user_id: int,
+    request: Request,
+    service: UserService = Depends(get_user_service),
+    cache: Optional[UserCache] = Depends(get_user_cache),
+    response_cache: Optional[ResponseCache] = Depends(get_response_cache),
+):
+    # A conditional request whose ETag still matches is answered from Redis without the database.
+    async def render() -> CachedResponse:
+        return CachedResponse.build((await service.get_user_by_id(user_id)).model_dump_json().encode())
 
-    return await service.get_user_by_id(user_id)
+    key = await cache.response_key(user_id) if cache else None
+    return await conditional_response(request, render, response_cache, key)
 
 
 @router.put("/{user_id}", response_model=UserRead)
 async def update_user(user_id: int, user_data: UserUpdate, service: UserService = Depends(get_user_service)):
 
-    return await service.update_user(user_id, user_data)
+    return model_response(await service.update_user(user_id, user_data))
 
 
 @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
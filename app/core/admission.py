@@ -0,0 +1,267 @@
+import logging
+import math
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, Optional, Tuple
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from starlette.requests import Request
+
+from app.core.config import settings
+from app.core.inference_executor import inference_executor
+from app.core.metrics import ADMISSION_REJECTIONS
+from app.core.redis_client import redis_manager
+
+logger = logging.getLogger("app.admission")
+
+# KEYS[1] bucket hash; ARGV: rate, burst, now, cost. Returns {allowed, tokens left, retry after}.
+# Numbers are returned as strings because Lua numbers are truncated to integers on the way out.
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local cost = tonumber(ARGV[4])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+local retry_after = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+else
+    retry_after = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return {allowed, tostring(tokens), tostring(retry_after)}
+"""
+
+BUCKET_KEY = "ratelimit:{}:{{{}}}"
+
+
+class AdmissionRejected(Exception):
+
+    def __init__(self, status_code: int, reason: str, detail: str, retry_after: float):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.reason = reason
+        self.detail = detail
+        self.retry_after = max(1, math.ceil(retry_after))
+
+
+@dataclass
+class TokenBucket:
+    rate: float
+    burst: float
+    tokens: float
+    updated: float
+
+    def take(self, now: float, cost: float = 1.0) -> float:
+        self.tokens = min(self.burst, self.tokens + max(0.0, now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= cost:
+            self.tokens -= cost
+            return 0.0
+        return (cost - self.tokens) / self.rate
+
+
+class RateLimiter:
+    # Redis holds the authoritative bucket, shared by every worker. Locally each worker keeps the
+    # time until which a client is known to be denied, so a throttled client is rejected without
+    # a Redis round trip; if Redis is unavailable a per-worker bucket takes over.
+
+    def __init__(
+        self,
+        client_factory: Callable[[], Optional[Redis]],
+        limits: Dict[str, Dict[str, float]],
+        max_clients: int = 10_000,
+    ):
+        self.client_factory = client_factory
+        self.limits = limits
+        self.max_clients = max_clients
+        self._denied_until: "OrderedDict[Tuple[str, str], float]" = OrderedDict()
+        self._local: "OrderedDict[Tuple[str, str], TokenBucket]" = OrderedDict()
+        self._script = None
+        self._script_client: Optional[Redis] = None
+
+    async def check(self, route_class: str, client_id: str) -> float:
+        limit = self.limits.get(route_class)
+        if not limit:
+            return 0.0
+
+        key = (route_class, client_id)
+        now = time.time()
+        denied_until = self._denied_until.get(key)
+        if denied_until is not None:
+            if denied_until > now:
+                return denied_until - now
+            del self._denied_until[key]
+
+        retry_after = await self._check_redis(route_class, client_id, limit, now)
+        if retry_after is None:
+            retry_after = self._local_bucket(key, limit, now).take(now)
+
+        if retry_after > 0:
+            self._remember(self._denied_until, key, now + retry_after)
+        return retry_after
+
+    async def _check_redis(
+        self, route_class: str, client_id: str, limit: Dict[str, float], now: float
+    ) -> Optional[float]:
+        client = self.client_factory()
+        if client is None:
+            return None
+
+        if self._script_client is not client:
+            # EVALSHA after the first call; redis-py reloads the script if the server lost it.
+            self._script, self._script_client = client.register_script(TOKEN_BUCKET_SCRIPT), client
+        try:
+            allowed, _, retry_after = await self._script(
+                keys=[BUCKET_KEY.format(route_class, client_id)], args=[limit["rate"], limit["burst"], now, 1]
+            )
+        except RedisError as e:
+            logger.warning(f"Rate limiter fell back to the local bucket: {e}")
+            return None
+        return 0.0 if int(allowed) else float(retry_after)
+
+    def _local_bucket(self, key: Tuple[str, str], limit: Dict[str, float], now: float) -> TokenBucket:
+        bucket = self._local.get(key)
+        if bucket is None:
+            bucket = TokenBucket(limit["rate"], limit["burst"], limit["burst"], now)
+        self._remember(self._local, key, bucket)
+        return bucket
+
+    def _remember(self, entries: OrderedDict, key: Tuple[str, str], value) -> None:
+        entries[key] = value
+        entries.move_to_end(key)
+        while len(entries) > self.max_clients:
+            entries.popitem(last=False)
+
+
+class RecentLatency:
+    # Latencies of the last `window` seconds. Unlike the cumulative monitor histograms this
+    # forgets, so shedding stops once the slow requests have aged out of the window.
+
+    def __init__(self, window: float, refresh_interval: float = 1.0):
+        self.window = window
+        self.refresh_interval = refresh_interval
+        self._samples: Deque[Tuple[float, float]] = deque(maxlen=2048)
+        self._p95_ms = 0.0
+        self._computed_at = 0.0
+
+    def record(self, seconds: float, now: Optional[float] = None) -> None:
+        self._samples.append((time.monotonic() if now is None else now, seconds))
+
+    def p95_ms(self, now: Optional[float] = None) -> float:
+        now = time.monotonic() if now is None else now
+        if now - self._computed_at < self.refresh_interval:
+            return self._p95_ms
+
+        while self._samples and self._samples[0][0] < now - self.window:
+            self._samples.popleft()
+        durations = sorted(seconds for _, seconds in self._samples)
+        self._p95_ms = durations[int(0.95 * (len(durations) - 1))] * 1000 if durations else 0.0
+        self._computed_at = now
+        return self._p95_ms
+
+
+class AdmissionController:
+
+    def __init__(
+        self,
+        route_classes: Dict[str, str],
+        rate_limiter: RateLimiter,
+        concurrency: Dict[str, int],
+        shed_p95_ms: Dict[str, float],
+        shed_queue_depth: Optional[int],
+        shed_retry_after: int,
+        latency_window: float,
+        queue_depth: Callable[[], int] = lambda: inference_executor.queue_depth,
+    ):
+        self.prefixes = sorted(route_classes.items(), key=lambda item: len(item[0]), reverse=True)
+        self.rate_limiter = rate_limiter
+        self.concurrency = concurrency
+        self.shed_p95_ms = shed_p95_ms
+        self.shed_queue_depth = shed_queue_depth
+        self.shed_retry_after = shed_retry_after
+        self.queue_depth = queue_depth
+        self.in_flight: Dict[str, int] = {}
+        self.latency: Dict[str, RecentLatency] = {name: RecentLatency(latency_window) for name in shed_p95_ms}
+
+    def classify(self, path: str) -> Optional[str]:
+        for prefix, route_class in self.prefixes:
+            if path == prefix or path.startswith(prefix.rstrip("/") + "/"):
+                return route_class
+        return None
+
+    async def admit(self, route_class: str, client_id: str) -> None:
+        # In-process checks first; only the rate limit may need a Redis round trip.
+        self._check_load(route_class)
+
+        limit = self.concurrency.get(route_class)
+        if limit is not None and self.in_flight.get(route_class, 0) >= limit:
+            self._reject(503, route_class, "concurrency", f"Too many concurrent '{route_class}' requests", 1)
+
+        retry_after = await self.rate_limiter.check(route_class, client_id)
+        if retry_after > 0:
+            self._reject(429, route_class, "rate_limit", "Rate limit exceeded", retry_after)
+
+        self.in_flight[route_class] = self.in_flight.get(route_class, 0) + 1
+
+    def release(self, route_class: str, seconds: float) -> None:
+        self.in_flight[route_class] -= 1
+        if route_class in self.latency:
+            self.latency[route_class].record(seconds)
+
+    def _check_load(self, route_class: str) -> None:
+        threshold = self.shed_p95_ms.get(route_class)
+        if threshold is not None and self.latency[route_class].p95_ms() > threshold:
+            self._reject(
+                503,
+                route_class,
+                "latency",
+                f"'{route_class}' is overloaded (p95 above {threshold:.0f}ms)",
+                self.shed_retry_after,
+            )
+        if route_class == "inference" and self.shed_queue_depth is not None:
+            if self.queue_depth() >= self.shed_queue_depth:
+                self._reject(503, route_class, "queue_depth", "Inference queue is saturated", self.shed_retry_after)
+
+    @staticmethod
+    def _reject(status_code: int, route_class: str, reason: str, detail: str, retry_after: float) -> None:
+        ADMISSION_REJECTIONS.labels(route_class=route_class, reason=reason).inc()
+        raise AdmissionRejected(status_code, reason, detail, retry_after)
+
+    def snapshot(self) -> dict:
+        return {
+            route_class: {
+                "in_flight": self.in_flight.get(route_class, 0),
+                "concurrency_limit": self.concurrency.get(route_class),
+                "rate_limit": self.rate_limiter.limits.get(route_class),
+                "p95_ms": round(self.latency[route_class].p95_ms(), 1) if route_class in self.latency else None,
+            }
+            for route_class in sorted({route_class for _, route_class in self.prefixes})
+        }
+
+
+def client_identity(request: Request) -> str:
+    if settings.ADMISSION_TRUST_FORWARDED:
+        forwarded = request.headers.get("X-Forwarded-For")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+
+admission_controller = AdmissionController(
+    route_classes=settings.ADMISSION_ROUTE_CLASSES,
+    rate_limiter=RateLimiter(lambda: redis_manager.client, settings.ADMISSION_RATE_LIMITS),
+    concurrency=settings.ADMISSION_CONCURRENCY,
+    shed_p95_ms=settings.ADMISSION_SHED_P95_MS,
+    shed_queue_depth=settings.ADMISSION_SHED_QUEUE_DEPTH,
+    shed_retry_after=settings.ADMISSION_SHED_RETRY_AFTER,
+    latency_window=settings.ADMISSION_LATENCY_WINDOW,
+)
@@ -0,0 +1,142 @@
+import json
+import logging
+import zlib
+from typing import Any, Callable, Dict, Tuple, Union
+
+from app.core.config import settings
+
+logger = logging.getLogger("app.cache_codec")
+
+# 0xC1 is unused in msgpack and can never start valid UTF-8, so tagged values cannot be
+# confused with legacy JSON entries written before the codec layer existed.
+MAGIC = b"\xc1"
+
+Encoder = Callable[[Any], bytes]
+Decoder = Callable[[bytes], Any]
+
+
+def _json_serializer() -> Tuple[Encoder, Decoder]:
+    return (lambda obj: json.dumps(obj, separators=(",", ":")).encode()), json.loads
+
+
+def _orjson_serializer() -> Tuple[Encoder, Decoder]:
+    import orjson
+
+    return orjson.dumps, orjson.loads
+
+
+def _msgpack_serializer() -> Tuple[Encoder, Decoder]:
+    import msgpack
+
+    return (lambda obj: msgpack.packb(obj, use_bin_type=True)), (lambda data: msgpack.unpackb(data, raw=False))
+
+
+def _zlib_compressor() -> Tuple[Encoder, Decoder]:
+    return (lambda data: zlib.compress(data, 1)), zlib.decompress
+
+
+def _zstd_compressor() -> Tuple[Encoder, Decoder]:
+    import zstandard
+
+    return zstandard.ZstdCompressor(level=3).compress, zstandard.ZstdDecompressor().decompress
+
+
+def _lz4_compressor() -> Tuple[Encoder, Decoder]:
+    import lz4.frame
+
+    return lz4.frame.compress, lz4.frame.decompress
+
+
+# The ids are persisted in every stored value: append new entries, never renumber.
+SERIALIZERS: Dict[str, Tuple[int, Callable[[], Tuple[Encoder, Decoder]]]] = {
+    "json": (1, _json_serializer),
+    "orjson": (2, _orjson_serializer),
+    "msgpack": (3, _msgpack_serializer),
+}
+COMPRESSORS: Dict[str, Tuple[int, Callable[[], Tuple[Encoder, Decoder]]]] = {
+    "none": (0, lambda: (bytes, bytes)),
+    "zlib": (1, _zlib_compressor),
+    "zstd": (2, _zstd_compressor),
+    "lz4": (3, _lz4_compressor),
+}
+
+
+def _load(registry: dict, name: str, fallback: str, kind: str) -> Tuple[int, Encoder, Decoder]:
+    if name not in registry:
+        raise ValueError(f"Unknown cache {kind} '{name}', expected one of {sorted(registry)}")
+
+    codec_id, factory = registry[name]
+    try:
+        return (codec_id, *factory())
+    except ImportError:
+        logger.warning(f"Cache {kind} '{name}' is not installed, falling back to '{fallback}'")
+        codec_id, factory = registry[fallback]
+        return (codec_id, *factory())
+
+
+class CacheCodec:
+
+    def __init__(
+        self, serializer: str = "json", compression: str = "none", compress_threshold: int = 1024, binary=False
+    ):
+        self.binary = binary
+        self.compress_threshold = compress_threshold
+
+        if not binary and (serializer == "msgpack" or compression != "none"):
+            logger.warning("Binary cache formats need REDIS_BINARY_SAFE=true, storing plain JSON instead")
+            serializer, compression = ("orjson" if serializer == "orjson" else "json"), "none"
+
+        self.serializer_id, self._serialize, _ = _load(SERIALIZERS, serializer, "json", "serializer")
+        self.compressor_id, self._compress, _ = _load(COMPRESSORS, compression, "zlib", "compression")
+
+        self._deserializers: Dict[int, Decoder] = {}
+        self._decompressors: Dict[int, Decoder] = {}
+
+    def encode(self, obj: Any) -> Union[str, bytes]:
+        payload = self._serialize(obj)
+        if not self.binary:
+            return payload.decode()
+
+        compressor_id = 0
+        if self.compressor_id and len(payload) >= self.compress_threshold:
+            payload = self._compress(payload)
+            compressor_id = self.compressor_id
+
+        return MAGIC + bytes((self.serializer_id, compressor_id)) + payload
+
+    def decode(self, raw: Union[str, bytes]) -> Any:
+        if isinstance(raw, str) or not raw.startswith(MAGIC):
+            return json.loads(raw)
+
+        serializer_id, compressor_id = raw[1], raw[2]
+        payload = memoryview(raw)[3:]
+        if compressor_id:
+            payload = self._decompressor(compressor_id)(payload)
+
+        return self._deserializer(serializer_id)(bytes(payload))
+
+    def _deserializer(self, codec_id: int) -> Decoder:
+        if codec_id not in self._deserializers:
+            self._deserializers[codec_id] = self._lookup(SERIALIZERS, codec_id)[1]
+        return self._deserializers[codec_id]
+
+    def _decompressor(self, codec_id: int) -> Decoder:
+        if codec_id not in self._decompressors:
+            self._decompressors[codec_id] = self._lookup(COMPRESSORS, codec_id)[1]
+        return self._decompressors[codec_id]
+
+    @staticmethod
+    def _lookup(registry: dict, codec_id: int) -> Tuple[Encoder, Decoder]:
+        # Values written by another worker may use a codec this worker is not configured with.
+        for registered_id, factory in registry.values():
+            if registered_id == codec_id:
+                return factory()
+        raise ValueError(f"Unknown cache codec id {codec_id}")
+
+
+cache_codec = CacheCodec(
+    serializer=settings.CACHE_SERIALIZER,
+    compression=settings.CACHE_COMPRESSION,
+    compress_threshold=settings.CACHE_COMPRESS_THRESHOLD,
+    binary=settings.REDIS_BINARY_SAFE,
+)
@@ -0,0 +1,182 @@
+import asyncio
+import logging
+import math
+import random
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.core.metrics import record_cache_lookup
+from app.core.redis_client import RedisService
+from app.core.single_flight import SingleFlight
+
+logger = logging.getLogger("app.cache_policy")
+
+ENVELOPE_MARKER = "__swr__"
+
+FRESH = "fresh"
+STALE = "stale"
+EXPIRED = "expired"
+
+Fetch = Callable[[], Awaitable[Any]]
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    # Same model as HTTP Cache-Control: an entry is fresh for `soft_ttl` seconds, then served
+    # while one background refresh runs for `stale_while_revalidate` more seconds. After that it
+    # is refreshed in the foreground, and kept until `hard_ttl` only to answer when the upstream
+    # fails (if `serve_stale_on_error`).
+    soft_ttl: float = 60.0
+    stale_while_revalidate: float = 60.0
+    hard_ttl: int = 3600
+    # XFetch: refresh early with a probability that grows as expiry nears and with how long
+    # the value took to compute. 0 disables early refresh.
+    beta: float = 1.0
+    serve_stale_on_error: bool = True
+
+
+DEFAULT_POLICIES: Dict[str, CachePolicy] = {
+    "cat": CachePolicy(soft_ttl=60, stale_while_revalidate=240, hard_ttl=3600),
+    "inference": CachePolicy(soft_ttl=3600, stale_while_revalidate=600, hard_ttl=86400),
+}
+
+
+def cache_policy(family: str) -> CachePolicy:
+    defaults = asdict(DEFAULT_POLICIES.get(family, CachePolicy()))
+    return CachePolicy(**{**defaults, **settings.CACHE_POLICIES.get(family, {})})
+
+
+@dataclass
+class CacheEntry:
+    value: Any
+    created_at: Optional[float] = None
+    compute_time: float = 0.0
+
+    def state(self, policy: CachePolicy, now: Optional[float] = None) -> str:
+        # Entries written before this envelope existed carry no timestamp; Redis expiry bounds them.
+        if self.created_at is None:
+            return FRESH
+
+        now = time.time() if now is None else now
+        age = now - self.created_at
+        early = self.compute_time * policy.beta * -math.log(1.0 - random.random()) if policy.beta else 0.0
+        if age + early < policy.soft_ttl:
+            return FRESH
+        if age < policy.soft_ttl + policy.stale_while_revalidate:
+            return STALE
+        return EXPIRED
+
+
+def wrap(value: Any, compute_time: float) -> Dict[str, Any]:
+    return {ENVELOPE_MARKER: 1, "v": value, "t": time.time(), "d": round(compute_time, 4)}
+
+
+def unwrap(raw: Any) -> Optional[CacheEntry]:
+    if raw is None:
+        return None
+    if isinstance(raw, dict) and ENVELOPE_MARKER in raw:
+        return CacheEntry(raw["v"], raw["t"], raw["d"])
+    return CacheEntry(raw)
+
+
+class SWRCache:
+
+    _refreshing: Set[str] = set()
+    _tasks: Set[asyncio.Task] = set()
+
+    def __init__(
+        self,
+        redis_service: RedisService,
+        family: str,
+        policy: Optional[CachePolicy] = None,
+        flight: Optional[SingleFlight] = None,
+    ):
+        self.redis = redis_service
+        self.family = family
+        self.policy = policy or cache_policy(family)
+        self.flight = flight
+
+    async def lookup(self, key: str) -> Optional[CacheEntry]:
+        return unwrap(await self.redis.get_object(key))
+
+    async def lookup_many(self, keys: List[str]) -> List[Optional[CacheEntry]]:
+        return [unwrap(raw) for raw in await self.redis.mget_objects(keys)]
+
+    async def store(self, key: str, value: Any, compute_time: float = 0.0) -> None:
+        await self.redis.set_object(key, wrap(value, compute_time), ex=self.policy.hard_ttl)
+
+    async def store_many(self, values: Dict[str, Any], compute_time: float = 0.0) -> None:
+        await self.redis.set_many_objects(
+            {key: wrap(value, compute_time) for key, value in values.items()}, ex=self.policy.hard_ttl
+        )
+
+    async def get_or_fetch(self, key: str, fetch: Fetch) -> Tuple[Any, str]:
+        return await self.resolve(key, await self.lookup(key), fetch)
+
+    async def resolve(self, key: str, entry: Optional[CacheEntry], fetch: Fetch) -> Tuple[Any, str]:
+        state = entry.state(self.policy) if entry is not None else EXPIRED
+        if state == FRESH:
+            record_cache_lookup(self.family, "hit")
+            return entry.value, "cache"
+        if state == STALE:
+            record_cache_lookup(self.family, "stale")
+            self.revalidate(key, fetch)
+            return entry.value, "cache:stale"
+
+        record_cache_lookup(self.family, "miss")
+        try:
+            value, coalesced = await self._fetch_coalesced(key, fetch)
+        except Exception as e:
+            if entry is None or not self.policy.serve_stale_on_error:
+                raise
+            record_cache_lookup(self.family, "stale_error")
+            logger.warning(f"Upstream failed for '{key}', serving stale value: {e}")
+            return entry.value, "cache:stale-error"
+
+        return value, "api:coalesced" if coalesced else "api"
+
+    def revalidate(self, key: str, fetch: Fetch) -> None:
+        if key in self._refreshing:
+            return
+        self._refreshing.add(key)
+        task = asyncio.create_task(self._refresh(key, fetch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _refresh(self, key: str, fetch: Fetch) -> None:
+        lock_key = f"swr:refresh:{key}"
+        try:
+            # One refresh per key across workers; the lock expires on its own if this one dies.
+            lock_ttl = max(int(self.policy.stale_while_revalidate), 1)
+            if not await self.redis.client.set(lock_key, "1", nx=True, ex=lock_ttl):
+                return
+            try:
+                await self._fetch_and_store(key, fetch)
+            finally:
+                await self.redis.client.delete(lock_key)
+        except Exception as e:
+            logger.warning(f"Background refresh of '{key}' failed: {e}")
+        finally:
+            self._refreshing.discard(key)
+
+    async def _fetch_coalesced(self, key: str, fetch: Fetch) -> Tuple[Any, bool]:
+        if self.flight is None:
+            return await self._fetch_and_store(key, fetch), False
+
+        async def recheck() -> Optional[Any]:
+            entry = unwrap(await self.redis.get_object(key, use_local=False))
+            if entry is None or entry.state(self.policy) == EXPIRED:
+                return None
+            return entry.value
+
+        return await self.flight.run(
+            key, lambda: self._fetch_and_store(key, fetch), recheck, redis_client=self.redis.client
+        )
+
+    async def _fetch_and_store(self, key: str, fetch: Fetch) -> Any:
+        started = time.perf_counter()
+        value = await fetch()
+        await self.store(key, value, time.perf_counter() - started)
+        return value
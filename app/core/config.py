@@ -1,18 +1,149 @@
-from typing import Optional
+from typing import Any, Dict, List, Literal, Optional
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
     DATABASE_URL: str
+    DATABASE_REPLICA_URL: Optional[str] = None
     REDIS_URL: str
+    REDIS_MODE: Literal["standalone", "cluster", "sentinel"] = "standalone"
+    REDIS_SENTINELS: List[str] = []
+    REDIS_SENTINEL_MASTER: str = "mymaster"
+    REDIS_MAX_CONNECTIONS: int = 50
+    REDIS_POOL_TIMEOUT: float = 2.0
+    REDIS_SOCKET_TIMEOUT: float = 5.0
+    REDIS_SOCKET_CONNECT_TIMEOUT: float = 5.0
+    REDIS_SOCKET_KEEPALIVE: bool = True
+    REDIS_HEALTH_CHECK_INTERVAL: int = 30
 
     SENTRY_DSN: Optional[str] = None
     ENVIRONMENT: str = "local"
 
     ROBOFLOW_API_URL: str = "https://serverless.roboflow.com"
-    ROBOFLOW_API_KEY: str
-    ROBOFLOW_MODEL_ID: str
+    # Only required with INFERENCE_BACKEND=roboflow.
+    ROBOFLOW_API_KEY: str = ""
+    ROBOFLOW_MODEL_ID: str = ""
+
+    LOG_FORMAT: str = "text"
+    LOG_ASYNC: bool = False
+    LOG_QUEUE_SIZE: int = 10000
+    LOG_BATCH_SIZE: int = 256
+    LOG_FLUSH_INTERVAL: float = 0.5
+
+    MONITOR_ENABLED: bool = True
+    MONITOR_LOG_LEVEL: str = "INFO"
+    MONITOR_SAMPLE_RATE: float = 1.0
+    MONITOR_OPERATIONS: Dict[str, Dict[str, Any]] = {}
+
+    METRICS_ENABLED: bool = True
+    METRICS_REFRESH_INTERVAL: float = 5.0
+
+    INFERENCE_MAX_WORKERS: int = 4
+    INFERENCE_MAX_QUEUE: int = 16
+    INFERENCE_TIMEOUT: float = 30.0
+    INFERENCE_PHASH_ENABLED: bool = False
+    INFERENCE_MAX_UPLOAD_BYTES: int = 10 * 1024 * 1024
+    INFERENCE_MAX_IMAGE_SIDE: Optional[int] = None
+    INFERENCE_BATCH_MAX_ITEMS: int = 64
+    INFERENCE_BATCH_CONCURRENCY: int = 4
+
+    INFERENCE_BACKEND: Literal["roboflow", "local"] = "roboflow"
+    INFERENCE_LOCAL_MODEL_PATH: Optional[str] = None
+    INFERENCE_LOCAL_INPUT_SIZE: int = 640
+    INFERENCE_LOCAL_CLASSES: List[str] = ["person"]
+    INFERENCE_LOCAL_CONFIDENCE: float = 0.4
+    INFERENCE_LOCAL_IOU: float = 0.5
+    INFERENCE_LOCAL_MAX_BATCH: int = 8
+    INFERENCE_LOCAL_BATCH_WAIT_MS: float = 5.0
+    # The backend is otherwise created on the first inference request; eager init moves that
+    # (and, for the local backend, the model load) into worker startup.
+    INFERENCE_EAGER_INIT: bool = False
+
+    JOB_STREAM: str = "inference:jobs"
+    JOB_GROUP: str = "inference-workers"
+    JOB_WORKER_CONCURRENCY: int = 4
+    JOB_MAX_ATTEMPTS: int = 3
+    JOB_VISIBILITY_TIMEOUT: float = 60.0
+    JOB_TTL: int = 86400
+    JOB_STREAM_MAXLEN: int = 100_000
+    JOB_MAX_WAIT: float = 30.0
+
+    REDIS_BINARY_SAFE: bool = False
+    CACHE_SERIALIZER: str = "json"
+    CACHE_COMPRESSION: str = "none"
+    CACHE_COMPRESS_THRESHOLD: int = 1024
+    CACHE_POLICIES: Dict[str, Dict[str, Any]] = {}
+
+    L1_CACHE_ENABLED: bool = False
+    L1_CACHE_MAX_ENTRIES: int = 1024
+    L1_CACHE_MAX_BYTES: int = 16 * 1024 * 1024
+    L1_CACHE_TTL: float = 30.0
+    L1_CACHE_NEGATIVE_TTL: float = 5.0
+    L1_CACHE_KEYSPACE_EVENTS: bool = False
+
+    SINGLE_FLIGHT_LOCK_TTL: float = 60.0
+    SINGLE_FLIGHT_WAIT_TIMEOUT: float = 35.0
+
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = False
+    DB_STATEMENT_CACHE_SIZE: int = 100
+
+    HTTP_HTTP2: bool = True
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE: int = 20
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    HTTP_MAX_CONNECTIONS_PER_HOST: int = 20
+    HTTP_TIMEOUT: float = 10.0
+    HTTP_CONNECT_TIMEOUT: float = 3.0
+    HTTP_POOL_TIMEOUT: float = 5.0
+    HTTP_RETRIES: int = 3
+    HTTP_RETRY_MAX_TIME: float = 15.0
+    HTTP_CIRCUIT_FAILURE_THRESHOLD: int = 5
+    HTTP_CIRCUIT_RESET_TIMEOUT: float = 30.0
+
+    USERS_BULK_MAX_ITEMS: int = 100_000
+    USERS_BULK_CHUNK_SIZE: int = 1000
+
+    USER_CACHE_ENABLED: bool = True
+    USER_CACHE_TTL: int = 300
+    USER_LIST_CACHE_TTL: int = 0
+
+    # Opt-in: orjson as the default response class, single-pass model dumps on user endpoints and
+    # cached inference results returned as stored bytes.
+    FAST_SERIALIZATION: bool = False
+
+    # "no-cache" lets clients keep responses but revalidate each time, which is what makes
+    # If-None-Match/304 work for polled endpoints.
+    HTTP_CACHE_CONTROL: str = "private, no-cache"
+    # Kept below 2 * USER_CACHE_TTL, the lifetime of the version keys response entries hang off.
+    HTTP_RESPONSE_CACHE_TTL: int = 60
+
+    ADMISSION_ENABLED: bool = True
+    # Longest matching path prefix wins; classes without limits below are never throttled.
+    ADMISSION_ROUTE_CLASSES: Dict[str, str] = {
+        "/infer/jobs": "cache",
+        "/infer/executor": "system",
+        "/infer/backend": "system",
+        "/infer": "inference",
+        "/cache": "cache",
+        "/users": "crud",
+    }
+    # Token bucket per client and route class: `rate` requests/second refill, `burst` capacity.
+    ADMISSION_RATE_LIMITS: Dict[str, Dict[str, float]] = {
+        "inference": {"rate": 5, "burst": 20},
+        "crud": {"rate": 100, "burst": 200},
+        "cache": {"rate": 200, "burst": 400},
+    }
+    ADMISSION_CONCURRENCY: Dict[str, int] = {"inference": 32, "crud": 100, "cache": 100}
+    ADMISSION_SHED_P95_MS: Dict[str, float] = {"inference": 15000.0}
+    ADMISSION_SHED_QUEUE_DEPTH: Optional[int] = 12
+    ADMISSION_SHED_RETRY_AFTER: int = 5
+    ADMISSION_LATENCY_WINDOW: float = 30.0
+    ADMISSION_TRUST_FORWARDED: bool = False
     model_config = SettingsConfigDict(env_file=".env")
 
 
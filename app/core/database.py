@@ -1,15 +1,114 @@
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+import time
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
 
 from app.core.config import settings
+from app.core.metrics import DB_POOL_CHECKOUT_WAIT
+
+
+def engine_options(url: str) -> dict:
+    options = {"echo": False, "pool_pre_ping": settings.DB_POOL_PRE_PING}
+    parsed = make_url(url)
+    # SQLite (tests, local runs) uses a single-connection pool that takes no sizing arguments.
+    if parsed.get_backend_name() == "sqlite":
+        return options
+
+    # Every gunicorn worker owns its own pool: the database sees up to
+    # workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) connections per engine.
+    options.update(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_use_lifo=True,
+    )
+    if parsed.get_driver_name() == "asyncpg":
+        # Set to 0 behind PgBouncer in transaction mode, where prepared statements do not survive.
+        options["connect_args"] = {
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        }
+    return options
+
+
+class InstrumentedSession(Session):
+    # Sessions stay lazy: a connection is checked out on the first statement, so requests served
+    # from Redis (cache hits, 304s) never touch the pool.
+    pass
+
+
+@event.listens_for(InstrumentedSession, "do_orm_execute")
+def _mark_checkout_start(orm_execute_state) -> None:
+    session = orm_execute_state.session
+    if settings.METRICS_ENABLED and not session.in_transaction():
+        session.info.setdefault("checkout_started", time.perf_counter())
+
+
+@event.listens_for(InstrumentedSession, "after_begin")
+def _observe_checkout_wait(session, transaction, connection) -> None:
+    # after_begin fires once the connection for a new transaction has been checked out, so the
+    # time since the statement that triggered it is the wait for (or creation of) a connection.
+    started = session.info.pop("checkout_started", None)
+    if started is not None:
+        DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - started)
+
 
-engine = create_async_engine(settings.DATABASE_URL, echo=False, pool_pre_ping=True)
+engine = create_async_engine(settings.DATABASE_URL, **engine_options(settings.DATABASE_URL))
 AsyncSessionLocal = async_sessionmaker(
     bind=engine,
     class_=AsyncSession,
+    sync_session_class=InstrumentedSession,
     expire_on_commit=False,
 )
 
+replica_engine: Optional[AsyncEngine] = None
+ReplicaSessionLocal: Optional[async_sessionmaker] = None
+if settings.DATABASE_REPLICA_URL:
+    replica_engine = create_async_engine(settings.DATABASE_REPLICA_URL, **engine_options(settings.DATABASE_REPLICA_URL))
+    ReplicaSessionLocal = async_sessionmaker(
+        bind=replica_engine, class_=AsyncSession, sync_session_class=InstrumentedSession, expire_on_commit=False
+    )
+
+
+def engines() -> dict[str, AsyncEngine]:
+    return {"primary": engine, **({"replica": replica_engine} if replica_engine is not None else {})}
+
+
+def pool_stats() -> dict[str, dict]:
+    stats = {}
+    for role, db_engine in engines().items():
+        pool = db_engine.pool
+        stats[role] = {"status": pool.status()}
+        if hasattr(pool, "checkedout"):
+            stats[role].update(
+                size=pool.size(),
+                checked_out=pool.checkedout(),
+                checked_in=pool.checkedin(),
+                overflow=max(pool.overflow(), 0),
+            )
+    return stats
+
+
+async def dispose_engines() -> None:
+    for db_engine in engines().values():
+        await db_engine.dispose()
+
 
 async def get_db_session():
     async with AsyncSessionLocal() as session:
         yield session
+
+
+async def get_read_session():
+    # Replica sessions serve reads that tolerate replication lag. Without a replica this yields
+    # None and repositories read through their primary session.
+    if ReplicaSessionLocal is None:
+        yield None
+        return
+
+    async with ReplicaSessionLocal() as session:
+        yield session
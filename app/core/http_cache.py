@@ -0,0 +1,103 @@
+import hashlib
+import json
+import logging
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Optional
+
+from fastapi import Request, Response, status
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.metrics import record_cache_lookup
+from app.core.redis_client import RedisService
+
+logger = logging.getLogger("app.http_cache")
+
+
+def strong_etag(body: bytes) -> str:
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    # If-None-Match uses the weak comparison, so a W/ prefix on either side is ignored.
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    bare = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == bare for candidate in if_none_match.split(","))
+
+
+def not_modified(request: Request, etag: str, headers: Optional[Dict[str, str]] = None) -> Optional[Response]:
+    if not etag_matches(request.headers.get("If-None-Match"), etag):
+        return None
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={**(headers or {}), "ETag": etag})
+
+
+@dataclass
+class CachedResponse:
+    body: bytes
+    headers: Dict[str, str]
+
+    @classmethod
+    def build(cls, body: bytes, headers: Optional[Dict[str, str]] = None) -> "CachedResponse":
+        return cls(body, {**(headers or {}), "ETag": strong_etag(body)})
+
+    @property
+    def etag(self) -> str:
+        return self.headers["ETag"]
+
+    def encode(self) -> str:
+        # Headers on the first line, the body verbatim after it: a hit needs no JSON decoding of
+        # the payload, only of the small header line.
+        return json.dumps(self.headers, separators=(",", ":")) + "\n" + self.body.decode()
+
+    @classmethod
+    def decode(cls, raw: str) -> "CachedResponse":
+        headers, body = raw.split("\n", 1)
+        return cls(body.encode(), json.loads(headers))
+
+
+class ResponseCache:
+    # Serialized response bodies keyed by a validator (row version, list generation). Keys are
+    # never invalidated: a write moves readers to a new key and the old one expires.
+
+    def __init__(self, redis_service: RedisService, ttl: int = settings.HTTP_RESPONSE_CACHE_TTL):
+        self.redis = redis_service
+        self.ttl = ttl
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        try:
+            raw = await self.redis.get(key)
+        except RedisError as e:
+            logger.warning(f"Response cache read failed: {e}")
+            raw = None
+
+        record_cache_lookup("http_response", "miss" if raw is None else "hit")
+        return None if raw is None else CachedResponse.decode(raw)
+
+    async def set(self, key: str, response: CachedResponse) -> None:
+        try:
+            await self.redis.set(key, response.encode(), ex=self.ttl)
+        except RedisError as e:
+            logger.warning(f"Response cache write failed: {e}")
+
+
+async def conditional_response(
+    request: Request,
+    render: Callable[[], Awaitable[CachedResponse]],
+    cache: Optional[ResponseCache] = None,
+    key: Optional[str] = None,
+    cache_control: str = settings.HTTP_CACHE_CONTROL,
+) -> Response:
+    use_cache = cache is not None and key is not None and cache.ttl > 0
+    response = await cache.get(key) if use_cache else None
+    if response is None:
+        response = await render()
+        if use_cache:
+            await cache.set(key, response)
+
+    headers = {**response.headers, "Cache-Control": cache_control}
+    return not_modified(request, response.etag, headers) or Response(
+        content=response.body, media_type="application/json", headers=headers
+    )
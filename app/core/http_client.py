@@ -0,0 +1,187 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import backoff
+import httpx
+
+from app.core.config import settings
+
+logger = logging.getLogger("app.http")
+
+RETRYABLE_STATUSES = {429, 502, 503, 504}
+
+
+class CircuitOpenError(Exception):
+
+    pass
+
+
+class UpstreamBusyError(Exception):
+
+    pass
+
+
+class RetryableStatusError(Exception):
+
+    def __init__(self, response: httpx.Response):
+        super().__init__(f"{response.request.method} {response.request.url} returned {response.status_code}")
+        self.response = response
+
+
+@dataclass
+class CircuitBreaker:
+    # closed -> open after `failure_threshold` consecutive failures; open fails fast for
+    # `reset_timeout` seconds, then half-open lets a single probe through to decide.
+    name: str
+    failure_threshold: int
+    reset_timeout: float
+    state: str = "closed"
+    failures: int = 0
+    opened_at: float = 0.0
+    rejected: int = 0
+
+    def before_call(self) -> None:
+        if self.state == "closed":
+            return
+        if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self.state = "half_open"
+            return
+
+        self.rejected += 1
+        raise CircuitOpenError(f"Upstream '{self.name}' is unavailable, retry in {self.retry_after:.0f}s")
+
+    @property
+    def retry_after(self) -> float:
+        return max(self.reset_timeout - (time.monotonic() - self.opened_at), 1.0)
+
+    def record_success(self) -> None:
+        self.state = "closed"
+        self.failures = 0
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            if self.state != "open":
+                logger.warning(f"Circuit for upstream '{self.name}' opened after {self.failures} failures")
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+    def snapshot(self) -> dict:
+        return {"state": self.state, "failures": self.failures, "rejected": self.rejected}
+
+
+class OutboundHTTPClient:
+    # One pooled client per worker for every outbound call. Requests are grouped by upstream
+    # name: each upstream gets its own concurrency limit and circuit breaker.
+
+    def __init__(self):
+        self.client: Optional[httpx.AsyncClient] = None
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._slots: Dict[str, asyncio.Semaphore] = {}
+
+    def start(self) -> None:
+        if self.client is not None:
+            return
+
+        http2 = settings.HTTP_HTTP2
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                logger.warning("HTTP/2 requested but the 'h2' package is not installed, using HTTP/1.1")
+                http2 = False
+
+        self.client = httpx.AsyncClient(
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=settings.HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE,
+                keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+            ),
+            timeout=httpx.Timeout(
+                settings.HTTP_TIMEOUT, connect=settings.HTTP_CONNECT_TIMEOUT, pool=settings.HTTP_POOL_TIMEOUT
+            ),
+        )
+        logger.info(f">>> Outbound HTTP client started (http2={http2}).")
+
+    async def close(self) -> None:
+        client, self.client = self.client, None
+        if client is not None:
+            await client.aclose()
+            logger.info(">>> Outbound HTTP client closed.")
+
+    def breaker(self, upstream: str) -> CircuitBreaker:
+        if upstream not in self._breakers:
+            self._breakers[upstream] = CircuitBreaker(
+                upstream, settings.HTTP_CIRCUIT_FAILURE_THRESHOLD, settings.HTTP_CIRCUIT_RESET_TIMEOUT
+            )
+        return self._breakers[upstream]
+
+    def _slot(self, upstream: str) -> asyncio.Semaphore:
+        if upstream not in self._slots:
+            self._slots[upstream] = asyncio.Semaphore(settings.HTTP_MAX_CONNECTIONS_PER_HOST)
+        return self._slots[upstream]
+
+    async def request(self, upstream: str, method: str, url: str, **kwargs) -> httpx.Response:
+        if self.client is None:
+            self.start()
+
+        breaker = self.breaker(upstream)
+        breaker.before_call()
+
+        try:
+            response = await self._send_with_retries(upstream, method, url, **kwargs)
+        except RetryableStatusError as e:
+            breaker.record_failure()
+            e.response.raise_for_status()
+            raise
+        except (httpx.TransportError, UpstreamBusyError):
+            breaker.record_failure()
+            raise
+        except BaseException:
+            # Includes cancellation: a half-open probe that never finished must not leave the
+            # breaker rejecting every call.
+            if breaker.state == "half_open":
+                breaker.record_failure()
+            raise
+
+        breaker.record_success()
+        response.raise_for_status()
+        return response
+
+    async def _send_with_retries(self, upstream: str, method: str, url: str, **kwargs) -> httpx.Response:
+        @backoff.on_exception(
+            backoff.expo,
+            (httpx.TransportError, RetryableStatusError),
+            max_tries=settings.HTTP_RETRIES,
+            max_time=settings.HTTP_RETRY_MAX_TIME,
+            jitter=backoff.full_jitter,
+            logger=logger,
+            backoff_log_level=logging.DEBUG,
+        )
+        async def send() -> httpx.Response:
+            slot = self._slot(upstream)
+            try:
+                await asyncio.wait_for(slot.acquire(), timeout=settings.HTTP_POOL_TIMEOUT)
+            except asyncio.TimeoutError:
+                raise UpstreamBusyError(f"All {settings.HTTP_MAX_CONNECTIONS_PER_HOST} slots for '{upstream}' are busy")
+
+            try:
+                response = await self.client.request(method, url, **kwargs)
+            finally:
+                slot.release()
+
+            if response.status_code in RETRYABLE_STATUSES:
+                raise RetryableStatusError(response)
+            return response
+
+        return await send()
+
+    def snapshot(self) -> Dict[str, dict]:
+        return {name: breaker.snapshot() for name, breaker in sorted(self._breakers.items())}
+
+
+outbound_http = OutboundHTTPClient()
@@ -0,0 +1,75 @@
+import hashlib
+import json
+from typing import TYPE_CHECKING, Any, BinaryIO, Dict, Optional
+
+from fastapi import UploadFile
+
+if TYPE_CHECKING:
+    import numpy as np
+
+UPLOAD_CHUNK_SIZE = 64 * 1024
+DIGEST_SIZE = 20
+PHASH_SIZE = 8
+
+
+class UploadTooLargeError(Exception):
+
+    pass
+
+
+async def read_upload_hashed(
+    file: UploadFile,
+    sink: Optional[BinaryIO] = None,
+    chunk_size: int = UPLOAD_CHUNK_SIZE,
+    max_bytes: Optional[int] = None,
+) -> str:
+
+    if max_bytes and file.size and file.size > max_bytes:
+        raise UploadTooLargeError(f"Upload exceeds the {max_bytes} byte limit")
+
+    hasher = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    received = 0
+    while chunk := await file.read(chunk_size):
+        received += len(chunk)
+        if max_bytes and received > max_bytes:
+            raise UploadTooLargeError(f"Upload exceeds the {max_bytes} byte limit")
+
+        hasher.update(chunk)
+        if sink is not None:
+            sink.write(chunk)
+
+    return hasher.hexdigest()
+
+
+def hash_bytes(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=DIGEST_SIZE).hexdigest()
+
+
+def params_fingerprint(params: Optional[Dict[str, Any]]) -> str:
+    if not params:
+        return "default"
+
+    canonical = json.dumps(params, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(canonical.encode(), digest_size=8).hexdigest()
+
+
+def inference_cache_key(model_id: str, content_hash: str, params: Optional[Dict[str, Any]] = None) -> str:
+    return f"inference:{model_id}:{params_fingerprint(params)}:{content_hash}"
+
+
+def perceptual_hash_key(model_id: str, phash: str, params: Optional[Dict[str, Any]] = None) -> str:
+    return f"inference:{model_id}:{params_fingerprint(params)}:phash:{phash}"
+
+
+def perceptual_hash(image: "np.ndarray") -> str:
+    # dHash: compare neighbouring pixels of a tiny grayscale thumbnail. Stable across
+    # re-encoding and mild compression, which is what repeated camera frames look like.
+    # OpenCV is imported here because this module is also on the CRUD path (params_fingerprint).
+    import cv2
+    import numpy as np
+
+    gray = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    thumbnail = cv2.resize(gray, (PHASH_SIZE + 1, PHASH_SIZE), interpolation=cv2.INTER_AREA)
+    bits = thumbnail[:, :-1] > thumbnail[:, 1:]
+
+    return np.packbits(bits).tobytes().hex()
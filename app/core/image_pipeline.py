@@ -0,0 +1,114 @@
+import io
+import tarfile
+import zipfile
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+from fastapi import UploadFile
+
+from app.core.image_hashing import UploadTooLargeError, hash_bytes, read_upload_hashed
+
+
+class ImageDecodeError(Exception):
+
+    pass
+
+
+class BatchTooLargeError(Exception):
+
+    pass
+
+
+class InvalidArchiveError(Exception):
+
+    pass
+
+
+@dataclass
+class DecodedImage:
+    array: np.ndarray
+    content_hash: str
+    size_bytes: int
+    original_width: int
+    original_height: int
+    scale: float = 1.0
+
+
+async def read_upload(file: UploadFile, max_bytes: Optional[int] = None) -> tuple[memoryview, str]:
+    buffer = io.BytesIO()
+    content_hash = await read_upload_hashed(file, sink=buffer, max_bytes=max_bytes)
+
+    return buffer.getbuffer(), content_hash
+
+
+def extract_archive(data: memoryview, max_items: int, max_member_bytes: int) -> List[Tuple[str, memoryview, str]]:
+    # Sizes are checked from the archive index before anything is decompressed.
+    members: List[Tuple[str, memoryview, str]] = []
+    source = io.BytesIO(data)
+
+    def add(name: str, size: int, read) -> None:
+        if len(members) >= max_items:
+            raise BatchTooLargeError(f"Archive contains more than {max_items} images")
+        if size > max_member_bytes:
+            raise UploadTooLargeError(f"Archive member '{name}' exceeds the {max_member_bytes} byte limit")
+        content = read()
+        members.append((name, memoryview(content), hash_bytes(content)))
+
+    if zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as archive:
+            for info in archive.infolist():
+                if not info.is_dir():
+                    add(info.filename, info.file_size, lambda info=info: archive.read(info))
+        return members
+
+    source.seek(0)
+    try:
+        with tarfile.open(fileobj=source, mode="r:*") as archive:
+            for info in archive:
+                if info.isfile():
+                    add(info.name, info.size, lambda info=info: archive.extractfile(info).read())
+    except tarfile.TarError as e:
+        raise InvalidArchiveError(f"Archive must be a zip or tar file: {e}") from e
+
+    return members
+
+
+def decode_image(data: memoryview, content_hash: str, max_side: Optional[int] = None) -> DecodedImage:
+    # np.frombuffer shares the upload buffer, so the only copy made is the decoded pixel array.
+    image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if image is None:
+        raise ImageDecodeError("Uploaded file is not a supported image")
+
+    height, width = image.shape[:2]
+    decoded = DecodedImage(
+        array=image,
+        content_hash=content_hash,
+        size_bytes=len(data),
+        original_width=width,
+        original_height=height,
+    )
+
+    if max_side and max(width, height) > max_side:
+        decoded.scale = max_side / max(width, height)
+        target = (max(1, round(width * decoded.scale)), max(1, round(height * decoded.scale)))
+        decoded.array = cv2.resize(image, target, interpolation=cv2.INTER_AREA)
+
+    return decoded
+
+
+def restore_original_scale(raw_data: Dict[str, Any], image: DecodedImage) -> Dict[str, Any]:
+    if image.scale == 1.0:
+        return raw_data
+
+    factor = 1 / image.scale
+    for prediction in raw_data.get("predictions", []):
+        for field in ("x", "y", "width", "height"):
+            if field in prediction:
+                prediction[field] = prediction[field] * factor
+
+    if "image" in raw_data:
+        raw_data["image"] = {"width": image.original_width, "height": image.original_height}
+
+    return raw_data
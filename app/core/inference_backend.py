@@ -0,0 +1,22 @@
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+class InferenceBackend:
+    # Everything InferenceService needs from a detector. Implementations return the Roboflow
+    # response shape (inference_id, time, image, predictions with centre x/y) so caching,
+    # rescaling and InferenceResultDTO work the same whichever backend produced the result.
+
+    name: str = "backend"
+    model_id: str = ""
+
+    async def infer(self, image: "np.ndarray", model_id: Optional[str] = None, **params: Any) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+    def snapshot(self) -> dict:
+        return {"backend": self.name, "model_id": self.model_id}
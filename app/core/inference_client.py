@@ -1,13 +1,84 @@
-from inference_sdk import InferenceHTTPClient
+import base64
+from typing import TYPE_CHECKING, Any, Dict, Optional
 
 from app.core.config import settings
+from app.core.http_client import outbound_http
+from app.core.inference_backend import InferenceBackend
+from app.core.inference_executor import inference_executor
 
-if not settings.ROBOFLOW_API_KEY:
+if TYPE_CHECKING:
+    import numpy as np
+
+if settings.INFERENCE_BACKEND == "roboflow" and not settings.ROBOFLOW_API_KEY:
     print("WARNING: ROBOFLOW_API_KEY is not set. Inference service will fail.")
 
-CLIENT = InferenceHTTPClient(
-    api_url=settings.ROBOFLOW_API_URL,
-    api_key=settings.ROBOFLOW_API_KEY,
-)
 
-MODEL_ID = settings.ROBOFLOW_MODEL_ID
+def encode_image(image: "np.ndarray") -> bytes:
+    import cv2
+
+    ok, encoded = cv2.imencode(".jpg", image)
+    if not ok:
+        raise ValueError("Failed to encode image as JPEG")
+    return base64.b64encode(encoded)
+
+
+class RoboflowClient(InferenceBackend):
+    # Calls the hosted v0 inference API (the same request inference_sdk builds) through the
+    # shared outbound client, so connections are reused instead of opened per call.
+
+    name = "roboflow"
+
+    def __init__(self, api_url: str, api_key: str, model_id: str):
+        self.api_url = api_url.rstrip("/")
+        self.api_key = api_key
+        self.model_id = model_id
+
+    async def infer(self, image: "np.ndarray", model_id: Optional[str] = None, **params: Any) -> Dict[str, Any]:
+        # JPEG encoding is CPU work, so it runs on the bounded inference pool.
+        payload = await inference_executor.run(encode_image, image)
+        response = await outbound_http.request(
+            "roboflow",
+            "POST",
+            f"{self.api_url}/{model_id or self.model_id}",
+            params={"api_key": self.api_key, **params},
+            content=payload,
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+            timeout=settings.INFERENCE_TIMEOUT,
+        )
+        return response.json()
+
+
+def create_backend() -> InferenceBackend:
+    if settings.INFERENCE_BACKEND == "local":
+        from app.core.local_inference import create_local_backend
+
+        return create_local_backend()
+
+    return RoboflowClient(
+        api_url=settings.ROBOFLOW_API_URL, api_key=settings.ROBOFLOW_API_KEY, model_id=settings.ROBOFLOW_MODEL_ID
+    )
+
+
+_backend: Optional[InferenceBackend] = None
+
+
+def get_backend() -> InferenceBackend:
+    # Built on first use rather than at import: workers that only serve CRUD never load OpenCV,
+    # numpy or, with the local backend, the model itself.
+    global _backend
+    if _backend is None:
+        _backend = create_backend()
+    return _backend
+
+
+def backend_snapshot() -> dict:
+    if _backend is None:
+        return {"backend": settings.INFERENCE_BACKEND, "loaded": False}
+    return {**_backend.snapshot(), "loaded": True}
+
+
+async def close_backend() -> None:
+    global _backend
+    if _backend is not None:
+        await _backend.close()
+        _backend = None
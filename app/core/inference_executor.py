@@ -0,0 +1,133 @@
+import asyncio
+import functools
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger("app.inference.executor")
+
+
+class InferenceQueueFullError(Exception):
+
+    pass
+
+
+@dataclass
+class ExecutorStats:
+    submitted: int = 0
+    completed: int = 0
+    failed: int = 0
+    rejected: int = 0
+    timed_out: int = 0
+    queue_wait_total_sec: float = 0.0
+    queue_wait_max_sec: float = 0.0
+    execution_total_sec: float = 0.0
+    execution_max_sec: float = 0.0
+
+
+class InferenceExecutor:
+
+    def __init__(self, max_workers: int, max_queue: int, timeout: float):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.stats = ExecutorStats()
+
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._waiting = 0
+        self._running = 0
+
+    @property
+    def queue_depth(self) -> int:
+        return self._waiting
+
+    @property
+    def in_flight(self) -> int:
+        return self._running
+
+    def start(self) -> None:
+        if self._pool:
+            return
+
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="inference")
+        self._semaphore = asyncio.Semaphore(self.max_workers)
+        logger.info(f">>> Inference executor started: workers={self.max_workers}, queue={self.max_queue}")
+
+    def shutdown(self) -> None:
+        if self._pool:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+            self._semaphore = None
+            logger.info(">>> Inference executor stopped.")
+
+    async def run(self, func: Callable[..., Any], *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        self.start()
+
+        semaphore = self._semaphore
+        if semaphore.locked() and self._waiting >= self.max_queue:
+            self.stats.rejected += 1
+            raise InferenceQueueFullError(f"Inference queue is full ({self._waiting} waiting, {self._running} running)")
+
+        loop = asyncio.get_running_loop()
+        enqueued_at = time.perf_counter()
+        self._waiting += 1
+        self.stats.submitted += 1
+
+        try:
+            await semaphore.acquire()
+        finally:
+            self._waiting -= 1
+
+        queue_wait = time.perf_counter() - enqueued_at
+        self.stats.queue_wait_total_sec += queue_wait
+        self.stats.queue_wait_max_sec = max(self.stats.queue_wait_max_sec, queue_wait)
+
+        # The slot is released when the worker thread actually finishes, not when the caller
+        # gives up, so a timed-out call can never push the pool past its concurrency limit.
+        self._running += 1
+        started_at = time.perf_counter()
+        future = self._pool.submit(functools.partial(func, *args, **kwargs))
+        future.add_done_callback(lambda _: loop.call_soon_threadsafe(self._release, semaphore, started_at))
+
+        try:
+            result = await asyncio.wait_for(asyncio.wrap_future(future), timeout or self.timeout)
+        except asyncio.TimeoutError:
+            self.stats.timed_out += 1
+            raise
+        except Exception:
+            self.stats.failed += 1
+            raise
+
+        self.stats.completed += 1
+        return result
+
+    def _release(self, semaphore: asyncio.Semaphore, started_at: float) -> None:
+        execution = time.perf_counter() - started_at
+        self.stats.execution_total_sec += execution
+        self.stats.execution_max_sec = max(self.stats.execution_max_sec, execution)
+        self._running -= 1
+        semaphore.release()
+
+    def snapshot(self) -> dict:
+        data = asdict(self.stats)
+        data.update(
+            {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "in_flight": self.in_flight,
+                "queue_depth": self.queue_depth,
+            }
+        )
+        return data
+
+
+inference_executor = InferenceExecutor(
+    max_workers=settings.INFERENCE_MAX_WORKERS,
+    max_queue=settings.INFERENCE_MAX_QUEUE,
+    timeout=settings.INFERENCE_TIMEOUT,
+)
@@ -0,0 +1,237 @@
+import base64
+import logging
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from redis.exceptions import ResponseError
+
+from app.core.config import settings
+from app.core.redis_client import RedisService
+
+logger = logging.getLogger("app.jobs")
+
+JOB_KEY = "job:{}"
+IMAGE_KEY = "job:image:{}"
+EVENTS_CHANNEL = "job:events:{}"
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+DEAD = "dead"
+TERMINAL_STATUSES = {SUCCEEDED, FAILED, DEAD}
+
+
+def _text(value: Union[str, bytes, None]) -> Optional[str]:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+@dataclass
+class Job:
+    id: str
+    status: str
+    content_hash: str
+    attempts: int = 0
+    created_at: float = 0.0
+    updated_at: float = 0.0
+    source: Optional[str] = None
+    error: Optional[str] = None
+    result: Any = None
+
+    @property
+    def done(self) -> bool:
+        return self.status in TERMINAL_STATUSES
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {
+            "id": self.id,
+            "status": self.status,
+            "content_hash": self.content_hash,
+            "attempts": self.attempts,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+        }
+        if self.source is not None:
+            data["source"] = self.source
+        if self.error is not None:
+            data["error"] = self.error
+        if self.status == SUCCEEDED:
+            data["result"] = self.result
+        return data
+
+
+class JobQueue:
+    # Jobs are hashes keyed by id; their ids travel through a Redis stream read by a consumer
+    # group. A message stays pending until a worker acknowledges it, so a job whose worker
+    # crashed or failed with a retryable error is reclaimed by another worker once it has been
+    # idle for `visibility_timeout` seconds. After `max_attempts` it is moved to the
+    # dead-letter stream.
+
+    def __init__(
+        self,
+        redis_service: RedisService,
+        stream: str = settings.JOB_STREAM,
+        group: str = settings.JOB_GROUP,
+        visibility_timeout: float = settings.JOB_VISIBILITY_TIMEOUT,
+        max_attempts: int = settings.JOB_MAX_ATTEMPTS,
+        ttl: int = settings.JOB_TTL,
+    ):
+        self.redis = redis_service
+        self.client = redis_service.client
+        self.stream = stream
+        self.group = group
+        self.dead_letter_stream = f"{stream}:dead"
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        self.ttl = ttl
+
+    async def ensure_group(self) -> None:
+        try:
+            await self.client.xgroup_create(self.stream, self.group, id="0", mkstream=True)
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    async def store_image(self, content_hash: str, data: Union[bytes, memoryview]) -> None:
+        # Content-addressed, so resubmitting the same image only refreshes the TTL.
+        payload = bytes(data) if settings.REDIS_BINARY_SAFE else base64.b64encode(data).decode()
+        await self.client.set(IMAGE_KEY.format(content_hash), payload, ex=self.ttl)
+
+    async def load_image(self, content_hash: str) -> Optional[bytes]:
+        payload = await self.client.get(IMAGE_KEY.format(content_hash))
+        if payload is None:
+            return None
+        return payload if isinstance(payload, bytes) and settings.REDIS_BINARY_SAFE else base64.b64decode(payload)
+
+    async def enqueue(self, content_hash: str, data: Union[bytes, memoryview]) -> Job:
+        await self.store_image(content_hash, data)
+        job = self._new_job(content_hash, QUEUED)
+
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.hset(JOB_KEY.format(job.id), mapping=self._fields(job))
+            pipe.expire(JOB_KEY.format(job.id), self.ttl)
+            pipe.xadd(self.stream, {"job_id": job.id}, maxlen=settings.JOB_STREAM_MAXLEN, approximate=True)
+            await pipe.execute()
+        return job
+
+    async def create_completed(self, content_hash: str, result: Any, source: str) -> Job:
+        job = self._new_job(content_hash, SUCCEEDED)
+        job.result, job.source = result, source
+        await self.client.hset(JOB_KEY.format(job.id), mapping=self._fields(job))
+        await self.client.expire(JOB_KEY.format(job.id), self.ttl)
+        return job
+
+    async def get(self, job_id: str) -> Optional[Job]:
+        fields = await self.client.hgetall(JOB_KEY.format(job_id))
+        if not fields:
+            return None
+
+        fields = {_text(key): value for key, value in fields.items()}
+        result = fields.get("result")
+        return Job(
+            id=job_id,
+            status=_text(fields["status"]),
+            content_hash=_text(fields["content_hash"]),
+            attempts=int(fields.get("attempts", 0)),
+            created_at=float(fields["created_at"]),
+            updated_at=float(fields["updated_at"]),
+            source=_text(fields.get("source")),
+            error=_text(fields.get("error")),
+            result=None if result is None else self.redis.codec.decode(result),
+        )
+
+    async def wait(self, job_id: str, timeout: float) -> Optional[Job]:
+        # Subscribe before re-reading the job so a change published in between is not missed.
+        pubsub = self.client.pubsub()
+        try:
+            await pubsub.subscribe(EVENTS_CHANNEL.format(job_id))
+            job = await self.get(job_id)
+            if job is None or job.done:
+                return job
+
+            deadline = time.monotonic() + timeout
+            while (remaining := deadline - time.monotonic()) > 0:
+                if await pubsub.get_message(ignore_subscribe_messages=True, timeout=min(remaining, 1.0)):
+                    break
+            return await self.get(job_id)
+        finally:
+            await pubsub.unsubscribe()
+            await pubsub.aclose()
+
+    async def claim(self, consumer: str, count: int = 1, block_ms: int = 5000) -> List[Tuple[str, str]]:
+        _, reclaimed, _ = await self.client.xautoclaim(
+            self.stream, self.group, consumer, min_idle_time=int(self.visibility_timeout * 1000), count=count
+        )
+        messages = [(message_id, fields) for message_id, fields in reclaimed if fields]
+        if not messages:
+            response = await self.client.xreadgroup(
+                self.group, consumer, {self.stream: ">"}, count=count, block=block_ms
+            )
+            messages = [message for _, stream_messages in response or [] for message in stream_messages]
+
+        return [(_text(message_id), _text(self._field(fields, "job_id"))) for message_id, fields in messages]
+
+    async def start(self, job_id: str) -> Optional[Job]:
+        key = JOB_KEY.format(job_id)
+        if not await self.client.exists(key):
+            return None
+
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.hincrby(key, "attempts", 1)
+            pipe.hset(key, mapping={"status": RUNNING, "updated_at": time.time()})
+            pipe.publish(EVENTS_CHANNEL.format(job_id), RUNNING)
+            await pipe.execute()
+        return await self.get(job_id)
+
+    async def complete(self, message_id: str, job_id: str, result: Any, source: str) -> None:
+        fields = {"status": SUCCEEDED, "result": self.redis.codec.encode(result), "source": source}
+        await self._finish(message_id, job_id, fields)
+
+    async def fail(self, message_id: str, job: Job, error: str, retryable: bool = True) -> None:
+        if retryable and job.attempts < self.max_attempts:
+            # Left unacknowledged: the message is redelivered after the visibility timeout.
+            await self.client.hset(
+                JOB_KEY.format(job.id), mapping={"status": QUEUED, "error": error, "updated_at": time.time()}
+            )
+            await self.client.publish(EVENTS_CHANNEL.format(job.id), QUEUED)
+            logger.warning(f"Job {job.id} attempt {job.attempts}/{self.max_attempts} failed, will retry: {error}")
+            return
+
+        status = DEAD if retryable else FAILED
+        if status == DEAD:
+            await self.client.xadd(self.dead_letter_stream, {"job_id": job.id, "error": error})
+            logger.error(f"Job {job.id} moved to dead-letter after {job.attempts} attempts: {error}")
+        await self._finish(message_id, job.id, {"status": status, "error": error})
+
+    async def _finish(self, message_id: str, job_id: str, fields: Dict[str, Any]) -> None:
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.hset(JOB_KEY.format(job_id), mapping={**fields, "updated_at": time.time()})
+            pipe.xack(self.stream, self.group, message_id)
+            pipe.publish(EVENTS_CHANNEL.format(job_id), fields["status"])
+            await pipe.execute()
+
+    async def acknowledge(self, message_id: str) -> None:
+        await self.client.xack(self.stream, self.group, message_id)
+
+    @staticmethod
+    def _new_job(content_hash: str, status: str) -> Job:
+        now = time.time()
+        return Job(id=uuid.uuid4().hex, status=status, content_hash=content_hash, created_at=now, updated_at=now)
+
+    def _fields(self, job: Job) -> Dict[str, Any]:
+        fields = {
+            "status": job.status,
+            "content_hash": job.content_hash,
+            "attempts": job.attempts,
+            "created_at": job.created_at,
+            "updated_at": job.updated_at,
+            "source": job.source,
+            "result": None if job.result is None else self.redis.codec.encode(job.result),
+        }
+        return {key: value for key, value in fields.items() if value is not None}
+
+    @staticmethod
+    def _field(fields: Dict, name: str) -> Any:
+        return fields.get(name, fields.get(name.encode()))
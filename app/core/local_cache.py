@@ -0,0 +1,188 @@
+import asyncio
+import logging
+import sys
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Optional, Union
+
+import redis.asyncio as redis
+
+from app.core.config import settings
+
+logger = logging.getLogger("app.local_cache")
+
+INVALIDATION_CHANNEL = "l1:invalidate"
+KEYSPACE_PATTERN = "__keyspace@*__:*"
+
+NEGATIVE = object()
+
+
+@dataclass
+class LocalCacheStats:
+    hits: int = 0
+    negative_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+
+
+class LocalCache:
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl: float, negative_ttl: float):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.stats = LocalCacheStats()
+
+        self._entries: "OrderedDict[str, tuple[Any, float, int]]" = OrderedDict()
+        self._bytes = 0
+        self._listener: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def get(self, key: str) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+
+        value, expires_at, _ = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            self.stats.expirations += 1
+            self.stats.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        if value is NEGATIVE:
+            self.stats.negative_hits += 1
+        else:
+            self.stats.hits += 1
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        size = self._sizeof(key, value)
+        if size > self.max_bytes:
+            return
+
+        self._remove(key)
+        expires_at = time.monotonic() + (ttl if ttl is not None else self.ttl)
+        self._entries[key] = (value, expires_at, size)
+        self._bytes += size
+
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.stats.evictions += 1
+
+    def set_negative(self, key: str) -> None:
+        self.set(key, NEGATIVE, ttl=self.negative_ttl)
+
+    def invalidate(self, key: str) -> None:
+        if self._remove(key):
+            self.stats.invalidations += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def _remove(self, key: str) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        self._bytes -= entry[2]
+        return True
+
+    @staticmethod
+    def _sizeof(key: str, value: Any) -> int:
+        if value is NEGATIVE:
+            return len(key)
+        if isinstance(value, (str, bytes)):
+            return len(key) + len(value)
+        return len(key) + sys.getsizeof(value)
+
+    async def start_invalidation_listener(self, client: redis.Redis, keyspace_events: bool = False) -> None:
+        if self._listener:
+            return
+
+        pubsub = client.pubsub()
+        await pubsub.subscribe(INVALIDATION_CHANNEL)
+        if keyspace_events:
+            # Requires `notify-keyspace-events` to include K and g$x on the server, so writes made
+            # outside this app (redis-cli, other services) also evict local copies.
+            await pubsub.psubscribe(KEYSPACE_PATTERN)
+
+        self._listener = asyncio.create_task(self._listen(pubsub))
+        logger.info(">>> L1 cache invalidation listener started.")
+
+    async def _listen(self, pubsub) -> None:
+        try:
+            while True:
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                if message is None:
+                    continue
+
+                # Binary-safe clients (decode_responses=False) deliver channel and data as bytes,
+                # while local entries are keyed by str.
+                if message["type"] == "pmessage":
+                    key = self._text(message["channel"]).split(":", 1)[1]
+                else:
+                    key = self._text(message["data"])
+
+                if key == "*":
+                    self.clear()
+                else:
+                    self.invalidate(key)
+
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            # Without invalidations the tier cannot stay coherent, so it is emptied and bypassed
+            # until the listener is restarted.
+            logger.error(f"!!! L1 cache invalidation listener failed, clearing local cache: {e}")
+            self.clear()
+        finally:
+            await pubsub.aclose()
+
+    @staticmethod
+    def _text(value: Union[str, bytes]) -> str:
+        return value.decode() if isinstance(value, bytes) else value
+
+    async def stop_invalidation_listener(self) -> None:
+        if self._listener:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+            self._listener = None
+
+    @property
+    def coherent(self) -> bool:
+        return self._listener is not None and not self._listener.done()
+
+    def snapshot(self) -> dict:
+        data = asdict(self.stats)
+        data.update(
+            {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "coherent": self.coherent,
+            }
+        )
+        return data
+
+
+local_cache = LocalCache(
+    max_entries=settings.L1_CACHE_MAX_ENTRIES,
+    max_bytes=settings.L1_CACHE_MAX_BYTES,
+    ttl=settings.L1_CACHE_TTL,
+    negative_ttl=settings.L1_CACHE_NEGATIVE_TTL,
+)
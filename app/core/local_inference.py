@@ -0,0 +1,270 @@
+import asyncio
+import logging
+import os
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+from app.core.config import settings
+from app.core.inference_backend import InferenceBackend
+from app.core.inference_executor import InferenceExecutor, inference_executor
+
+logger = logging.getLogger("app.inference.local")
+
+
+class DetectionModel:
+    # A batched forward pass: (N, 3, size, size) float32 RGB in [0, 1] -> YOLOv8-style raw output
+    # (N, 4 + classes, anchors) with centre-x, centre-y, width, height in input pixels.
+
+    def __init__(self, input_size: int, class_names: Sequence[str]):
+        self.input_size = input_size
+        self.class_names = list(class_names)
+
+    def forward(self, batch: np.ndarray) -> np.ndarray:
+        raise NotImplementedError
+
+
+class OnnxRuntimeModel(DetectionModel):
+
+    def __init__(self, path: str, input_size: int, class_names: Sequence[str]):
+        super().__init__(input_size, class_names)
+        import onnxruntime
+
+        self.session = onnxruntime.InferenceSession(path, providers=["CPUExecutionProvider"])
+        self.input_name = self.session.get_inputs()[0].name
+
+    def forward(self, batch: np.ndarray) -> np.ndarray:
+        return self.session.run(None, {self.input_name: batch})[0]
+
+
+class OpenCVModel(DetectionModel):
+
+    def __init__(self, path: str, input_size: int, class_names: Sequence[str]):
+        super().__init__(input_size, class_names)
+        self.net = cv2.dnn.readNet(path)
+        self.net.setPreferableBackend(cv2.dnn.DNN_BACKEND_OPENCV)
+        self.net.setPreferableTarget(cv2.dnn.DNN_TARGET_CPU)
+        self._lock = threading.Lock()
+
+    def forward(self, batch: np.ndarray) -> np.ndarray:
+        # cv2.dnn.Net keeps its input as state, so setInput/forward must not interleave.
+        with self._lock:
+            self.net.setInput(batch)
+            return self.net.forward()
+
+
+def load_model(path: str, input_size: int, class_names: Sequence[str]) -> DetectionModel:
+    if path.endswith(".onnx"):
+        try:
+            return OnnxRuntimeModel(path, input_size, class_names)
+        except ImportError:
+            logger.warning("onnxruntime is not installed, running the ONNX model with OpenCV DNN")
+    return OpenCVModel(path, input_size, class_names)
+
+
+@dataclass
+class Letterbox:
+    scale: float
+    pad_x: float
+    pad_y: float
+    width: int
+    height: int
+
+
+def letterbox(image: np.ndarray, size: int) -> Tuple[np.ndarray, Letterbox]:
+    height, width = image.shape[:2]
+    scale = min(size / width, size / height)
+    resized_w, resized_h = max(1, round(width * scale)), max(1, round(height * scale))
+    pad_x, pad_y = (size - resized_w) / 2, (size - resized_h) / 2
+
+    canvas = np.full((size, size, 3), 114, dtype=np.uint8)
+    top, left = int(pad_y), int(pad_x)
+    canvas[top : top + resized_h, left : left + resized_w] = cv2.resize(
+        image, (resized_w, resized_h), interpolation=cv2.INTER_LINEAR
+    )
+    return canvas, Letterbox(scale, left, top, width, height)
+
+
+def preprocess(images: Sequence[np.ndarray], size: int) -> Tuple[np.ndarray, List[Letterbox]]:
+    boxed = [letterbox(image, size) for image in images]
+    blob = cv2.dnn.blobFromImages([canvas for canvas, _ in boxed], scalefactor=1 / 255.0, swapRB=True)
+    return blob, [box for _, box in boxed]
+
+
+def postprocess(
+    output: np.ndarray, box: Letterbox, class_names: Sequence[str], confidence: float, iou: float
+) -> List[Dict[str, Any]]:
+    # YOLOv8 exports (4 + classes, anchors); exports with anchors first are transposed.
+    if output.shape[0] > output.shape[1]:
+        output = output.T
+
+    scores = output[4:]
+    class_ids = scores.argmax(axis=0)
+    best = scores[class_ids, np.arange(scores.shape[1])]
+    keep = best >= confidence
+    if not keep.any():
+        return []
+
+    cx, cy, w, h = output[:4, keep]
+    best, class_ids = best[keep], class_ids[keep]
+
+    # Undo the letterbox: remove padding, then scale back to the decoded image.
+    cx = (cx - box.pad_x) / box.scale
+    cy = (cy - box.pad_y) / box.scale
+    w, h = w / box.scale, h / box.scale
+
+    rects = np.stack([cx - w / 2, cy - h / 2, w, h], axis=1)
+    indices = cv2.dnn.NMSBoxes(rects.tolist(), best.tolist(), confidence, iou)
+
+    predictions = []
+    for i in np.asarray(indices).reshape(-1):
+        class_id = int(class_ids[i])
+        predictions.append(
+            {
+                "x": float(cx[i]),
+                "y": float(cy[i]),
+                "width": float(w[i]),
+                "height": float(h[i]),
+                "confidence": float(best[i]),
+                "class": class_names[class_id] if class_id < len(class_names) else str(class_id),
+                "class_id": class_id,
+                "detection_id": uuid.uuid4().hex,
+            }
+        )
+    return predictions
+
+
+@dataclass
+class BatcherStats:
+    requests: int = 0
+    batches: int = 0
+    max_batch_size: int = 0
+    failed_batches: int = 0
+
+    @property
+    def avg_batch_size(self) -> float:
+        return round(self.requests / self.batches, 2) if self.batches else 0.0
+
+
+class LocalInferenceBackend(InferenceBackend):
+    # Dynamic micro-batching: the first request opens a window of `max_wait_ms`; everything that
+    # arrives in it (up to `max_batch`) is preprocessed and run as one forward pass on the
+    # inference executor, and each caller gets its own slice of the output.
+
+    name = "local"
+
+    def __init__(
+        self,
+        model: DetectionModel,
+        model_id: str,
+        max_batch: int = settings.INFERENCE_LOCAL_MAX_BATCH,
+        max_wait_ms: float = settings.INFERENCE_LOCAL_BATCH_WAIT_MS,
+        confidence: float = settings.INFERENCE_LOCAL_CONFIDENCE,
+        iou: float = settings.INFERENCE_LOCAL_IOU,
+        executor: InferenceExecutor = inference_executor,
+    ):
+        self.model = model
+        self.model_id = model_id
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.confidence = confidence
+        self.iou = iou
+        self.executor = executor
+        self.stats = BatcherStats()
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._collector: Optional[asyncio.Task] = None
+
+    async def infer(self, image: np.ndarray, model_id: Optional[str] = None, **params: Any) -> Dict[str, Any]:
+        # Roboflow-only request parameters are accepted for interface compatibility and ignored.
+        if self._collector is None or self._collector.done():
+            self._queue = asyncio.Queue()
+            self._collector = asyncio.create_task(self._collect())
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((image, future))
+        return await future
+
+    async def _collect(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch and (remaining := deadline - time.monotonic()) > 0:
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            batch = [(image, future) for image, future in batch if not future.cancelled()]
+            if batch:
+                # Awaited, not spawned: requests arriving while this pass runs form the next,
+                # larger batch instead of many small concurrent ones.
+                await self._run_batch(batch)
+
+    async def _run_batch(self, batch: List[Tuple[np.ndarray, asyncio.Future]]) -> None:
+        self.stats.requests += len(batch)
+        self.stats.batches += 1
+        self.stats.max_batch_size = max(self.stats.max_batch_size, len(batch))
+
+        try:
+            results = await self.executor.run(self._predict, [image for image, _ in batch])
+        except Exception as e:
+            self.stats.failed_batches += 1
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    def _predict(self, images: List[np.ndarray]) -> List[Dict[str, Any]]:
+        started = time.perf_counter()
+        blob, boxes = preprocess(images, self.model.input_size)
+        outputs = self.model.forward(blob)
+        elapsed = (time.perf_counter() - started) / len(images)
+
+        return [
+            {
+                "inference_id": uuid.uuid4().hex,
+                "time": elapsed,
+                "image": {"width": box.width, "height": box.height},
+                "predictions": postprocess(output, box, self.model.class_names, self.confidence, self.iou),
+            }
+            for output, box in zip(outputs, boxes)
+        ]
+
+    async def close(self) -> None:
+        collector, self._collector = self._collector, None
+        if collector is not None:
+            collector.cancel()
+            try:
+                await collector
+            except asyncio.CancelledError:
+                pass
+
+    def snapshot(self) -> dict:
+        return {
+            **super().snapshot(),
+            **asdict(self.stats),
+            "avg_batch_size": self.stats.avg_batch_size,
+            "max_batch": self.max_batch,
+            "max_wait_ms": self.max_wait * 1000,
+        }
+
+
+def create_local_backend() -> LocalInferenceBackend:
+    path = settings.INFERENCE_LOCAL_MODEL_PATH
+    if not path:
+        raise RuntimeError("INFERENCE_BACKEND=local requires INFERENCE_LOCAL_MODEL_PATH")
+
+    model = load_model(path, settings.INFERENCE_LOCAL_INPUT_SIZE, settings.INFERENCE_LOCAL_CLASSES)
+    model_id = f"local/{os.path.splitext(os.path.basename(path))[0]}"
+    logger.info(f">>> Local inference backend loaded {path} ({type(model).__name__})")
+    return LocalInferenceBackend(model, model_id)
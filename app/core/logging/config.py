@@ -1,6 +1,8 @@
+import copy
 import logging
 import logging.config
-import sys
+
+from app.core.config import settings
 
 LOGGING_CONFIG = {
     "version": 1,
@@ -11,13 +13,18 @@ LOGGING_CONFIG = {
             "datefmt": "%Y-%m-%d %H:%M:%S",
         },
         "verbose": {"format": "%(asctime)s %(levelname)-8s [%(name)s:%(lineno)d] %(message)s"},
+        "json": {"()": "app.core.logging.formatters.JsonFormatter"},
+    },
+    "filters": {
+        "request_context": {"()": "app.core.logging.context.RequestContextFilter"},
     },
     "handlers": {
         "console": {
             "level": "INFO",
             "class": "logging.StreamHandler",
-            "stream": sys.stdout,
+            "stream": "ext://sys.stdout",
             "formatter": "default",
+            "filters": ["request_context"],
         },
     },
     "loggers": {
@@ -42,5 +49,25 @@ LOGGING_CONFIG = {
 }
 
 
+def build_logging_config() -> dict:
+    config = copy.deepcopy(LOGGING_CONFIG)
+    console = config["handlers"]["console"]
+    console["formatter"] = "json" if settings.LOG_FORMAT == "json" else "default"
+
+    if settings.LOG_ASYNC:
+        config["handlers"]["console"] = {
+            "()": "app.core.logging.handlers.AsyncLogHandler",
+            "level": console["level"],
+            "formatter": console["formatter"],
+            "filters": console["filters"],
+            "queue_size": settings.LOG_QUEUE_SIZE,
+            "batch_size": settings.LOG_BATCH_SIZE,
+            "flush_interval": settings.LOG_FLUSH_INTERVAL,
+            "stream": console["stream"],
+        }
+
+    return config
+
+
 def setup_logging():
-    logging.config.dictConfig(LOGGING_CONFIG)
+    logging.config.dictConfig(build_logging_config())
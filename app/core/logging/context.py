@@ -0,0 +1,13 @@
+import logging
+from contextvars import ContextVar
+from typing import Optional
+
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+
+class RequestContextFilter(logging.Filter):
+    # Runs on the emitting thread, so the request id is captured before the record is queued.
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, "request_id"):
+            record.request_id = request_id_var.get()
+        return True
@@ -1,41 +1,108 @@
 import functools
 import logging
+import random
 import time
-from typing import Any, Callable
+from typing import Any, Callable, Optional
 
-import sentry_sdk
+from app.core.config import settings
+from app.core.logging.histogram import latency_registry
+from app.core.metrics import OPERATION_LATENCY
 
 logger = logging.getLogger("app.performance")
 
 
-def monitor_async(operation_name: str, log_args: bool = False):
+class _LazyArgs:
+    # Rendered by the logging formatter only if the record is actually emitted.
+    __slots__ = ("args", "kwargs")
+
+    def __init__(self, args: tuple, kwargs: dict):
+        self.args = args
+        self.kwargs = kwargs
+
+    def __str__(self) -> str:
+        return f"args={self.args} kwargs={self.kwargs}"
+
+
+def _operation_options(operation_name: str) -> dict:
+    # Overrides are matched by prefix, so {"REDIS:": {...}} tunes every Redis operation at once;
+    # the longest matching prefix wins.
+    matches = [prefix for prefix in settings.MONITOR_OPERATIONS if operation_name.startswith(prefix)]
+    if not matches:
+        return {}
+    return settings.MONITOR_OPERATIONS[max(matches, key=len)]
+
+
+def monitor_async(
+    operation_name: str, log_args: bool = False, sample_rate: Optional[float] = None, level: Optional[str] = None
+):
     def decorator(func: Callable) -> Callable:
+        if not settings.MONITOR_ENABLED:
+            return func
+
+        options = _operation_options(operation_name)
+        rate = sample_rate if sample_rate is not None else options.get("sample_rate", settings.MONITOR_SAMPLE_RATE)
+        log_level = logging.getLevelName((level or options.get("level") or settings.MONITOR_LOG_LEVEL).upper())
+        histogram = latency_registry.histogram(operation_name)
+        export_metrics = settings.METRICS_ENABLED
+        if export_metrics:
+            success_metric = OPERATION_LATENCY.labels(operation=operation_name, outcome="success")
+            error_metric = OPERATION_LATENCY.labels(operation=operation_name, outcome="error")
+
         @functools.wraps(func)
         async def wrapper(*args, **kwargs) -> Any:
-            extra_info = f"args={args} kwargs={kwargs}" if log_args else ""
+            sampled = rate >= 1.0 or (rate > 0.0 and random.random() < rate)
+            if sampled and logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "[START] %s %s",
+                    operation_name,
+                    _LazyArgs(args, kwargs) if log_args else "",
+                    extra={"operation": operation_name},
+                )
 
-            logger.info(f"[START] {operation_name} {extra_info}")
-            start_time = time.time()
+            start_time = time.perf_counter_ns()
 
             try:
                 result = await func(*args, **kwargs)
 
-                execution_time = time.time() - start_time
-                logger.info(f"[SUCCESS] {operation_name} - Duration: {execution_time:.4f}s")
-
-                return result
-
             except Exception as e:
-                execution_time = time.time() - start_time
-                logger.error(f"[ERROR] {operation_name} failed after {execution_time:.4f}s: {str(e)}")
+                elapsed_ns = time.perf_counter_ns() - start_time
+                histogram.record_error(elapsed_ns)
+                if export_metrics:
+                    error_metric.observe(elapsed_ns / 1e9)
+                logger.error(
+                    "[ERROR] %s failed after %.4fs: %s",
+                    operation_name,
+                    elapsed_ns / 1e9,
+                    e,
+                    extra={"operation": operation_name, "duration_ms": elapsed_ns / 1e6},
+                )
 
-                with sentry_sdk.push_scope() as scope:
-                    scope.set_tag("operation", operation_name)
-                    scope.set_extra("execution_time", execution_time)
-                    sentry_sdk.capture_exception(e)
+                if settings.SENTRY_DSN:
+                    # Without a DSN Sentry is never initialised, so the (slow) import is skipped.
+                    import sentry_sdk
+
+                    with sentry_sdk.push_scope() as scope:
+                        scope.set_tag("operation", operation_name)
+                        scope.set_extra("execution_time", elapsed_ns / 1e9)
+                        sentry_sdk.capture_exception(e)
 
                 raise e
 
+            elapsed_ns = time.perf_counter_ns() - start_time
+            histogram.record(elapsed_ns)
+            if export_metrics:
+                success_metric.observe(elapsed_ns / 1e9)
+            if sampled and logger.isEnabledFor(log_level):
+                logger.log(
+                    log_level,
+                    "[SUCCESS] %s - Duration: %.4fs",
+                    operation_name,
+                    elapsed_ns / 1e9,
+                    extra={"operation": operation_name, "duration_ms": elapsed_ns / 1e6},
+                )
+
+            return result
+
         return wrapper
 
     return decorator
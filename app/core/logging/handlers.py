@@ -0,0 +1,91 @@
+import atexit
+import logging
+import queue
+import sys
+import threading
+from logging.handlers import QueueHandler
+from typing import List, Optional, TextIO
+
+from app.core.metrics import LOG_RECORDS_DROPPED
+
+_STOP = object()
+
+
+class AsyncLogHandler(QueueHandler):
+    # Records are queued unformatted; the writer thread formats whole batches and writes each
+    # batch with a single write/flush. When the bounded queue is full the record is dropped and
+    # counted instead of blocking the event loop.
+
+    def __init__(
+        self, queue_size: int = 10000, batch_size: int = 256, flush_interval: float = 0.5, stream: TextIO = None
+    ):
+        super().__init__(queue.Queue(maxsize=queue_size))
+        self.stream = stream or sys.stdout
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dropped = 0
+
+        self._thread: Optional[threading.Thread] = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            LOG_RECORDS_DROPPED.inc()
+
+    def _run(self) -> None:
+        while True:
+            try:
+                record = self.queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+
+            batch: List[logging.LogRecord] = []
+            stopping = record is _STOP
+            if not stopping:
+                batch.append(record)
+
+            while len(batch) < self.batch_size and not stopping:
+                try:
+                    record = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if record is _STOP:
+                    stopping = True
+                else:
+                    batch.append(record)
+
+            self._write(batch)
+            if stopping:
+                return
+
+    def _write(self, batch: List[logging.LogRecord]) -> None:
+        if not batch:
+            return
+
+        lines = []
+        for record in batch:
+            try:
+                lines.append(self.format(record))
+            except Exception:
+                self.handleError(record)
+
+        try:
+            self.stream.write("\n".join(lines) + "\n")
+            self.stream.flush()
+        except Exception:
+            self.handleError(batch[-1])
+
+    def close(self) -> None:
+        thread, self._thread = self._thread, None
+        if thread is not None and thread.is_alive():
+            # Blocking put: shutdown must not lose the records that are already queued.
+            self.queue.put(_STOP)
+            thread.join(timeout=5)
+        super().close()
@@ -0,0 +1,96 @@
+from typing import Dict, List
+
+# Log-linear buckets: every power of two is split into 2**SUB_BUCKET_BITS equal slices, so any
+# recorded value lands in a bucket at most 12.5% wide. The index comes from bit arithmetic only,
+# which keeps `record` cheap enough for the Redis hot path.
+SUB_BUCKET_BITS = 3
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+MAX_OCTAVE = 44
+BUCKET_COUNT = (MAX_OCTAVE - SUB_BUCKET_BITS + 1) * SUB_BUCKETS
+
+
+def _bucket_index(value_ns: int, bits: int = SUB_BUCKET_BITS, mask: int = SUB_BUCKETS - 1) -> int:
+    octave = value_ns.bit_length() - 1
+    if octave < bits:
+        return 0
+    if octave > MAX_OCTAVE:
+        return BUCKET_COUNT - 1
+    return ((octave - bits) << bits) | ((value_ns >> (octave - bits)) & mask)
+
+
+def _bucket_midpoint(index: int) -> float:
+    octave, sub = divmod(index, SUB_BUCKETS)
+    width = 1 << octave
+    return (SUB_BUCKETS + sub) * width + width / 2
+
+
+class LatencyHistogram:
+
+    def __init__(self, name: str):
+        self.name = name
+        self.count = 0
+        self.errors = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self._buckets: List[int] = [0] * BUCKET_COUNT
+
+    def record(self, value_ns: int) -> None:
+        self.count += 1
+        self.total_ns += value_ns
+        if value_ns > self.max_ns:
+            self.max_ns = value_ns
+        self._buckets[_bucket_index(value_ns)] += 1
+
+    def record_error(self, value_ns: int) -> None:
+        self.errors += 1
+        self.record(value_ns)
+
+    def percentile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+
+        rank = q / 100 * self.count
+        seen = 0
+        for index, bucket in enumerate(self._buckets):
+            seen += bucket
+            if bucket and seen >= rank:
+                return min(_bucket_midpoint(index), self.max_ns)
+        return float(self.max_ns)
+
+    def bucket_counts(self) -> List[tuple[float, int]]:
+        return [(_bucket_midpoint(i), count) for i, count in enumerate(self._buckets) if count]
+
+    def reset(self) -> None:
+        self.count = self.errors = self.total_ns = self.max_ns = 0
+        self._buckets = [0] * BUCKET_COUNT
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "mean_ms": round(self.total_ns / self.count / 1e6, 3) if self.count else 0.0,
+            "p50_ms": round(self.percentile(50) / 1e6, 3),
+            "p95_ms": round(self.percentile(95) / 1e6, 3),
+            "p99_ms": round(self.percentile(99) / 1e6, 3),
+            "max_ms": round(self.max_ns / 1e6, 3),
+        }
+
+
+class LatencyRegistry:
+
+    def __init__(self):
+        self._histograms: Dict[str, LatencyHistogram] = {}
+
+    def histogram(self, name: str) -> LatencyHistogram:
+        if name not in self._histograms:
+            self._histograms[name] = LatencyHistogram(name)
+        return self._histograms[name]
+
+    def items(self):
+        return self._histograms.items()
+
+    def snapshot(self) -> Dict[str, dict]:
+        return {name: histogram.snapshot() for name, histogram in sorted(self._histograms.items())}
+
+
+latency_registry = LatencyRegistry()
@@ -0,0 +1,110 @@
+import asyncio
+import logging
+import os
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+logger = logging.getLogger("app.metrics")
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Under gunicorn every worker writes its samples to PROMETHEUS_MULTIPROC_DIR and /metrics merges
+# them, so scraping any worker reports the whole instance. Gauges use "livesum" to add up the
+# current value of every live worker.
+MULTIPROCESS = bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+if MULTIPROCESS:
+    # gunicorn's on_starting hook resets the directory, but other processes from the same image
+    # (initial_setup.py, the job worker) import this module without it; unlabelled metrics open
+    # their sample files right here.
+    os.makedirs(os.environ["PROMETHEUS_MULTIPROC_DIR"], exist_ok=True)
+
+REQUEST_LATENCY = Histogram(
+    "app_http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+OPERATION_LATENCY = Histogram(
+    "app_operation_duration_seconds",
+    "Latency of operations wrapped by monitor_async",
+    ["operation", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+LOG_RECORDS_DROPPED = Counter("app_log_records_dropped_total", "Log records dropped because the log queue was full")
+ADMISSION_REJECTIONS = Counter(
+    "app_admission_rejections_total", "Requests rejected by admission control", ["route_class", "reason"]
+)
+CACHE_REQUESTS = Counter("app_cache_requests_total", "Cache lookups by cache family and result", ["cache", "result"])
+
+INFERENCE_QUEUE_DEPTH = Gauge(
+    "app_inference_queue_depth", "Inference calls waiting for a worker thread", multiprocess_mode="livesum"
+)
+INFERENCE_IN_FLIGHT = Gauge(
+    "app_inference_in_flight", "Inference calls currently executing", multiprocess_mode="livesum"
+)
+REDIS_POOL_CONNECTIONS = Gauge(
+    "app_redis_pool_connections", "Redis pool connections by state", ["state"], multiprocess_mode="livesum"
+)
+DB_POOL_CONNECTIONS = Gauge(
+    "app_db_pool_connections",
+    "SQLAlchemy pool connections by engine and state",
+    ["engine", "state"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "app_db_pool_checkout_wait_seconds", "Time spent waiting for a database connection", buckets=LATENCY_BUCKETS
+)
+
+
+def record_cache_lookup(cache: str, result: str) -> None:
+    CACHE_REQUESTS.labels(cache=cache, result=result).inc()
+
+
+def refresh_pool_gauges() -> None:
+    # Imported here: these modules import monitor_async, which in turn imports this module.
+    from app.core.database import pool_stats
+    from app.core.inference_executor import inference_executor
+    from app.core.redis_client import redis_manager
+
+    INFERENCE_QUEUE_DEPTH.set(inference_executor.queue_depth)
+    INFERENCE_IN_FLIGHT.set(inference_executor.in_flight)
+
+    # Cluster clients keep one pool per node and expose no single connection_pool.
+    pool = getattr(redis_manager.client, "connection_pool", None)
+    if pool is not None:
+        REDIS_POOL_CONNECTIONS.labels(state="in_use").set(len(getattr(pool, "_in_use_connections", ())))
+        REDIS_POOL_CONNECTIONS.labels(state="idle").set(len(getattr(pool, "_available_connections", ())))
+
+    for role, stats in pool_stats().items():
+        for state in ("checked_out", "checked_in", "overflow"):
+            if state in stats:
+                DB_POOL_CONNECTIONS.labels(engine=role, state=state).set(stats[state])
+
+
+async def refresh_pool_gauges_forever(interval: float) -> None:
+    while True:
+        try:
+            refresh_pool_gauges()
+        except Exception as e:
+            logger.warning(f"Failed to refresh pool gauges: {e}")
+        await asyncio.sleep(interval)
+
+
+def render_latest() -> tuple[bytes, str]:
+    refresh_pool_gauges()
+
+    if not MULTIPROCESS:
+        return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return generate_latest(registry), CONTENT_TYPE_LATEST
@@ -0,0 +1,25 @@
+import base64
+import binascii
+import json
+
+
+class InvalidCursorError(Exception):
+
+    pass
+
+
+def encode_cursor(last_id: int) -> str:
+    payload = json.dumps({"id": last_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        last_id = json.loads(base64.urlsafe_b64decode(padded))["id"]
+    except (binascii.Error, ValueError, KeyError, TypeError) as e:
+        raise InvalidCursorError("Malformed pagination cursor") from e
+
+    if not isinstance(last_id, int):
+        raise InvalidCursorError("Malformed pagination cursor")
+    return last_id
@@ -1,43 +1,88 @@
 import logging
 import ssl
-from typing import Optional
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Union
 
 import redis.asyncio as redis
+from redis.asyncio.cluster import RedisCluster
+from redis.asyncio.sentinel import Sentinel
 
+from app.core.cache_codec import CacheCodec, cache_codec
 from app.core.config import settings
+from app.core.local_cache import INVALIDATION_CHANNEL, NEGATIVE, LocalCache, local_cache
 from app.core.logging.decorators import monitor_async
 
 logger = logging.getLogger("app.redis")
 
+# Fills a cache entry only while its version key still holds the version the reader saw
+# before loading from the source, so a slow reader cannot overwrite a newer invalidation.
+SET_IF_VERSION_SCRIPT = """
+local current = redis.call('GET', KEYS[2]) or '0'
+if current ~= ARGV[1] then
+    return 0
+end
+redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3])
+if ARGV[4] == '1' then
+    redis.call('PUBLISH', ARGV[5], KEYS[1])
+end
+return 1
+"""
+
 
 class RedisManager:
 
     def __init__(self):
         self.client: Optional[redis.Redis] = None
+        self.is_cluster = False
+
+    def _connection_options(self) -> Dict[str, Any]:
+        options = {
+            "decode_responses": not settings.REDIS_BINARY_SAFE,
+            "encoding": "utf-8",
+            "socket_timeout": settings.REDIS_SOCKET_TIMEOUT,
+            "socket_connect_timeout": settings.REDIS_SOCKET_CONNECT_TIMEOUT,
+            "socket_keepalive": settings.REDIS_SOCKET_KEEPALIVE,
+            "health_check_interval": settings.REDIS_HEALTH_CHECK_INTERVAL,
+        }
+        if settings.REDIS_URL.startswith("rediss://"):
+            options["ssl_cert_reqs"] = ssl.CERT_NONE
+        return options
+
+    def _build_client(self):
+        options = self._connection_options()
+
+        if settings.REDIS_MODE == "cluster":
+            options.pop("health_check_interval")
+            return RedisCluster.from_url(settings.REDIS_URL, max_connections=settings.REDIS_MAX_CONNECTIONS, **options)
+
+        if settings.REDIS_MODE == "sentinel":
+            sentinels = [(host, int(port)) for host, port in (node.rsplit(":", 1) for node in settings.REDIS_SENTINELS)]
+            sentinel = Sentinel(sentinels, socket_timeout=settings.REDIS_SOCKET_TIMEOUT)
+            return sentinel.master_for(
+                settings.REDIS_SENTINEL_MASTER, max_connections=settings.REDIS_MAX_CONNECTIONS, **options
+            )
+
+        # Blocking pool: when every connection is busy, callers wait up to REDIS_POOL_TIMEOUT for
+        # one to be released instead of failing immediately with "Too many connections".
+        pool = redis.BlockingConnectionPool.from_url(
+            settings.REDIS_URL,
+            max_connections=settings.REDIS_MAX_CONNECTIONS,
+            timeout=settings.REDIS_POOL_TIMEOUT,
+            **options,
+        )
+        return redis.Redis(connection_pool=pool)
 
     async def connect(self) -> None:
 
         if self.client:
             return
 
-        ssl_context = None
-        if settings.REDIS_URL.startswith("rediss://"):
-            ssl_context = ssl.create_default_context()
-            ssl_context.check_hostname = False
-            ssl_context.verify_mode = ssl.CERT_NONE
-
         try:
 
-            self.client = redis.from_url(
-                settings.REDIS_URL,
-                decode_responses=True,
-                encoding="utf-8",
-                ssl_cert_reqs=ssl.CERT_NONE if ssl_context else None,
-                max_connections=10,
-                socket_timeout=5,
-            )
+            self.client = self._build_client()
+            self.is_cluster = settings.REDIS_MODE == "cluster"
             await self.client.ping()
-            logger.info(">>> Redis connection established successfully.")
+            logger.info(f">>> Redis connection established successfully ({settings.REDIS_MODE}).")
 
         except Exception as e:
             logger.critical(f"!!! Failed to connect to Redis: {e}", exc_info=True)
@@ -46,37 +91,263 @@ class RedisManager:
 
     async def close(self) -> None:
         if self.client:
-            await self.client.close()
+            await self.client.aclose()
             logger.info(">>> Redis connection closed.")
 
 
 redis_manager = RedisManager()
 
+# A single TTL for every key, or a per-key mapping (keys missing from it do not expire).
+Expiry = Union[int, Dict[str, int], None]
+
+
+class RedisBatch:
+    # Commands are buffered and sent in one round trip when the `async with` block exits;
+    # `results` then holds their replies in call order.
+
+    def __init__(self, service: "RedisService", transaction: bool):
+        self.service = service
+        self.pipe = service.client.pipeline(transaction=transaction)
+        self.written: List[str] = []
+        self.commands = 0
+        self.results: List[Any] = []
+
+    def get(self, key: str) -> "RedisBatch":
+        return self._queue(self.pipe.get, key)
+
+    def set(self, key: str, value: Union[str, bytes], ex: int = None) -> "RedisBatch":
+        self.written.append(key)
+        return self._queue(self.pipe.set, key, value, ex=ex)
+
+    def set_object(self, key: str, value: Any, ex: int = None) -> "RedisBatch":
+        return self.set(key, self.service.codec.encode(value), ex=ex)
+
+    def delete(self, key: str) -> "RedisBatch":
+        self.written.append(key)
+        return self._queue(self.pipe.delete, key)
+
+    def incr(self, key: str, amount: int = 1) -> "RedisBatch":
+        self.written.append(key)
+        return self._queue(self.pipe.incr, key, amount)
+
+    def expire(self, key: str, seconds: int) -> "RedisBatch":
+        return self._queue(self.pipe.expire, key, seconds)
+
+    def exists(self, key: str) -> "RedisBatch":
+        return self._queue(self.pipe.exists, key)
+
+    def _queue(self, command, *args, **kwargs) -> "RedisBatch":
+        command(*args, **kwargs)
+        self.commands += 1
+        return self
+
 
 class RedisService:
 
-    def __init__(self, client: redis.Redis):
+    def __init__(
+        self,
+        client: redis.Redis,
+        local_cache: Optional[LocalCache] = None,
+        broadcast_invalidations=False,
+        codec: CacheCodec = cache_codec,
+    ):
         self.client = client
+        self.local_cache = local_cache
+        self.broadcast_invalidations = broadcast_invalidations or local_cache is not None
+        self.codec = codec
+        self.is_cluster = isinstance(client, RedisCluster)
+
+    async def get(self, key: str, use_local: bool = True) -> Optional[str]:
+        return self._as_text(await self._get_raw(key, use_local))
+
+    async def get_object(self, key: str, use_local: bool = True) -> Any:
+        raw = await self._get_raw(key, use_local)
+        return None if raw is None else self.codec.decode(raw)
+
+    async def set_object(self, key: str, value: Any, ex: int = None) -> None:
+        await self.set(key, self.codec.encode(value), ex=ex)
+
+    async def _get_raw(self, key: str, use_local: bool) -> Union[str, bytes, None]:
+        if self.local_cache is None or not use_local:
+            return await self._get(key)
+
+        value = self.local_cache.get(key)
+        if value is NEGATIVE:
+            return None
+        if value is not None:
+            return value
+
+        value = await self._get(key)
+        if value is None:
+            self.local_cache.set_negative(key)
+        else:
+            self.local_cache.set(key, value)
+        return value
 
     @monitor_async(operation_name="REDIS: GET", log_args=True)
-    async def get(self, key: str) -> Optional[str]:
+    async def _get(self, key: str) -> Union[str, bytes, None]:
         return await self.client.get(key)
 
     @monitor_async(operation_name="REDIS: SET", log_args=True)
-    async def set(self, key: str, value: str, ex: int = None) -> None:
-        await self.client.set(key, value, ex=ex)
+    async def set(self, key: str, value: Union[str, bytes], ex: int = None) -> None:
+        if not self.broadcast_invalidations:
+            await self.client.set(key, value, ex=ex)
+            return
+
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.set(key, value, ex=ex)
+            pipe.publish(INVALIDATION_CHANNEL, key)
+            await pipe.execute()
+        self._invalidate_local(key)
+
+    async def mget(self, keys: List[str]) -> List[Optional[str]]:
+        return [self._as_text(raw) for raw in await self._mget_raw(keys)]
+
+    async def mget_objects(self, keys: List[str]) -> List[Any]:
+        return [None if raw is None else self.codec.decode(raw) for raw in await self._mget_raw(keys)]
+
+    async def set_many_objects(self, mapping: Dict[str, Any], ex: Expiry = None) -> None:
+        await self.set_many({key: self.codec.encode(value) for key, value in mapping.items()}, ex=ex)
+
+    async def _mget_raw(self, keys: List[str]) -> List[Union[str, bytes, None]]:
+        if not keys:
+            return []
+        if self.local_cache is None:
+            return await self._mget(keys)
+
+        values = [self.local_cache.get(key) for key in keys]
+        missing = [i for i, value in enumerate(values) if value is None]
+        if missing:
+            fetched = await self._mget([keys[i] for i in missing])
+            for i, value in zip(missing, fetched):
+                values[i] = value
+                if value is None:
+                    self.local_cache.set_negative(keys[i])
+                else:
+                    self.local_cache.set(keys[i], value)
+
+        return [None if value is NEGATIVE else value for value in values]
+
+    @monitor_async(operation_name="REDIS: MGET", log_args=False)
+    async def _mget(self, keys: List[str]) -> List[Union[str, bytes, None]]:
+        if self.is_cluster:
+            # Keys may live on different nodes; redis-py splits the call per slot.
+            return await self.client.mget_nonatomic(keys)
+        return await self.client.mget(keys)
+
+    @monitor_async(operation_name="REDIS: SET MANY", log_args=False)
+    async def set_many(self, mapping: Dict[str, Union[str, bytes]], ex: Expiry = None) -> None:
+        if not mapping:
+            return
+        async with self.client.pipeline(transaction=False) as pipe:
+            for key, value in mapping.items():
+                pipe.set(key, value, ex=ex.get(key) if isinstance(ex, dict) else ex)
+                if self.broadcast_invalidations:
+                    pipe.publish(INVALIDATION_CHANNEL, key)
+            await pipe.execute()
+        for key in mapping:
+            self._invalidate_local(key)
 
     @monitor_async(operation_name="REDIS: DELETE", log_args=True)
     async def delete(self, key: str) -> int:
-        return await self.client.delete(key)
+        if not self.broadcast_invalidations:
+            return await self.client.delete(key)
+
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.delete(key)
+            pipe.publish(INVALIDATION_CHANNEL, key)
+            deleted, _ = await pipe.execute()
+        self._invalidate_local(key)
+        return deleted
+
+    @monitor_async(operation_name="REDIS: DELETE MANY", log_args=False)
+    async def delete_many(self, keys: List[str], bump: List[str] = (), bump_ttl: int = None) -> None:
+        # `bump` keys are version counters incremented in the same round trip as the deletes.
+        if not keys and not bump:
+            return
+        async with self.client.pipeline(transaction=not self.is_cluster) as pipe:
+            for key in bump:
+                pipe.incr(key)
+                if bump_ttl:
+                    pipe.expire(key, bump_ttl)
+            if self.is_cluster:
+                for key in keys:
+                    pipe.delete(key)
+            elif keys:
+                pipe.delete(*keys)
+            if self.broadcast_invalidations:
+                for key in keys:
+                    pipe.publish(INVALIDATION_CHANNEL, key)
+            await pipe.execute()
+        for key in keys:
+            self._invalidate_local(key)
+
+    @asynccontextmanager
+    async def batch(self, transaction: bool = False) -> AsyncIterator[RedisBatch]:
+        # Cluster pipelines cannot run MULTI/EXEC across slots, so batches there are plain pipelines.
+        batch = RedisBatch(self, transaction and not self.is_cluster)
+        try:
+            yield batch
+            await self._execute_batch(batch)
+        finally:
+            await batch.pipe.reset()
+
+    @monitor_async(operation_name="REDIS: PIPELINE", log_args=False)
+    async def _execute_batch(self, batch: RedisBatch) -> None:
+        if not batch.commands:
+            return
+        if self.broadcast_invalidations:
+            for key in batch.written:
+                batch.pipe.publish(INVALIDATION_CHANNEL, key)
+
+        batch.results = (await batch.pipe.execute())[: batch.commands]
+        for key in batch.written:
+            self._invalidate_local(key)
+
+    async def get_version(self, version_key: str) -> str:
+        return self._as_text(await self._get(version_key)) or "0"
+
+    @monitor_async(operation_name="REDIS: SET IF VERSION", log_args=False)
+    async def set_object_if_version(self, key: str, value: Any, version_key: str, version: str, ex: int) -> bool:
+        stored = await self.client.eval(
+            SET_IF_VERSION_SCRIPT,
+            2,
+            key,
+            version_key,
+            version,
+            self.codec.encode(value),
+            ex,
+            int(self.broadcast_invalidations),
+            INVALIDATION_CHANNEL,
+        )
+        self._invalidate_local(key)
+        return bool(stored)
 
     @monitor_async(operation_name="REDIS: EXISTS", log_args=True)
     async def exists(self, key: str) -> bool:
         return await self.client.exists(key) > 0
 
+    @staticmethod
+    def _as_text(raw: Union[str, bytes, None]) -> Optional[str]:
+        if isinstance(raw, bytes):
+            return raw.decode("utf-8", errors="backslashreplace")
+        return raw
+
+    def _invalidate_local(self, key: str) -> None:
+        if self.local_cache is not None:
+            self.local_cache.invalidate(key)
+
 
 async def get_redis_service() -> RedisService:
     if not redis_manager.client:
         raise RuntimeError("Redis client is not initialized. Check startup logs.")
 
-    return RedisService(redis_manager.client)
+    if not settings.L1_CACHE_ENABLED:
+        return RedisService(redis_manager.client)
+
+    # The local tier is only trusted while its invalidation listener is alive.
+    return RedisService(
+        redis_manager.client,
+        local_cache=local_cache if local_cache.coherent else None,
+        broadcast_invalidations=True,
+    )
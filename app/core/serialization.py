@@ -0,0 +1,41 @@
+from typing import Any, Type, TypeVar, Union
+
+import orjson
+from fastapi import Response, status
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import BaseModel
+
+from app.core.config import settings
+
+# The app-wide default response class: with FAST_SERIALIZATION plain dict responses are encoded
+# by orjson instead of json.dumps.
+DefaultResponse = ORJSONResponse if settings.FAST_SERIALIZATION else JSONResponse
+
+Model = TypeVar("Model", bound=BaseModel)
+
+
+def read_model(model: Type[Model], obj: Any) -> Model:
+    if not settings.FAST_SERIALIZATION:
+        return model.model_validate(obj)
+
+    # Database rows and cache entries this service wrote were validated on the way in. Copying
+    # them skips per-read validators such as EmailStr, which dominate large list responses.
+    get = obj.__getitem__ if isinstance(obj, dict) else obj.__getattribute__
+    return model.model_construct(**{name: get(name) for name in model.model_fields})
+
+
+def model_response(model: BaseModel, status_code: int = status.HTTP_200_OK) -> Union[Response, BaseModel]:
+    # Service methods already return validated schema objects. FastAPI would validate them
+    # against response_model a second time and run jsonable_encoder before encoding; dumping
+    # straight to JSON bytes is one pass. Without FAST_SERIALIZATION the model goes through the
+    # regular FastAPI path.
+    if not settings.FAST_SERIALIZATION:
+        return model
+    return Response(content=model.model_dump_json(), media_type="application/json", status_code=status_code)
+
+
+def json_envelope(data: bytes, **fields: Any) -> bytes:
+    # Splices pre-encoded JSON into a response object without decoding it.
+    head = orjson.dumps(fields)
+    separator = b"," if len(head) > 2 else b""
+    return head[:-1] + separator + b'"data":' + data + b"}"
@@ -0,0 +1,121 @@
+import asyncio
+import logging
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+import redis.asyncio as redis
+
+from app.core.config import settings
+
+logger = logging.getLogger("app.single_flight")
+
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+Producer = Callable[[], Awaitable[Any]]
+Recheck = Callable[[], Awaitable[Optional[Any]]]
+
+
+class SingleFlight:
+
+    def __init__(self, namespace: str, lock_ttl: float, wait_timeout: float, poll_interval: float = 0.25):
+        self.namespace = namespace
+        self.lock_ttl = lock_ttl
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    def _lock_key(self, key: str) -> str:
+        return f"singleflight:{self.namespace}:lock:{key}"
+
+    def _channel(self, key: str) -> str:
+        return f"singleflight:{self.namespace}:done:{key}"
+
+    async def run(
+        self, key: str, producer: Producer, recheck: Recheck, redis_client: Optional[redis.Redis] = None
+    ) -> Tuple[Any, bool]:
+
+        shared = self._inflight.get(key)
+        if shared is not None:
+            result, _ = await asyncio.shield(shared)
+            return result, True
+
+        # The leader runs as its own task so a disconnecting client cannot cancel the call
+        # other requests are waiting on.
+        shared = asyncio.ensure_future(self._run_distributed(key, producer, recheck, redis_client))
+        self._inflight[key] = shared
+        shared.add_done_callback(lambda _: self._inflight.pop(key, None))
+
+        return await asyncio.shield(shared)
+
+    async def _run_distributed(
+        self, key: str, producer: Producer, recheck: Recheck, redis_client: Optional[redis.Redis]
+    ) -> Tuple[Any, bool]:
+
+        if redis_client is None:
+            return await producer(), False
+
+        lock_key = self._lock_key(key)
+        token = uuid.uuid4().hex
+
+        if await redis_client.set(lock_key, token, nx=True, px=int(self.lock_ttl * 1000)):
+            try:
+                return await producer(), False
+            finally:
+                await redis_client.eval(RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+                await redis_client.publish(self._channel(key), token)
+
+        result = await self._wait_for_leader(key, recheck, redis_client)
+        if result is not None:
+            return result, True
+
+        logger.warning(f"Single-flight leader for '{key}' did not deliver, calling upstream directly")
+        return await producer(), False
+
+    async def _wait_for_leader(self, key: str, recheck: Recheck, redis_client: redis.Redis) -> Optional[Any]:
+        lock_key = self._lock_key(key)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.wait_timeout
+
+        try:
+            # The asyncio cluster client has no pub/sub; waiters fall back to polling there.
+            pubsub = redis_client.pubsub()
+            await pubsub.subscribe(self._channel(key))
+        except Exception as e:
+            logger.warning(f"Single-flight notifications unavailable, falling back to polling: {e}")
+            pubsub = None
+
+        try:
+            while True:
+                result = await recheck()
+                if result is not None:
+                    return result
+
+                if not await redis_client.exists(lock_key):
+                    return await recheck()
+
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return None
+
+                if pubsub is not None:
+                    await pubsub.get_message(ignore_subscribe_messages=True, timeout=min(remaining, self.poll_interval))
+                else:
+                    await asyncio.sleep(min(remaining, self.poll_interval))
+
+        finally:
+            if pubsub is not None:
+                await pubsub.unsubscribe()
+                await pubsub.aclose()
+
+
+inference_flight = SingleFlight(
+    namespace="inference", lock_ttl=settings.SINGLE_FLIGHT_LOCK_TTL, wait_timeout=settings.SINGLE_FLIGHT_WAIT_TIMEOUT
+)
+cat_flight = SingleFlight(
+    namespace="cat", lock_ttl=settings.SINGLE_FLIGHT_LOCK_TTL, wait_timeout=settings.SINGLE_FLIGHT_WAIT_TIMEOUT
+)
@@ -1,17 +1,26 @@
+import asyncio
 import logging
+import time
+import uuid
 from contextlib import asynccontextmanager
 
-import sentry_sdk
 from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
-from sentry_sdk.integrations.fastapi import FastApiIntegration
-from sentry_sdk.integrations.redis import RedisIntegration
-from sentry_sdk.integrations.sqlalchemy import SqlalchemyIntegration
+from fastapi.responses import JSONResponse, Response
 
 from app.api.api import api_router
+from app.core.admission import AdmissionRejected, admission_controller, client_identity
 from app.core.config import settings
+from app.core.database import dispose_engines, pool_stats
+from app.core.http_client import outbound_http
+from app.core.inference_client import close_backend, get_backend
+from app.core.inference_executor import inference_executor
+from app.core.local_cache import local_cache
 from app.core.logging.config import setup_logging
+from app.core.logging.context import request_id_var
+from app.core.logging.histogram import latency_registry
+from app.core.metrics import REQUEST_LATENCY, refresh_pool_gauges_forever, render_latest
 from app.core.redis_client import redis_manager
+from app.core.serialization import DefaultResponse
 
 # from sentry_sdk.integrations.logging import LoggingIntegration # (Optional, if using explicit handlers)
 
@@ -26,6 +35,13 @@ async def lifespan(app: FastAPI):
     logger.info(">>> APPLICATION STARTUP: Initializing infrastructure... <<<")
 
     if settings.SENTRY_DSN:
+        # Imported only when configured: sentry_sdk and its integrations are among the slowest
+        # imports of the app.
+        import sentry_sdk
+        from sentry_sdk.integrations.fastapi import FastApiIntegration
+        from sentry_sdk.integrations.redis import RedisIntegration
+        from sentry_sdk.integrations.sqlalchemy import SqlalchemyIntegration
+
         sentry_sdk.init(
             dsn=settings.SENTRY_DSN,
             environment=settings.ENVIRONMENT,
@@ -47,10 +63,42 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.critical(f"Startup Failed: Redis connection error: {e}")
 
+    if settings.L1_CACHE_ENABLED and redis_manager.client:
+        try:
+            await local_cache.start_invalidation_listener(redis_manager.client, settings.L1_CACHE_KEYSPACE_EVENTS)
+            logger.info("Checked: L1 Cache -> ENABLED")
+        except Exception as e:
+            logger.error(f"L1 cache disabled, invalidation listener failed to start: {e}")
+
+    inference_executor.start()
+    logger.info("Checked: Inference Executor -> STARTED")
+
+    outbound_http.start()
+    logger.info("Checked: Outbound HTTP Client -> STARTED")
+
+    if settings.INFERENCE_EAGER_INIT:
+        try:
+            get_backend()
+            logger.info(f"Checked: Inference Backend -> LOADED ({settings.INFERENCE_BACKEND})")
+        except Exception as e:
+            logger.error(f"Inference backend failed to load, retrying on first request: {e}")
+
+    metrics_task = None
+    if settings.METRICS_ENABLED:
+        metrics_task = asyncio.create_task(refresh_pool_gauges_forever(settings.METRICS_REFRESH_INTERVAL))
+        logger.info("Checked: Metrics -> ENABLED")
+
     yield
 
     logger.info(">>> APPLICATION SHUTDOWN: Cleaning up resources... <<<")
+    if metrics_task:
+        metrics_task.cancel()
+    await close_backend()
+    inference_executor.shutdown()
+    await outbound_http.close()
+    await local_cache.stop_invalidation_listener()
     await redis_manager.close()
+    await dispose_engines()
     logger.info("Resources released. Bye!")
 
 
@@ -59,6 +107,7 @@ app = FastAPI(
     description="Scalable API with Sentry, Redis, and Structured Logging",
     version="1.1.0",
     lifespan=lifespan,
+    default_response_class=DefaultResponse,
     docs_url="/docs" if settings.ENVIRONMENT != "production" else None,
     redoc_url=None,
 )
@@ -74,7 +123,10 @@ async def global_exception_handler(request: Request, call_next):
             exc_info=True,
         )
 
-        sentry_sdk.capture_exception(e)
+        if settings.SENTRY_DSN:
+            import sentry_sdk
+
+            sentry_sdk.capture_exception(e)
 
         return JSONResponse(
             status_code=500,
@@ -85,6 +137,76 @@ async def global_exception_handler(request: Request, call_next):
         )
 
 
+if settings.ADMISSION_ENABLED:
+
+    @app.middleware("http")
+    async def admission_control(request: Request, call_next):
+        route_class = admission_controller.classify(request.url.path)
+        if route_class is None:
+            return await call_next(request)
+
+        try:
+            await admission_controller.admit(route_class, client_identity(request))
+        except AdmissionRejected as e:
+            return JSONResponse(
+                status_code=e.status_code,
+                content={"detail": e.detail, "reason": e.reason},
+                headers={"Retry-After": str(e.retry_after)},
+            )
+
+        started = time.perf_counter()
+        try:
+            response = await call_next(request)
+        except BaseException:
+            admission_controller.release(route_class, time.perf_counter() - started)
+            raise
+
+        # Streaming bodies (batch NDJSON, exports, SSE) keep their slot until fully sent.
+        body = response.body_iterator
+
+        async def release_when_sent():
+            try:
+                async for chunk in body:
+                    yield chunk
+            finally:
+                admission_controller.release(route_class, time.perf_counter() - started)
+
+        response.body_iterator = release_when_sent()
+        return response
+
+
+@app.middleware("http")
+async def request_context(request: Request, call_next):
+    request_id = request.headers.get("X-Request-ID") or uuid.uuid4().hex
+    request.state.request_id = request_id
+    token = request_id_var.set(request_id)
+    try:
+        response = await call_next(request)
+        response.headers["X-Request-ID"] = request_id
+        return response
+    finally:
+        request_id_var.reset(token)
+
+
+if settings.METRICS_ENABLED:
+
+    @app.middleware("http")
+    async def request_metrics(request: Request, call_next):
+        started = time.perf_counter()
+        status_code = 500
+        try:
+            response = await call_next(request)
+            status_code = response.status_code
+            return response
+        finally:
+            route = request.scope.get("route")
+            REQUEST_LATENCY.labels(
+                method=request.method,
+                route=route.path if route else "unmatched",
+                status=str(status_code),
+            ).observe(time.perf_counter() - started)
+
+
 app.include_router(api_router)
 
 
@@ -94,6 +216,37 @@ async def health_check():
     return {"status": "ok", "version": app.version}
 
 
+@app.get("/stats/operations", tags=["System"])
+async def operation_latency():
+
+    return latency_registry.snapshot()
+
+
+@app.get("/stats/db-pool", tags=["System"])
+async def database_pool_stats():
+
+    return pool_stats()
+
+
+@app.get("/stats/upstreams", tags=["System"])
+async def upstream_circuits():
+
+    return outbound_http.snapshot()
+
+
+@app.get("/stats/admission", tags=["System"])
+async def admission_stats():
+
+    return admission_controller.snapshot()
+
+
+@app.get("/metrics", tags=["System"], include_in_schema=False)
+async def metrics():
+
+    content, content_type = render_latest()
+    return Response(content=content, media_type=content_type)
+
+
 @app.get("/sentry-debug", tags=["System"])
 async def trigger_error():
 
@@ -1,12 +1,16 @@
-from typing import List, Optional
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 
-from sqlalchemy import delete, select, update
+from sqlalchemy import delete, select, text, update
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.logging.decorators import monitor_async
 from app.models.user import User
-from app.schemas.user import UserCreate, UserUpdate
+from app.schemas.user import UserBulkUpdate, UserCreate, UserUpdate
+
+# (index in the request, reason) for every item a bulk operation did not apply.
+BulkErrors = List[Tuple[int, str]]
 
 
 class UserAlreadyExistsError(Exception):
@@ -15,8 +19,11 @@ class UserAlreadyExistsError(Exception):
 
 
 class UserRepository:
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, read_session: Optional[AsyncSession] = None):
+        # Reads that tolerate replication lag go to `read_session`; writes, and reads that must
+        # see them, use the primary `session`.
         self.session = session
+        self.read_session = read_session or session
 
     @monitor_async(operation_name="DB: Create User", log_args=False)
     async def create(self, user_data: UserCreate) -> User:
@@ -33,20 +40,75 @@ class UserRepository:
             raise UserAlreadyExistsError(f"User with email {user_data.email} already exists.") from e
 
     @monitor_async(operation_name="DB: Get All Users", log_args=False)
-    async def get_all(self, skip: int = 0, limit: int = 100) -> List[User]:
-        stmt = select(User).offset(skip).limit(limit)
-        result = await self.session.execute(stmt)
+    async def get_all(
+        self, skip: int = 0, limit: int = 100, is_active: Optional[bool] = None, email_prefix: Optional[str] = None
+    ) -> List[User]:
+        stmt = self._filtered(select(User), is_active, email_prefix).order_by(User.id).offset(skip).limit(limit)
+        result = await self.read_session.execute(stmt)
         return result.scalars().all()
 
+    @staticmethod
+    def _filtered(stmt, is_active: Optional[bool] = None, email_prefix: Optional[str] = None):
+        if is_active is not None:
+            stmt = stmt.where(User.is_active.is_(is_active))
+        if email_prefix:
+            stmt = stmt.where(User.email.startswith(email_prefix, autoescape=True))
+        return stmt
+
+    @monitor_async(operation_name="DB: Get Users Page", log_args=False)
+    async def get_page(
+        self,
+        after_id: Optional[int] = None,
+        limit: int = 100,
+        is_active: Optional[bool] = None,
+        email_prefix: Optional[str] = None,
+    ) -> List[User]:
+        stmt = self._filtered(select(User), is_active, email_prefix)
+        if after_id is not None:
+            stmt = stmt.where(User.id > after_id)
+
+        result = await self.read_session.execute(stmt.order_by(User.id).limit(limit))
+        return result.scalars().all()
+
+    async def stream_all(
+        self, is_active: Optional[bool] = None, email_prefix: Optional[str] = None, batch_size: int = 1000
+    ) -> AsyncIterator[User]:
+        stmt = self._filtered(select(User), is_active, email_prefix).order_by(User.id)
+
+        result = await self.read_session.stream_scalars(stmt.execution_options(yield_per=batch_size))
+        async for user in result:
+            yield user
+
     @monitor_async(operation_name="DB: Get User By ID", log_args=True)
-    async def get_by_id(self, user_id: int) -> Optional[User]:
-        return await self.session.get(User, user_id)
+    async def get_by_id(self, user_id: int, primary: bool = False) -> Optional[User]:
+        return await (self.session if primary else self.read_session).get(User, user_id)
+
+    @monitor_async(operation_name="DB: Get User By Email", log_args=True)
+    async def get_by_email(self, email: str, primary: bool = False) -> Optional[User]:
+        session = self.session if primary else self.read_session
+        result = await session.execute(select(User).where(User.email == email))
+        return result.scalars().first()
+
+    @monitor_async(operation_name="DB: Get User Id By Email", log_args=True)
+    async def get_id_by_email(self, email: str) -> Optional[int]:
+        result = await self.session.execute(select(User.id).where(User.email == email))
+        return result.scalars().first()
+
+    @monitor_async(operation_name="DB: Get User Ids By Email", log_args=False)
+    async def ids_for_emails(self, emails: List[str], chunk_size: int = 1000) -> List[int]:
+        ids = []
+        for start in range(0, len(emails), chunk_size):
+            result = await self.session.execute(
+                select(User.id).where(User.email.in_(emails[start : start + chunk_size]))
+            )
+            ids.extend(result.scalars().all())
+        return ids
 
     @monitor_async(operation_name="DB: Update User", log_args=True)
     async def update(self, user_id: int, user_data: UserUpdate) -> Optional[User]:
         data = user_data.model_dump(exclude_unset=True)
         if not data:
-            return await self.get_by_id(user_id)
+            return await self.get_by_id(user_id, primary=True)
 
         stmt = update(User).where(User.id == user_id).values(**data).returning(User)
 
@@ -65,3 +127,147 @@ class UserRepository:
         result = await self.session.execute(stmt)
         await self.session.commit()
         return result.rowcount > 0
+
+    @property
+    def dialect(self) -> str:
+        return self.session.bind.dialect.name
+
+    def _upsert_statement(self, rows: List[dict], on_conflict: str):
+        insert = postgresql.insert if self.dialect == "postgresql" else sqlite.insert
+        stmt = insert(User).values(rows)
+        if on_conflict == "skip":
+            stmt = stmt.on_conflict_do_nothing(index_elements=[User.email])
+        else:
+            stmt = stmt.on_conflict_do_update(index_elements=[User.email], set_={"full_name": stmt.excluded.full_name})
+        return stmt.returning(User).execution_options(populate_existing=True)
+
+    @monitor_async(operation_name="DB: Bulk Upsert Users", log_args=False)
+    async def bulk_upsert(
+        self, users: List[UserCreate], on_conflict: str = "update", chunk_size: int = 1000
+    ) -> Tuple[List[User], BulkErrors]:
+        # Postgres rejects an upsert that touches the same row twice, so duplicates inside the
+        # request are reported instead of being sent.
+        first_seen: Dict[str, int] = {}
+        rows, errors = [], []
+        for index, user in enumerate(users):
+            if user.email in first_seen:
+                errors.append((index, f"Duplicate email {user.email} in request (see item {first_seen[user.email]})."))
+                continue
+            first_seen[user.email] = index
+            rows.append({**user.model_dump(), "is_active": True})
+
+        saved: List[User] = []
+        for start in range(0, len(rows), chunk_size):
+            result = await self.session.execute(self._upsert_statement(rows[start : start + chunk_size], on_conflict))
+            saved.extend(result.scalars().all())
+        await self.session.commit()
+
+        if on_conflict == "skip":
+            stored = {user.email for user in saved}
+            errors.extend(
+                (index, f"User with email {email} already exists.")
+                for email, index in first_seen.items()
+                if email not in stored
+            )
+
+        return saved, sorted(errors)
+
+    @monitor_async(operation_name="DB: Copy Upsert Users", log_args=False)
+    async def copy_upsert(self, users: List[UserCreate], on_conflict: str = "update") -> int:
+        # COPY cannot resolve conflicts itself: rows are streamed into a temporary table and merged
+        # with one INSERT ... SELECT. Requires PostgreSQL with the asyncpg driver.
+        connection = await self.session.connection()
+        await connection.execute(
+            text("CREATE TEMP TABLE users_import (email varchar NOT NULL, full_name varchar) ON COMMIT DROP")
+        )
+
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            "users_import", records=[(user.email, user.full_name) for user in users], columns=["email", "full_name"]
+        )
+
+        conflict = "DO NOTHING" if on_conflict == "skip" else "DO UPDATE SET full_name = EXCLUDED.full_name"
+        result = await connection.execute(
+            text(
+                "INSERT INTO users (email, full_name, is_active) "
+                "SELECT DISTINCT ON (email) email, full_name, true FROM users_import "
+                f"ON CONFLICT (email) {conflict}"
+            )
+        )
+        await self.session.commit()
+        return result.rowcount
+
+    @monitor_async(operation_name="DB: Bulk Update Users", log_args=False)
+    async def bulk_update(self, items: List[UserBulkUpdate], chunk_size: int = 1000) -> Tuple[List[User], BulkErrors]:
+        positions: Dict[int, int] = {}
+        errors = []
+        for index, item in enumerate(items):
+            if item.id in positions:
+                errors.append((index, f"Duplicate id {item.id} in request (see item {positions[item.id]})."))
+                continue
+            positions[item.id] = index
+
+        existing = set()
+        ids = list(positions)
+        for start in range(0, len(ids), chunk_size):
+            result = await self.session.execute(select(User.id).where(User.id.in_(ids[start : start + chunk_size])))
+            existing.update(result.scalars().all())
+        errors.extend(
+            (index, f"User {user_id} not found.") for user_id, index in positions.items() if user_id not in existing
+        )
+
+        # Catch unique-email violations per item up front; otherwise one bad row aborts the batch.
+        wanted = {}
+        for user_id in existing:
+            email = items[positions[user_id]].email
+            if email is None:
+                continue
+            if email in wanted:
+                errors.append((positions[user_id], f"Email {email} is requested by another item."))
+            else:
+                wanted[email] = user_id
+
+        emails = list(wanted)
+        for start in range(0, len(emails), chunk_size):
+            result = await self.session.execute(
+                select(User.id, User.email).where(User.email.in_(emails[start : start + chunk_size]))
+            )
+            for owner_id, email in result.all():
+                if owner_id != wanted[email]:
+                    errors.append((positions[wanted.pop(email)], f"User with email {email} already exists."))
+
+        rejected = {index for index, _ in errors}
+        params = []
+        for user_id in existing:
+            if positions[user_id] in rejected:
+                continue
+            values = items[positions[user_id]].model_dump(exclude_unset=True, exclude={"id"})
+            if values:
+                params.append({"id": user_id, **values})
+
+        try:
+            for start in range(0, len(params), chunk_size):
+                await self.session.execute(update(User), params[start : start + chunk_size])
+            await self.session.commit()
+        except IntegrityError as e:
+            await self.session.rollback()
+            raise UserAlreadyExistsError("Email conflict during bulk update.") from e
+
+        updated_ids = sorted(user_id for user_id in existing if positions[user_id] not in rejected)
+        users: List[User] = []
+        for start in range(0, len(updated_ids), chunk_size):
+            stmt = select(User).where(User.id.in_(updated_ids[start : start + chunk_size])).order_by(User.id)
+            result = await self.session.execute(stmt.execution_options(populate_existing=True))
+            users.extend(result.scalars().all())
+
+        return users, sorted(errors)
+
+    @monitor_async(operation_name="DB: Bulk Delete Users", log_args=False)
+    async def bulk_delete(self, user_ids: List[int], chunk_size: int = 1000) -> List[int]:
+        deleted = []
+        for start in range(0, len(user_ids), chunk_size):
+            stmt = delete(User).where(User.id.in_(user_ids[start : start + chunk_size])).returning(User.id)
+            result = await self.session.execute(stmt.execution_options(synchronize_session=False))
+            deleted.extend(result.scalars().all())
+        await self.session.commit()
+        return deleted
@@ -0,0 +1,9 @@
+from typing import Dict, Optional
+
+from pydantic import BaseModel, Field
+
+
+class CacheMultiSet(BaseModel):
+    values: Dict[str, str] = Field(min_length=1)
+    ex: Optional[int] = Field(default=None, gt=0)
+    ttl: Dict[str, int] = {}
@@ -21,3 +21,22 @@ class UserRead(UserBase):
 
     class Config:
         from_attributes = True
+
+
+class UserBulkUpdate(UserUpdate):
+    id: int
+
+
+class UserBulkDelete(BaseModel):
+    ids: list[int]
+
+
+class BulkItemError(BaseModel):
+    index: int
+    detail: str
+
+
+class UserBulkResult(BaseModel):
+    processed: int
+    items: list[UserRead] = []
+    errors: list[BulkItemError] = []
@@ -1,41 +1,36 @@
-import json
-
 import httpx
-import redis.asyncio as redis
 from fastapi import HTTPException
 
+from app.core.cache_policy import SWRCache
+from app.core.http_client import CircuitOpenError, outbound_http
+from app.core.redis_client import RedisService
+from app.core.single_flight import cat_flight
+
 CAT_API_URL = "https://api.thecatapi.com/v1/images/search"
-CACHE_TTL = 60
 
 
 class CatAPIService:
 
-    def __init__(self, redis_client: redis.Redis):
-        self.redis_client = redis_client
+    def __init__(self, redis_service: RedisService):
+        self.redis = redis_service
+        self.cache = SWRCache(redis_service, "cat", flight=cat_flight)
 
     async def get_cached_cat_image(self):
         cache_key = "cached_cat_data"
 
-        cached_data = await self.redis_client.get(cache_key)
-
-        if cached_data:
-            print(">>> Дані повернуто з Redis Cache!")
+        async def fetch_from_api():
+            print(">>> Запит до зовнішнього API...")
+            response = await outbound_http.request("thecatapi", "GET", CAT_API_URL)
+            return response.json()[0]
 
-            return {"source": "cache", "data": json.loads(cached_data)}
-
-        print(">>> Кешу немає, запит до зовнішнього API...")
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(CAT_API_URL)
-                response.raise_for_status()
-
-                api_data = response.json()[0]
-                data_to_cache = json.dumps(api_data)
-                await self.redis_client.set(cache_key, data_to_cache, ex=CACHE_TTL)
+            api_data, source = await self.cache.get_or_fetch(cache_key, fetch_from_api)
 
-                return {"source": "api", "data": api_data}
+            return {"source": source, "data": api_data}
 
         except httpx.HTTPStatusError as e:
             raise HTTPException(status_code=e.response.status_code, detail=f"External API Error: {e}")
+        except CircuitOpenError as e:
+            raise HTTPException(status_code=503, detail=str(e))
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"An unexpected error occurred: {e}")
@@ -1,75 +1,295 @@
-import json
-import os
-import tempfile
-from typing import Any, Dict
+import asyncio
+import functools
+import logging
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, List, Optional
 
+import httpx
+import numpy as np
+import orjson
 from fastapi import HTTPException, UploadFile, status
 
-from app.core.inference_client import CLIENT, MODEL_ID
+from app.core.cache_policy import EXPIRED, STALE, SWRCache
+from app.core.config import settings
+from app.core.http_client import CircuitOpenError, UpstreamBusyError, outbound_http
+from app.core.image_hashing import UploadTooLargeError, inference_cache_key, perceptual_hash, perceptual_hash_key
+from app.core.image_pipeline import (
+    BatchTooLargeError,
+    DecodedImage,
+    ImageDecodeError,
+    InvalidArchiveError,
+    decode_image,
+    extract_archive,
+    read_upload,
+    restore_original_scale,
+)
+from app.core.inference_backend import InferenceBackend
+from app.core.inference_client import get_backend
+from app.core.inference_executor import InferenceQueueFullError
+from app.core.job_queue import Job, JobQueue
 from app.core.logging.decorators import monitor_async
+from app.core.metrics import record_cache_lookup
+from app.core.prediction_summary import SummaryOptions, summarize
 from app.core.redis_client import RedisService
-from app.models.inference_dto import InferenceResultDTO
+from app.core.serialization import json_envelope
+from app.core.single_flight import inference_flight
 
-CACHE_TTL = 3600
-CACHE_KEY_PREFIX = f"inference:{MODEL_ID}"
+logger = logging.getLogger("app.inference")
+
+
+@dataclass
+class BatchItem:
+    index: int
+    filename: str
+    data: memoryview
+    content_hash: str
 
 
 class InferenceService:
-    def __init__(self, redis_service: RedisService):
+    def __init__(
+        self,
+        redis_service: RedisService,
+        params: Optional[Dict[str, Any]] = None,
+        backend: Optional[InferenceBackend] = None,
+    ):
         self.redis = redis_service
+        self.params = params or {}
+        self.backend = backend or get_backend()
+        self.cache = SWRCache(redis_service, "inference", flight=inference_flight)
 
     @monitor_async(operation_name="EXTERNAL_API: Roboflow Inference", log_args=False)
-    async def _execute_external_inference(self, image_path: str) -> Dict[str, Any]:
+    async def _execute_external_inference(self, image: np.ndarray) -> Dict[str, Any]:
 
-        return CLIENT.infer(image_path, model_id=MODEL_ID)
+        return await self.backend.infer(image, **self.params)
+
+    @property
+    def cache_params(self) -> Dict[str, Any]:
+        if settings.INFERENCE_MAX_IMAGE_SIDE:
+            return {**self.params, "max_side": settings.INFERENCE_MAX_IMAGE_SIDE}
+        return self.params
+
+    async def _infer(self, image: DecodedImage) -> Dict[str, Any]:
+        try:
+            raw_data = await self._execute_external_inference(image.array)
+
+        except (InferenceQueueFullError, UpstreamBusyError) as e:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e), headers={"Retry-After": "1"}
+            )
+        except CircuitOpenError as e:
+            retry_after = str(int(outbound_http.breaker("roboflow").retry_after))
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e), headers={"Retry-After": retry_after}
+            )
+        except (asyncio.TimeoutError, httpx.TimeoutException):
+            raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail="Inference provider timed out")
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=f"Inference provider failed: {str(e)}"
+            )
+
+        return restore_original_scale(raw_data, image)
+
+    async def _read_upload(self, file: UploadFile, max_bytes: Optional[int] = None) -> tuple[memoryview, str]:
+        try:
+            return await read_upload(file, max_bytes=max_bytes or settings.INFERENCE_MAX_UPLOAD_BYTES)
+        except UploadTooLargeError as e:
+            raise HTTPException(status_code=status.HTTP_413_CONTENT_TOO_LARGE, detail=str(e))
+
+    async def _decode(self, data: memoryview, content_hash: str) -> DecodedImage:
+        try:
+            return await asyncio.to_thread(decode_image, data, content_hash, settings.INFERENCE_MAX_IMAGE_SIDE)
+        except ImageDecodeError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    async def _phash_key(self, image: DecodedImage) -> str:
+        phash = await asyncio.to_thread(perceptual_hash, image.array)
+        return perceptual_hash_key(self.backend.model_id, phash, self.cache_params)
+
+    async def _get_near_duplicate(self, phash_key: str) -> Optional[Dict[str, Any]]:
+        original_key = await self.redis.get(phash_key)
+        if not original_key:
+            return None
+        entry = await self.cache.lookup(original_key)
+        return None if entry is None else entry.value
 
     @monitor_async(operation_name="SERVICE: Inference Pipeline", log_args=False)
     async def run_inference_with_cache(self, file: UploadFile) -> Dict[str, Any]:
 
-        cache_key = f"{CACHE_KEY_PREFIX}:{file.filename}"
+        data, content_hash = await self._read_upload(file)
+        return await self.infer_image(data, content_hash)
 
-        cached_data = await self.redis.get(cache_key)
-        if cached_data:
+    async def infer_image(self, data: memoryview, content_hash: str) -> Dict[str, Any]:
+        cache_key = inference_cache_key(self.backend.model_id, content_hash, self.cache_params)
+        entry = await self.cache.lookup(cache_key)
 
-            return {"source": "cache", "data": json.loads(cached_data)}
+        image: Optional[DecodedImage] = None
+        phash_key = None
+        if settings.INFERENCE_PHASH_ENABLED and (entry is None or entry.state(self.cache.policy) == EXPIRED):
+            image = await self._decode(data, content_hash)
+            phash_key = await self._phash_key(image)
+            similar_data = await self._get_near_duplicate(phash_key)
+            if similar_data is not None:
+                record_cache_lookup("inference", "similar_hit")
+                return {"source": "cache:similar", "content_hash": content_hash, "data": similar_data}
 
-        tmp_path = None
-        try:
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".png") as tmp:
-                content = await file.read()
-                tmp.write(content)
-                tmp_path = tmp.name
+        async def fetch() -> Dict[str, Any]:
+            raw_data = await self._infer(image or await self._decode(data, content_hash))
+            if phash_key:
+                await self.redis.set(key=phash_key, value=cache_key, ex=self.cache.policy.hard_ttl)
+            return raw_data
 
-            raw_data = await self._execute_external_inference(tmp_path)
+        raw_data, source = await self.cache.resolve(cache_key, entry, fetch)
+        return {"source": source, "content_hash": content_hash, "data": raw_data}
 
-            await self.redis.set(key=cache_key, value=json.dumps(raw_data), ex=CACHE_TTL)
+    @monitor_async(operation_name="SERVICE: Inference Pipeline (JSON)", log_args=False)
+    async def run_inference_json(self, file: UploadFile) -> tuple[bytes, str]:
+        data, content_hash = await self._read_upload(file)
+        json_key = f"{inference_cache_key(self.backend.model_id, content_hash, self.cache_params)}:json"
 
-            return {"source": "api", "data": raw_data}
+        # The encoded result is kept next to the SWR entry, so a hit is returned as stored bytes
+        # without decoding the envelope or re-encoding the predictions.
+        cached = await self.redis.get(json_key)
+        if cached is not None:
+            record_cache_lookup("inference_json", "hit")
+            encoded = cached if isinstance(cached, bytes) else cached.encode()
+            return json_envelope(encoded, source="cache", content_hash=content_hash), content_hash
+        record_cache_lookup("inference_json", "miss")
 
-        except Exception as e:
+        result = await self.infer_image(data, content_hash)
+        encoded = orjson.dumps(result["data"])
+        if not result["source"].startswith("cache:"):
+            await self.redis.set(json_key, encoded.decode(), ex=max(int(self.cache.policy.soft_ttl), 1))
+        return json_envelope(encoded, source=result["source"], content_hash=content_hash), content_hash
+
+    @monitor_async(operation_name="SERVICE: Submit Inference Job", log_args=False)
+    async def submit_job(self, file: UploadFile) -> Job:
+        data, content_hash = await self._read_upload(file)
+        jobs = JobQueue(self.redis)
+
+        # A result that is already cached completes the job without touching the queue.
+        cache_key = inference_cache_key(self.backend.model_id, content_hash, self.cache_params)
+        entry = await self.cache.lookup(cache_key)
+        if entry is not None and entry.state(self.cache.policy) != EXPIRED:
+            record_cache_lookup("inference", "hit")
+            return await jobs.create_completed(content_hash, entry.value, source="cache")
+
+        return await jobs.enqueue(content_hash, data)
+
+    @monitor_async(operation_name="SERVICE: Read Batch", log_args=False)
+    async def read_batch(self, files: List[UploadFile], archive: Optional[UploadFile] = None) -> List[BatchItem]:
+
+        max_items = settings.INFERENCE_BATCH_MAX_ITEMS
+        uploads = []
+        for file in files:
+            data, content_hash = await self._read_upload(file)
+            uploads.append((file.filename, data, content_hash))
+
+        if archive is not None:
+            archive_data, _ = await self._read_upload(
+                archive, max_bytes=max_items * settings.INFERENCE_MAX_UPLOAD_BYTES
+            )
+            try:
+                uploads.extend(
+                    await asyncio.to_thread(
+                        extract_archive, archive_data, max_items - len(uploads), settings.INFERENCE_MAX_UPLOAD_BYTES
+                    )
+                )
+            except UploadTooLargeError as e:
+                raise HTTPException(status_code=status.HTTP_413_CONTENT_TOO_LARGE, detail=str(e))
+            except (BatchTooLargeError, InvalidArchiveError) as e:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+        if not uploads:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No images submitted")
+        if len(uploads) > max_items:
             raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=f"Inference provider failed: {str(e)}"
+                status_code=status.HTTP_400_BAD_REQUEST, detail=f"Batch is limited to {max_items} images"
             )
 
-        finally:
+        return [BatchItem(index, *upload) for index, upload in enumerate(uploads)]
 
-            if tmp_path and os.path.exists(tmp_path):
-                os.unlink(tmp_path)
+    async def stream_batch(self, items: List[BatchItem]) -> AsyncIterator[Dict[str, Any]]:
 
-    @monitor_async(operation_name="SERVICE: Process Result", log_args=False)
-    async def run_processed_with_cache(self, file: UploadFile) -> Dict[str, Any]:
+        keys = [inference_cache_key(self.backend.model_id, item.content_hash, self.cache_params) for item in items]
+        entries = await self.cache.lookup_many(keys)
+
+        # Identical frames inside one batch share a single upstream call.
+        misses: Dict[str, List[BatchItem]] = defaultdict(list)
+        for item, key, entry in zip(items, keys, entries):
+            state = entry.state(self.cache.policy) if entry is not None else EXPIRED
+            record_cache_lookup("inference", {EXPIRED: "miss", STALE: "stale"}.get(state, "hit"))
+            if state == EXPIRED:
+                misses[key].append(item)
+                continue
+
+            if state == STALE:
+                self.cache.revalidate(key, functools.partial(self._infer_item, item))
+            yield self._batch_line(item, source="cache:stale" if state == STALE else "cache", data=entry.value)
+
+        if not misses:
+            return
+
+        semaphore = asyncio.Semaphore(settings.INFERENCE_BATCH_CONCURRENCY)
+
+        async def process(key: str, item: BatchItem):
+            async with semaphore:
+                try:
+                    return key, await self._infer_item(item), None
+                except HTTPException as e:
+                    return key, None, e
+
+        tasks = [asyncio.create_task(process(key, group[0])) for key, group in misses.items()]
+        results_to_cache: Dict[str, Any] = {}
         try:
-            raw_result = await self.run_inference_with_cache(file)
-            raw_data = raw_result["data"]
+            for next_done in asyncio.as_completed(tasks):
+                key, raw_data, error = await next_done
+                if raw_data is not None:
+                    results_to_cache[key] = raw_data
+
+                for item in misses[key]:
+                    if error is not None:
+                        yield self._batch_line(item, error=error.detail, status_code=error.status_code)
+                    else:
+                        yield self._batch_line(item, source="api", data=raw_data)
+
+        finally:
+            for task in tasks:
+                task.cancel()
+            await self.cache.store_many(results_to_cache)
+
+    async def _infer_item(self, item: BatchItem) -> Dict[str, Any]:
+        return await self._infer(await self._decode(item.data, item.content_hash))
 
-            result_dto = InferenceResultDTO(**raw_data)
+    @staticmethod
+    def _batch_line(item: BatchItem, **fields) -> Dict[str, Any]:
+        return {"index": item.index, "filename": item.filename, "content_hash": item.content_hash, **fields}
 
-            summary = result_dto.summary()
-            summary["source"] = raw_result["source"]
+    @monitor_async(operation_name="SERVICE: Process Result", log_args=False)
+    async def run_processed_with_cache(
+        self, file: UploadFile, options: SummaryOptions = SummaryOptions()
+    ) -> Dict[str, Any]:
+
+        data, content_hash = await self._read_upload(file)
+        summary_key = options.cache_key(inference_cache_key(self.backend.model_id, content_hash, self.cache_params))
 
-            return summary
+        # The finished summary is cached next to the raw result, so a hit skips parsing entirely.
+        cached = await self.redis.get_object(summary_key)
+        if cached is not None:
+            record_cache_lookup("inference_summary", "hit")
+            return {**cached, "source": "cache:summary"}
+        record_cache_lookup("inference_summary", "miss")
 
-        except KeyError:
+        raw_result = await self.infer_image(data, content_hash)
+        try:
+            summary = summarize(raw_result["data"], options)
+        except (KeyError, TypeError, ValueError):
             raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail="Invalid response format from ML model")
-        except Exception as e:
-            raise e
+
+        # A stale raw result is being refreshed; its summary must not outlive it.
+        if not raw_result["source"].startswith("cache:"):
+            await self.redis.set_object(summary_key, summary, ex=max(int(self.cache.policy.soft_ttl), 1))
+
+        summary["source"] = raw_result["source"]
+        return summary
@@ -0,0 +1,128 @@
+import logging
+from typing import Iterable, Optional
+
+from redis.exceptions import RedisError
+
+from app.core.image_hashing import params_fingerprint
+from app.core.metrics import record_cache_lookup
+from app.core.redis_client import RedisService
+from app.core.serialization import read_model
+from app.schemas.user import UserRead
+
+logger = logging.getLogger("app.user_cache")
+
+# The id is a hash tag so an entry and its version share a Redis Cluster slot, which the
+# version-guarded fill script needs.
+USER_KEY = "user:{{{}}}:data"
+VERSION_KEY = "user:{{{}}}:version"
+EMAIL_KEY = "user:email:{}"
+LIST_GENERATION_KEY = "user:list:generation"
+LIST_KEY = "user:list:{}:{}"
+RESPONSE_KEY = "user:{{{}}}:response:{}"
+LIST_RESPONSE_KEY = "user:list:response:{}:{}"
+
+
+class UserCache:
+    # Redis errors never fail a request: lookups degrade to misses and the database answers.
+
+    def __init__(self, redis_service: RedisService, ttl: int = 300, list_ttl: int = 0):
+        self.redis = redis_service
+        self.ttl = ttl
+        self.list_ttl = list_ttl
+
+    async def get(self, user_id: int) -> Optional[UserRead]:
+        try:
+            cached = await self.redis.get_object(USER_KEY.format(user_id))
+        except RedisError as e:
+            logger.warning(f"User cache read failed: {e}")
+            cached = None
+
+        record_cache_lookup("user", "miss" if cached is None else "hit")
+        return None if cached is None else read_model(UserRead, cached)
+
+    async def version(self, user_id: int) -> Optional[str]:
+        # Read before going to the database; `fill` only succeeds if no write happened since.
+        try:
+            return await self.redis.get_version(VERSION_KEY.format(user_id))
+        except RedisError as e:
+            logger.warning(f"User cache version read failed: {e}")
+            return None
+
+    async def fill(self, user: UserRead, version: Optional[str]) -> None:
+        if version is None:
+            return
+        try:
+            await self.redis.set_object_if_version(
+                USER_KEY.format(user.id), user.model_dump(), VERSION_KEY.format(user.id), version, ex=self.ttl
+            )
+            await self.redis.set(EMAIL_KEY.format(user.email), str(user.id), ex=self.ttl)
+        except RedisError as e:
+            logger.warning(f"User cache fill failed: {e}")
+
+    async def response_key(self, user_id: int) -> Optional[str]:
+        # Serialized responses hang off the version, so every write moves readers to a new key.
+        version = await self.version(user_id)
+        return None if version is None else RESPONSE_KEY.format(user_id, version)
+
+    async def list_response_key(self, params: dict) -> Optional[str]:
+        try:
+            generation = await self.redis.get_version(LIST_GENERATION_KEY)
+        except RedisError as e:
+            logger.warning(f"User list generation read failed: {e}")
+            return None
+        return LIST_RESPONSE_KEY.format(generation, params_fingerprint(params))
+
+    async def get_id_by_email(self, email: str) -> Optional[int]:
+        # The email key is only a pointer to the id entry; callers must check the email of the
+        # user it resolves to, since the pointer may outlive an email change.
+        try:
+            user_id = await self.redis.get(EMAIL_KEY.format(email))
+        except RedisError as e:
+            logger.warning(f"User cache read failed: {e}")
+            return None
+        return None if user_id is None else int(user_id)
+
+    async def store_new(self, user: UserRead) -> None:
+        # A freshly created id has no concurrent writers, so it can be written through directly.
+        try:
+            await self.redis.set_object(USER_KEY.format(user.id), user.model_dump(), ex=self.ttl)
+            await self.redis.set(EMAIL_KEY.format(user.email), str(user.id), ex=self.ttl)
+            await self.redis.delete_many([], bump=[LIST_GENERATION_KEY])
+        except RedisError as e:
+            logger.warning(f"User cache write-through failed: {e}")
+
+    async def invalidate(self, user_ids: Iterable[int]) -> None:
+        user_ids = list(user_ids)
+        try:
+            await self.redis.delete_many(
+                [USER_KEY.format(user_id) for user_id in user_ids],
+                bump=[VERSION_KEY.format(user_id) for user_id in user_ids] + [LIST_GENERATION_KEY],
+                bump_ttl=self.ttl * 2,
+            )
+        except RedisError as e:
+            logger.error(f"User cache invalidation failed, entries may stay stale for up to {self.ttl}s: {e}")
+
+    async def get_list(self, params: dict) -> tuple[Optional[dict], Optional[str]]:
+        # List entries are keyed by a generation counter that every write bumps, so a single
+        # INCR retires all cached pages at once.
+        if not self.list_ttl:
+            return None, None
+        try:
+            generation = await self.redis.get_version(LIST_GENERATION_KEY)
+            cached = await self.redis.get_object(LIST_KEY.format(generation, params_fingerprint(params)))
+        except RedisError as e:
+            logger.warning(f"User list cache read failed: {e}")
+            return None, None
+
+        record_cache_lookup("user_list", "miss" if cached is None else "hit")
+        return cached, generation
+
+    async def set_list(self, params: dict, generation: Optional[str], value: dict) -> None:
+        if not self.list_ttl or generation is None:
+            return
+        try:
+            await self.redis.set_object(
+                LIST_KEY.format(generation, params_fingerprint(params)), value, ex=self.list_ttl
+            )
+        except RedisError as e:
+            logger.warning(f"User list cache write failed: {e}")
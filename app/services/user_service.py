@@ -1,47 +1,245 @@
+import csv
+import io
+from typing import AsyncIterator, Optional
+
 from fastapi import HTTPException, status
 
+from app.core.config import settings
 from app.core.logging.decorators import monitor_async
+from app.core.pagination import InvalidCursorError, decode_cursor, encode_cursor
+from app.core.serialization import read_model
 from app.repositories.user_repo import UserAlreadyExistsError, UserRepository
-from app.schemas.user import UserCreate, UserRead, UserUpdate
+from app.schemas.user import (
+    BulkItemError,
+    UserBulkResult,
+    UserBulkUpdate,
+    UserCreate,
+    UserRead,
+    UserUpdate,
+)
+from app.services.user_cache import UserCache
+
+EXPORT_BATCH_SIZE = 1000
 
 
 class UserService:
-    def __init__(self, repository: UserRepository):
+    def __init__(self, repository: UserRepository, cache: Optional[UserCache] = None):
         self.repository = repository
+        self.cache = cache
 
     @monitor_async(operation_name="SERVICE: Create User")
     async def create_user(self, user_data: UserCreate) -> UserRead:
         try:
             new_user = await self.repository.create(user_data)
-            return UserRead.model_validate(new_user)
         except UserAlreadyExistsError as e:
             raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
 
+        user = read_model(UserRead, new_user)
+        if self.cache is not None:
+            await self.cache.store_new(user)
+        return user
+
     @monitor_async(operation_name="SERVICE: Get All Users")
-    async def get_all_users(self, skip: int = 0, limit: int = 100) -> list[UserRead]:
-        users = await self.repository.get_all(skip, limit)
-        return [UserRead.model_validate(u) for u in users]
+    async def get_all_users(
+        self, skip: int = 0, limit: int = 100, is_active: Optional[bool] = None, email_prefix: Optional[str] = None
+    ) -> list[UserRead]:
+        params = {"skip": skip, "limit": limit, "is_active": is_active, "email_prefix": email_prefix}
+        cached, generation = await self._cached_list(params)
+        if cached is not None:
+            return [read_model(UserRead, u) for u in cached["users"]]
+
+        users = [read_model(UserRead, u) for u in await self.repository.get_all(skip, limit, is_active, email_prefix)]
+        await self._store_list(params, generation, users)
+        return users
+
+    @monitor_async(operation_name="SERVICE: Get Users Page")
+    async def get_users_page(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        is_active: Optional[bool] = None,
+        email_prefix: Optional[str] = None,
+    ) -> tuple[list[UserRead], Optional[str]]:
+        try:
+            after_id = decode_cursor(cursor) if cursor else None
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+        params = {"after_id": after_id, "limit": limit, "is_active": is_active, "email_prefix": email_prefix}
+        cached, generation = await self._cached_list(params)
+        if cached is not None:
+            return [read_model(UserRead, u) for u in cached["users"]], cached["next_cursor"]
+
+        # One extra row tells whether another page exists without a COUNT query.
+        users = await self.repository.get_page(after_id, limit + 1, is_active, email_prefix)
+        next_cursor = encode_cursor(users[limit - 1].id) if len(users) > limit else None
+        page = [read_model(UserRead, u) for u in users[:limit]]
+        await self._store_list(params, generation, page, next_cursor)
+        return page, next_cursor
+
+    async def _cached_list(self, params: dict) -> tuple[Optional[dict], Optional[str]]:
+        if self.cache is None:
+            return None, None
+        return await self.cache.get_list(params)
+
+    async def _store_list(
+        self, params: dict, generation: Optional[str], users: list[UserRead], next_cursor: Optional[str] = None
+    ) -> None:
+        if self.cache is not None:
+            await self.cache.set_list(
+                params, generation, {"users": [u.model_dump() for u in users], "next_cursor": next_cursor}
+            )
+
+    async def export_users(
+        self, export_format: str = "ndjson", is_active: Optional[bool] = None, email_prefix: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if export_format == "csv":
+            writer.writerow(UserRead.model_fields.keys())
+
+        rows = 0
+        async for user in self.repository.stream_all(is_active, email_prefix, batch_size=EXPORT_BATCH_SIZE):
+            user_read = read_model(UserRead, user)
+            if export_format == "csv":
+                writer.writerow(user_read.model_dump().values())
+            else:
+                buffer.write(user_read.model_dump_json() + "\n")
+
+            rows += 1
+            if rows % EXPORT_BATCH_SIZE == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+
+        if buffer.tell():
+            yield buffer.getvalue()
 
     @monitor_async(operation_name="SERVICE: Get User By ID")
     async def get_user_by_id(self, user_id: int) -> UserRead:
-        user = await self.repository.get_by_id(user_id)
+        user = await self._find_by_id(user_id)
         if user is None:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-        return UserRead.model_validate(user)
+        return user
+
+    @monitor_async(operation_name="SERVICE: Get User By Email")
+    async def get_user_by_email(self, email: str) -> UserRead:
+        if self.cache is not None:
+            user_id = await self.cache.get_id_by_email(email)
+            if user_id is not None:
+                user = await self._find_by_id(user_id)
+                if user is not None and user.email == email:
+                    return user
+
+        if self.cache is None:
+            db_user = await self.repository.get_by_email(email)
+            if db_user is None:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+            return read_model(UserRead, db_user)
+
+        # Resolve the id first so _find_by_id can read the version before the row: a write that
+        # commits between the two then fails the fill instead of caching a stale row.
+        user_id = await self.repository.get_id_by_email(email)
+        user = None if user_id is None else await self._find_by_id(user_id)
+        if user is None or user.email != email:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+        return user
+
+    async def _find_by_id(self, user_id: int) -> Optional[UserRead]:
+        if self.cache is None:
+            db_user = await self.repository.get_by_id(user_id)
+            return None if db_user is None else read_model(UserRead, db_user)
+
+        user = await self.cache.get(user_id)
+        if user is not None:
+            return user
+
+        version = await self.cache.version(user_id)
+        db_user = await self.repository.get_by_id(user_id, primary=True)
+        if db_user is None:
+            return None
+
+        user = read_model(UserRead, db_user)
+        await self.cache.fill(user, version)
+        return user
+
+    async def _invalidate(self, user_ids) -> None:
+        if self.cache is not None:
+            await self.cache.invalidate(user_ids)
 
     @monitor_async(operation_name="SERVICE: Update User")
     async def update_user(self, user_id: int, user_data: UserUpdate) -> UserRead:
         try:
             updated_user = await self.repository.update(user_id, user_data)
-            if updated_user is None:
-                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-            return UserRead.model_validate(updated_user)
         except UserAlreadyExistsError as e:
             raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
 
+        if updated_user is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+        await self._invalidate([user_id])
+        return read_model(UserRead, updated_user)
+
     @monitor_async(operation_name="SERVICE: Delete User")
     async def delete_user(self, user_id: int) -> bool:
         deleted = await self.repository.delete(user_id)
         if not deleted:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+        await self._invalidate([user_id])
         return deleted
+
+    @staticmethod
+    def _check_bulk_size(count: int) -> None:
+        if count > settings.USERS_BULK_MAX_ITEMS:
+            raise HTTPException(
+                status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+                detail=f"Bulk requests are limited to {settings.USERS_BULK_MAX_ITEMS} items",
+            )
+
+    @staticmethod
+    def _bulk_result(processed: int, users: list, errors: list) -> UserBulkResult:
+        return UserBulkResult(
+            processed=processed,
+            items=[read_model(UserRead, u) for u in users],
+            errors=[BulkItemError(index=index, detail=detail) for index, detail in errors],
+        )
+
+    @monitor_async(operation_name="SERVICE: Bulk Upsert Users")
+    async def bulk_upsert_users(
+        self, users: list[UserCreate], on_conflict: str = "update", use_copy: bool = False
+    ) -> UserBulkResult:
+        self._check_bulk_size(len(users))
+
+        if use_copy:
+            if self.repository.dialect != "postgresql":
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST, detail="COPY import is only available on PostgreSQL"
+                )
+            processed = await self.repository.copy_upsert(users, on_conflict)
+            if self.cache is not None:
+                emails = list({user.email for user in users})
+                await self._invalidate(await self.repository.ids_for_emails(emails, settings.USERS_BULK_CHUNK_SIZE))
+            return UserBulkResult(processed=processed)
+
+        saved, errors = await self.repository.bulk_upsert(users, on_conflict, settings.USERS_BULK_CHUNK_SIZE)
+        await self._invalidate([user.id for user in saved])
+        return self._bulk_result(len(saved), saved, errors)
+
+    @monitor_async(operation_name="SERVICE: Bulk Update Users")
+    async def bulk_update_users(self, items: list[UserBulkUpdate]) -> UserBulkResult:
+        self._check_bulk_size(len(items))
+        try:
+            updated, errors = await self.repository.bulk_update(items, settings.USERS_BULK_CHUNK_SIZE)
+        except UserAlreadyExistsError as e:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+        await self._invalidate([user.id for user in updated])
+        return self._bulk_result(len(updated), updated, errors)
+
+    @monitor_async(operation_name="SERVICE: Bulk Delete Users")
+    async def bulk_delete_users(self, user_ids: list[int]) -> UserBulkResult:
+        self._check_bulk_size(len(user_ids))
+        deleted = set(await self.repository.bulk_delete(user_ids, settings.USERS_BULK_CHUNK_SIZE))
+        await self._invalidate(deleted)
+        errors = [
+            (index, f"User {user_id} not found.") for index, user_id in enumerate(user_ids) if user_id not in deleted
+        ]
+        return self._bulk_result(len(deleted), [], errors)
@@ -0,0 +1,98 @@
+import pytest
+from fakeredis import aioredis
+from redis.exceptions import ConnectionError
+
+from app.core.admission import AdmissionController, AdmissionRejected, RateLimiter, admission_controller
+
+
+def make_controller(limits=None, **overrides) -> AdmissionController:
+    options = {
+        "route_classes": {"/infer": "inference", "/infer/executor": "system", "/users": "crud"},
+        "rate_limiter": RateLimiter(lambda: None, limits or {}),
+        "concurrency": {"inference": 1},
+        "shed_p95_ms": {"inference": 100.0},
+        "shed_queue_depth": 5,
+        "shed_retry_after": 7,
+        "latency_window": 30.0,
+        "queue_depth": lambda: 0,
+        **overrides,
+    }
+    return AdmissionController(**options)
+
+
+@pytest.mark.asyncio
+async def test_redis_token_bucket_is_shared_and_denials_are_cached_locally():
+    client = aioredis.FakeRedis(decode_responses=True)
+    limits = {"crud": {"rate": 0.5, "burst": 2}}
+    first, second = RateLimiter(lambda: client, limits), RateLimiter(lambda: client, limits)
+
+    assert await first.check("crud", "10.0.0.1") == 0
+    assert await second.check("crud", "10.0.0.1") == 0
+    retry_after = await first.check("crud", "10.0.0.1")
+    assert 0 < retry_after <= 2
+    assert await first.check("crud", "10.0.0.2") == 0
+
+    # The denial is remembered in-process, so Redis is not consulted again until it expires.
+    await client.flushall()
+    assert await first.check("crud", "10.0.0.1") > 0
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_falls_back_to_local_bucket_when_redis_fails():
+    class BrokenRedis:
+        def register_script(self, script):
+            async def call(**kwargs):
+                raise ConnectionError("down")
+
+            return call
+
+    limiter = RateLimiter(lambda: BrokenRedis(), {"crud": {"rate": 1, "burst": 1}})
+
+    assert await limiter.check("crud", "client") == 0
+    assert await limiter.check("crud", "client") > 0
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limit_and_queue_depth_shed_only_inference():
+    depth = {"value": 0}
+    controller = make_controller(queue_depth=lambda: depth["value"])
+    assert controller.classify("/infer/raw") == "inference"
+    assert controller.classify("/infer/executor") == "system"
+    assert controller.classify("/health") is None
+
+    await controller.admit("inference", "a")
+    with pytest.raises(AdmissionRejected) as rejected:
+        await controller.admit("inference", "b")
+    assert (rejected.value.status_code, rejected.value.reason) == (503, "concurrency")
+
+    controller.release("inference", 0.01)
+    depth["value"] = 5
+    with pytest.raises(AdmissionRejected) as rejected:
+        await controller.admit("inference", "b")
+    assert (rejected.value.reason, rejected.value.retry_after) == ("queue_depth", 7)
+    await controller.admit("crud", "b")
+
+
+@pytest.mark.asyncio
+async def test_latency_shedding_recovers_after_window():
+    controller = make_controller(concurrency={})
+    for _ in range(20):
+        controller.latency["inference"].record(0.5, now=0.0)
+
+    assert controller.latency["inference"].p95_ms(now=1.0) == 500
+    assert controller.latency["inference"].p95_ms(now=31.5) == 0
+
+
+@pytest.mark.asyncio
+async def test_middleware_returns_429_with_retry_after(async_client, monkeypatch):
+    limiter = admission_controller.rate_limiter
+    monkeypatch.setitem(limiter.limits, "cache", {"rate": 0.01, "burst": 1})
+    monkeypatch.setattr(limiter, "_denied_until", type(limiter._denied_until)())
+    monkeypatch.setattr(limiter, "_local", type(limiter._local)())
+
+    assert (await async_client.get("/cache/local/stats")).status_code == 200
+    response = await async_client.get("/cache/local/stats")
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+    assert response.json()["reason"] == "rate_limit"
+    assert (await async_client.get("/health")).status_code == 200
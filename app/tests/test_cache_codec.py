@@ -0,0 +1,47 @@
+import json
+
+import pytest
+from fakeredis import aioredis
+
+from app.core.cache_codec import MAGIC, CacheCodec
+from app.core.redis_client import RedisService
+
+PAYLOAD = {"predictions": [{"x": 1.5, "class": "person", "confidence": 0.9}] * 50, "time": 0.1}
+
+
+@pytest.mark.parametrize("serializer", ["json", "orjson", "msgpack"])
+@pytest.mark.parametrize("compression", ["none", "zlib"])
+def test_binary_codecs_round_trip(serializer, compression):
+    codec = CacheCodec(serializer, compression, compress_threshold=0, binary=True)
+    encoded = codec.encode(PAYLOAD)
+
+    assert encoded.startswith(MAGIC)
+    assert codec.decode(encoded) == PAYLOAD
+
+
+def test_small_values_skip_compression_and_legacy_json_still_reads():
+    codec = CacheCodec("msgpack", "zlib", compress_threshold=10_000, binary=True)
+
+    assert codec.encode(PAYLOAD)[2] == 0
+    assert codec.decode(json.dumps(PAYLOAD)) == PAYLOAD
+    assert codec.decode(json.dumps(PAYLOAD).encode()) == PAYLOAD
+
+
+def test_values_written_with_another_codec_are_readable():
+    writer = CacheCodec("msgpack", "zlib", compress_threshold=0, binary=True)
+    reader = CacheCodec("orjson", "none", binary=True)
+
+    assert reader.decode(writer.encode(PAYLOAD)) == PAYLOAD
+
+
+@pytest.mark.asyncio
+async def test_redis_service_stores_objects_in_binary_mode():
+    codec = CacheCodec("msgpack", "zlib", compress_threshold=0, binary=True)
+    service = RedisService(aioredis.FakeRedis(decode_responses=False), codec=codec)
+
+    await service.client.set("legacy", json.dumps(PAYLOAD))
+    await service.set_object("fresh", PAYLOAD)
+
+    assert await service.get_object("legacy") == PAYLOAD
+    assert await service.mget_objects(["fresh", "missing"]) == [PAYLOAD, None]
+    assert len(await service.client.get("fresh")) < len(json.dumps(PAYLOAD))
@@ -0,0 +1,79 @@
+import asyncio
+import time
+
+import pytest
+from fakeredis import aioredis
+
+from app.core.cache_policy import EXPIRED, FRESH, STALE, CacheEntry, CachePolicy, SWRCache, cache_policy, wrap
+from app.core.config import settings
+from app.core.redis_client import RedisService
+
+POLICY = CachePolicy(soft_ttl=10, stale_while_revalidate=10, hard_ttl=100, beta=0)
+
+
+@pytest.fixture
+def swr():
+    return SWRCache(RedisService(aioredis.FakeRedis(decode_responses=True)), "test", policy=POLICY)
+
+
+async def put(swr: SWRCache, key: str, value, age: float) -> None:
+    envelope = wrap(value, compute_time=0.5)
+    envelope["t"] -= age
+    await swr.redis.set_object(key, envelope, ex=POLICY.hard_ttl)
+
+
+def test_entry_state_follows_soft_and_stale_windows():
+    now = time.time()
+
+    assert CacheEntry("v", now - 5).state(POLICY, now) == FRESH
+    assert CacheEntry("v", now - 15).state(POLICY, now) == STALE
+    assert CacheEntry("v", now - 25).state(POLICY, now) == EXPIRED
+    assert CacheEntry("legacy").state(POLICY, now) == FRESH
+
+    # With a long recompute time XFetch almost always refreshes an entry close to expiry.
+    eager = CachePolicy(soft_ttl=10, stale_while_revalidate=10, beta=1.0)
+    states = {CacheEntry("v", now - 9.9, compute_time=100).state(eager, now) for _ in range(20)}
+    assert STALE in states
+
+
+def test_policies_are_configurable_per_family(monkeypatch):
+    monkeypatch.setattr(settings, "CACHE_POLICIES", {"cat": {"soft_ttl": 5}})
+
+    assert cache_policy("cat").soft_ttl == 5
+    assert cache_policy("cat").hard_ttl == 3600
+    assert cache_policy("inference").soft_ttl == 3600
+
+
+@pytest.mark.asyncio
+async def test_stale_value_is_served_while_one_background_refresh_runs(swr):
+    await put(swr, "k", "old", age=15)
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "new"
+
+    assert await swr.get_or_fetch("k", fetch) == ("old", "cache:stale")
+    assert await swr.get_or_fetch("k", fetch) == ("old", "cache:stale")
+    await asyncio.gather(*SWRCache._tasks)
+
+    assert len(calls) == 1
+    assert await swr.get_or_fetch("k", fetch) == ("new", "cache")
+
+
+@pytest.mark.asyncio
+async def test_expired_value_is_refetched_and_served_if_upstream_fails(swr):
+    await put(swr, "k", "old", age=50)
+
+    async def failing():
+        raise RuntimeError("upstream down")
+
+    assert await swr.get_or_fetch("k", failing) == ("old", "cache:stale-error")
+
+    async def fetch():
+        return "new"
+
+    assert await swr.get_or_fetch("k", fetch) == ("new", "api")
+    with pytest.raises(RuntimeError):
+        await swr.get_or_fetch("missing", failing)
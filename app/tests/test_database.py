@@ -0,0 +1,41 @@
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+from app.core.database import engine_options, pool_stats
+from app.models.user import Base, User
+from app.repositories.user_repo import UserRepository
+
+
+def test_engine_options_apply_pool_settings_only_to_server_databases(monkeypatch):
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 7)
+    monkeypatch.setattr(settings, "DB_STATEMENT_CACHE_SIZE", 0)
+
+    options = engine_options("postgresql+asyncpg://user:pass@db/app")
+
+    assert options["pool_size"] == 7
+    assert options["connect_args"] == {"prepared_statement_cache_size": 0, "statement_cache_size": 0}
+    assert "pool_size" not in engine_options("sqlite+aiosqlite:///:memory:")
+    assert "connect_args" not in engine_options("postgresql+psycopg2://user:pass@db/app")
+    assert "primary" in pool_stats()
+
+
+@pytest.mark.asyncio
+async def test_repository_reads_from_replica_and_writes_to_primary(db_session):
+    replica_engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with replica_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with async_sessionmaker(replica_engine, class_=AsyncSession)() as replica:
+        replica.add(User(id=1, email="replica@test.com", is_active=True))
+        await replica.commit()
+
+        repo = UserRepository(db_session, replica)
+        db_session.add(User(id=1, email="primary@test.com", is_active=True))
+        await db_session.commit()
+
+        assert [u.email for u in await repo.get_page()] == ["replica@test.com"]
+        assert (await repo.get_by_id(1)).email == "replica@test.com"
+        assert (await repo.get_by_id(1, primary=True)).email == "primary@test.com"
+
+    await replica_engine.dispose()
@@ -0,0 +1,106 @@
+from unittest.mock import patch
+
+import pytest
+from fakeredis import aioredis
+from sqlalchemy import event
+
+from app.api.endpoints.users import get_user_cache
+from app.core import database
+from app.core.database import get_db_session
+from app.core.http_cache import etag_matches
+from app.core.redis_client import RedisService, get_redis_service
+from app.main import app
+from app.repositories.user_repo import UserRepository
+from app.schemas.user import UserCreate, UserUpdate
+from app.services.user_cache import UserCache
+from app.services.user_service import UserService
+
+
+def test_etag_matching_follows_if_none_match_rules():
+    assert etag_matches('"a", W/"b"', '"b"')
+    assert etag_matches("*", '"x"')
+    assert not etag_matches('"a"', '"b"')
+    assert not etag_matches(None, '"b"')
+
+
+@pytest.fixture
+def redis_service():
+    return RedisService(aioredis.FakeRedis(decode_responses=True))
+
+
+@pytest.fixture
+def overrides(db_session, redis_service):
+    cache = UserCache(redis_service, ttl=60)
+    app.dependency_overrides[get_db_session] = lambda: db_session
+    app.dependency_overrides[get_user_cache] = lambda: cache
+    app.dependency_overrides[get_redis_service] = lambda: redis_service
+    yield UserService(UserRepository(db_session), cache)
+    app.dependency_overrides.clear()
+
+
+@pytest.mark.asyncio
+async def test_user_revalidation_skips_database_until_a_write(async_client, overrides):
+    user = await overrides.create_user(UserCreate(email="a@test.com", full_name="A"))
+
+    first = await async_client.get(f"/users/{user.id}")
+    assert first.status_code == 200
+    assert first.json()["full_name"] == "A"
+    etag = first.headers["ETag"]
+    assert first.headers["Cache-Control"] == "private, no-cache"
+
+    with patch.object(UserRepository, "get_by_id", side_effect=AssertionError("database hit")):
+        with patch.object(UserCache, "get", side_effect=AssertionError("entity cache hit")):
+            revalidated = await async_client.get(f"/users/{user.id}", headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.headers["ETag"] == etag
+
+    await overrides.update_user(user.id, UserUpdate(email="a@test.com", full_name="B"))
+    changed = await async_client.get(f"/users/{user.id}", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.json()["full_name"] == "B"
+    assert changed.headers["ETag"] != etag
+
+
+@pytest.mark.asyncio
+async def test_user_list_and_cache_value_answer_304(async_client, overrides, redis_service):
+    await overrides.create_user(UserCreate(email="a@test.com"))
+    await overrides.create_user(UserCreate(email="b@test.com"))
+
+    page = await async_client.get("/users/", params={"limit": 1})
+    assert [u["email"] for u in page.json()] == ["a@test.com"]
+    repeat = await async_client.get("/users/", params={"limit": 1}, headers={"If-None-Match": page.headers["ETag"]})
+    assert repeat.status_code == 304
+    assert repeat.headers["X-Next-Cursor"] == page.headers["X-Next-Cursor"]
+
+    await redis_service.set("greeting", "hello")
+    value = await async_client.get("/cache/get/greeting")
+    assert value.json() == {"key": "greeting", "value": "hello"}
+    again = await async_client.get("/cache/get/greeting", headers={"If-None-Match": value.headers["ETag"]})
+    assert again.status_code == 304
+
+
+@pytest.mark.asyncio
+async def test_cache_hits_and_304s_never_check_out_a_connection(async_client, db_session, redis_service):
+    # The real session dependency: only the cache is wired to test doubles.
+    cache = UserCache(redis_service, ttl=60)
+    app.dependency_overrides[get_user_cache] = lambda: cache
+    app.dependency_overrides[get_redis_service] = lambda: redis_service
+    user = await UserService(UserRepository(db_session), cache).create_user(UserCreate(email="a@test.com"))
+
+    checkouts = []
+    pool = database.engine.sync_engine.pool
+
+    def count(*args):
+        checkouts.append(args)
+
+    event.listen(pool, "checkout", count)
+    try:
+        first = await async_client.get(f"/users/{user.id}")
+        revalidated = await async_client.get(f"/users/{user.id}", headers={"If-None-Match": first.headers["ETag"]})
+    finally:
+        event.remove(pool, "checkout", count)
+        app.dependency_overrides.clear()
+
+    assert first.status_code == 200
+    assert revalidated.status_code == 304
+    assert checkouts == []
@@ -0,0 +1,56 @@
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.core.http_client import CircuitOpenError, OutboundHTTPClient
+
+
+@pytest.fixture
+def outbound(monkeypatch):
+    monkeypatch.setattr(settings, "HTTP_RETRIES", 3)
+    monkeypatch.setattr(settings, "HTTP_CIRCUIT_FAILURE_THRESHOLD", 2)
+    monkeypatch.setattr(settings, "HTTP_CIRCUIT_RESET_TIMEOUT", 60.0)
+    monkeypatch.setattr("app.core.http_client.backoff.full_jitter", lambda value: 0)
+    return OutboundHTTPClient()
+
+
+def mock_transport(outbound, statuses):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(statuses[min(len(calls), len(statuses)) - 1], json={"ok": True})
+
+    outbound.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_retries_transient_statuses_then_succeeds(outbound):
+    calls = mock_transport(outbound, [503, 502, 200])
+
+    response = await outbound.request("upstream", "GET", "http://upstream/resource")
+
+    assert response.json() == {"ok": True}
+    assert len(calls) == 3
+    assert outbound.breaker("upstream").state == "closed"
+
+
+@pytest.mark.asyncio
+async def test_circuit_opens_and_fails_fast_until_probe_succeeds(outbound):
+    calls = mock_transport(outbound, [503])
+
+    for _ in range(2):
+        with pytest.raises(httpx.HTTPStatusError):
+            await outbound.request("upstream", "GET", "http://upstream/resource")
+    assert len(calls) == 6
+
+    with pytest.raises(CircuitOpenError):
+        await outbound.request("upstream", "GET", "http://upstream/resource")
+    assert len(calls) == 6
+
+    breaker = outbound.breaker("upstream")
+    breaker.opened_at -= breaker.reset_timeout
+    calls = mock_transport(outbound, [200])
+    await outbound.request("upstream", "GET", "http://upstream/resource")
+    assert breaker.snapshot() == {"state": "closed", "failures": 0, "rejected": 1}
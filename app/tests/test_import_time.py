@@ -0,0 +1,40 @@
+import os
+import subprocess
+import sys
+
+# Cumulative import time of app.main under -X importtime, in microseconds. It was ~1.1s on a
+# developer machine once the heavy subsystems became lazy (~1.5s before); the budget leaves
+# room for slower CI runners while still catching an eager numpy/OpenCV/Sentry import.
+IMPORT_BUDGET_US = 2_500_000
+LAZY_MODULES = ("numpy", "cv2", "PIL", "sentry_sdk", "app.services.inference_service", "app.core.local_inference")
+
+
+def import_profile(module: str) -> dict:
+    env = {
+        **os.environ,
+        "DATABASE_URL": "sqlite+aiosqlite:///:memory:",
+        "REDIS_URL": "redis://localhost:6379/0",
+        "ROBOFLOW_API_KEY": "test",
+        "ROBOFLOW_MODEL_ID": "test/1",
+    }
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+
+    profile = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line and "cumulative" not in line:
+            _, cumulative, name = line.split("|")
+            profile[name.strip()] = int(cumulative)
+    return profile
+
+
+def test_app_import_stays_lazy_and_within_budget():
+    profile = import_profile("app.main")
+
+    assert [module for module in LAZY_MODULES if module in profile] == []
+    assert profile["app.main"] < IMPORT_BUDGET_US
@@ -0,0 +1,64 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.core.inference_executor import InferenceExecutor, InferenceQueueFullError
+
+
+@pytest.mark.asyncio
+async def test_executor_keeps_event_loop_responsive():
+    executor = InferenceExecutor(max_workers=1, max_queue=1, timeout=5)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    task = asyncio.create_task(ticker())
+    result = await executor.run(lambda: time.sleep(0.2) or "done")
+    task.cancel()
+    executor.shutdown()
+
+    assert result == "done"
+    assert ticks > 5
+    assert executor.stats.completed == 1
+
+
+@pytest.mark.asyncio
+async def test_executor_rejects_when_queue_is_full():
+    executor = InferenceExecutor(max_workers=1, max_queue=1, timeout=5)
+    gate = threading.Event()
+
+    running = asyncio.create_task(executor.run(gate.wait))
+    await asyncio.sleep(0.05)
+    queued = asyncio.create_task(executor.run(lambda: "queued"))
+    await asyncio.sleep(0.05)
+
+    with pytest.raises(InferenceQueueFullError):
+        await executor.run(lambda: "rejected")
+
+    gate.set()
+    assert await queued == "queued"
+    await running
+    executor.shutdown()
+
+    assert executor.stats.rejected == 1
+
+
+@pytest.mark.asyncio
+async def test_executor_timeout_holds_slot_until_thread_finishes():
+    executor = InferenceExecutor(max_workers=1, max_queue=0, timeout=0.05)
+    gate = threading.Event()
+
+    with pytest.raises(asyncio.TimeoutError):
+        await executor.run(gate.wait)
+
+    assert executor.in_flight == 1
+    gate.set()
+    await asyncio.sleep(0.05)
+    assert executor.in_flight == 0
+    executor.shutdown()
@@ -0,0 +1,121 @@
+import io
+import zipfile
+from unittest.mock import patch
+
+import pytest
+from fakeredis import aioredis
+from fastapi import HTTPException, UploadFile
+from PIL import Image
+
+from app.core.image_hashing import perceptual_hash
+from app.core.image_pipeline import decode_image
+from app.core.inference_client import get_backend
+from app.core.redis_client import RedisService
+from app.services.inference_service import InferenceService
+
+RAW_RESULT = {
+    "inference_id": "abc",
+    "time": 0.1,
+    "image": {"width": 32, "height": 32},
+    "predictions": [],
+}
+
+
+def make_upload(content: bytes, filename: str) -> UploadFile:
+    return UploadFile(file=io.BytesIO(content), filename=filename)
+
+
+def make_png(color: int, fmt: str = "PNG", size: int = 32) -> bytes:
+    img = Image.new("L", (size, size), color)
+    for x in range(16):
+        img.putpixel((x, x), 255 - color)
+    buffer = io.BytesIO()
+    img.save(buffer, format=fmt)
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def inference_service():
+    redis_service = RedisService(aioredis.FakeRedis(decode_responses=True))
+    return InferenceService(redis_service=redis_service)
+
+
+@pytest.mark.asyncio
+async def test_cache_is_keyed_by_content_not_filename(inference_service):
+    with patch.object(get_backend(), "infer", return_value=RAW_RESULT) as mock_infer:
+        first = await inference_service.run_inference_with_cache(make_upload(make_png(10), "image.png"))
+        renamed = await inference_service.run_inference_with_cache(make_upload(make_png(10), "other.png"))
+        collision = await inference_service.run_inference_with_cache(make_upload(make_png(90), "image.png"))
+
+    assert first["source"] == "api"
+    assert renamed["source"] == "cache"
+    assert renamed["content_hash"] == first["content_hash"]
+    assert collision["source"] == "api"
+    assert mock_infer.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_near_duplicate_frame_hits_cache_when_phash_enabled(inference_service):
+    png, bmp = make_png(40), make_png(40, fmt="BMP")
+    assert perceptual_hash(decode_image(memoryview(png), "a").array) == perceptual_hash(
+        decode_image(memoryview(bmp), "b").array
+    )
+
+    with (
+        patch("app.services.inference_service.settings.INFERENCE_PHASH_ENABLED", True),
+        patch.object(get_backend(), "infer", return_value=RAW_RESULT) as mock_infer,
+    ):
+        await inference_service.run_inference_with_cache(make_upload(png, "a.png"))
+        reencoded = await inference_service.run_inference_with_cache(make_upload(bmp, "a.bmp"))
+
+    assert reencoded["source"] == "cache:similar"
+    assert mock_infer.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_upload_is_decoded_in_memory_and_downscaled(inference_service):
+    raw = {**RAW_RESULT, "image": {"width": 50, "height": 50}, "predictions": [{"x": 10.0, "y": 20.0}]}
+
+    with (
+        patch("app.services.inference_service.settings.INFERENCE_MAX_IMAGE_SIDE", 50),
+        patch.object(get_backend(), "infer", return_value=raw) as mock_infer,
+    ):
+        result = await inference_service.run_inference_with_cache(make_upload(make_png(10, size=200), "big.png"))
+
+    sent = mock_infer.call_args.args[0]
+    assert sent.shape[:2] == (50, 50)
+    assert result["data"]["image"] == {"width": 200, "height": 200}
+    assert result["data"]["predictions"][0] == {"x": 40.0, "y": 80.0}
+
+
+@pytest.mark.asyncio
+async def test_upload_over_size_limit_is_rejected(inference_service):
+    with patch("app.services.inference_service.settings.INFERENCE_MAX_UPLOAD_BYTES", 16):
+        with pytest.raises(HTTPException) as exc_info:
+            await inference_service.run_inference_with_cache(make_upload(make_png(10), "a.png"))
+
+    assert exc_info.value.status_code == 413
+
+
+@pytest.mark.asyncio
+async def test_batch_serves_hits_from_one_mget_and_dedupes_misses(inference_service):
+    with patch.object(get_backend(), "infer", return_value=RAW_RESULT):
+        await inference_service.run_inference_with_cache(make_upload(make_png(10), "warm.png"))
+
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("a.png", make_png(90))
+        zf.writestr("b.png", make_png(90))
+
+    files = [make_upload(make_png(10), "cached.png")]
+    items = await inference_service.read_batch(files, make_upload(archive.getvalue(), "frames.zip"))
+
+    with patch.object(get_backend(), "infer", return_value=RAW_RESULT) as mock_infer:
+        lines = [line async for line in inference_service.stream_batch(items)]
+
+    assert [line["source"] for line in lines] == ["cache", "api", "api"]
+    assert sorted(line["filename"] for line in lines) == ["a.png", "b.png", "cached.png"]
+    assert mock_infer.call_count == 1
+
+    rerun = [line async for line in inference_service.stream_batch(items)]
+    assert {line["source"] for line in rerun} == {"cache"}
@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+from fakeredis import aioredis
+
+from app.core.job_queue import DEAD, QUEUED, SUCCEEDED, JobQueue
+from app.core.redis_client import RedisService
+
+
+@pytest.fixture
+async def queue():
+    job_queue = JobQueue(
+        RedisService(aioredis.FakeRedis(decode_responses=True)),
+        stream="test:jobs",
+        group="test-workers",
+        visibility_timeout=0,
+        max_attempts=2,
+    )
+    await job_queue.ensure_group()
+    await job_queue.ensure_group()
+    return job_queue
+
+
+@pytest.mark.asyncio
+async def test_job_lifecycle(queue):
+    job = await queue.enqueue("hash-1", b"\xff\xd8image")
+    assert job.status == QUEUED
+    assert await queue.load_image("hash-1") == b"\xff\xd8image"
+
+    [(message_id, job_id)] = await queue.claim("worker-1", block_ms=10)
+    assert job_id == job.id
+
+    running = await queue.start(job_id)
+    assert running.attempts == 1
+    await queue.complete(message_id, job_id, {"predictions": []}, "api")
+
+    done = await queue.get(job_id)
+    assert done.status == SUCCEEDED
+    assert done.to_dict()["result"] == {"predictions": []}
+    assert await queue.claim("worker-1", block_ms=10) == []
+
+
+@pytest.mark.asyncio
+async def test_retryable_failure_is_redelivered_then_dead_lettered(queue):
+    job = await queue.enqueue("hash-2", b"data")
+
+    for attempt in range(1, 3):
+        [(message_id, job_id)] = await queue.claim("worker-1", block_ms=10)
+        running = await queue.start(job_id)
+        assert running.attempts == attempt
+        await queue.fail(message_id, running, "upstream timeout")
+
+    failed = await queue.get(job.id)
+    assert failed.status == DEAD
+    assert failed.error == "upstream timeout"
+    assert await queue.client.xlen(queue.dead_letter_stream) == 1
+    assert await queue.claim("worker-1", block_ms=10) == []
+
+
+@pytest.mark.asyncio
+async def test_wait_returns_when_job_finishes(queue):
+    job = await queue.enqueue("hash-3", b"data")
+    [(message_id, job_id)] = await queue.claim("worker-1", block_ms=10)
+    await queue.start(job_id)
+
+    waiter = asyncio.create_task(queue.wait(job.id, timeout=5))
+    await asyncio.sleep(0.05)
+    await queue.complete(message_id, job_id, {"ok": True}, "api")
+
+    finished = await asyncio.wait_for(waiter, timeout=2)
+    assert finished.status == SUCCEEDED
@@ -0,0 +1,101 @@
+import asyncio
+
+import pytest
+from fakeredis import FakeServer, aioredis
+
+from app.core.local_cache import LocalCache
+from app.core.redis_client import RedisService
+
+
+def make_cache(**overrides) -> LocalCache:
+    options = {"max_entries": 3, "max_bytes": 1024, "ttl": 30, "negative_ttl": 5, **overrides}
+    return LocalCache(**options)
+
+
+def test_lru_eviction_by_entries_and_bytes():
+    cache = make_cache()
+    for key in ("a", "b", "c"):
+        cache.set(key, "v")
+    cache.get("a")
+    cache.set("d", "v")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "v"
+
+    small = make_cache(max_bytes=10)
+    small.set("a", "12345")
+    small.set("b", "12345")
+    assert small.get("a") is None
+    assert small.size_bytes == 6
+    assert small.stats.evictions == 1
+
+
+def test_expired_entries_are_dropped():
+    cache = make_cache(ttl=0)
+    cache.set("a", "v")
+
+    assert cache.get("a") is None
+    assert cache.stats.expirations == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("decode_responses", [True, False])
+async def test_redis_service_serves_hot_keys_locally_and_stays_coherent(decode_responses):
+    # decode_responses=False is REDIS_BINARY_SAFE: pub/sub payloads arrive as bytes.
+    server = FakeServer()
+    cache_a, cache_b = make_cache(), make_cache()
+    client_a = aioredis.FakeRedis(server=server, decode_responses=decode_responses)
+    client_b = aioredis.FakeRedis(server=server, decode_responses=decode_responses)
+    await cache_b.start_invalidation_listener(client_b)
+    worker_a = RedisService(client_a, local_cache=cache_a)
+    worker_b = RedisService(client_b, local_cache=cache_b)
+
+    assert await worker_b.get("hot") is None
+    assert await worker_b.get("hot") is None
+    assert cache_b.stats.negative_hits == 1
+
+    await worker_a.set("hot", "v1")
+    await asyncio.sleep(0.1)
+    assert await worker_b.get("hot") == "v1"
+    assert await worker_b.get("hot") == "v1"
+    assert cache_b.stats.hits == 1
+
+    await worker_a.set("hot", "v2")
+    await asyncio.sleep(0.1)
+    assert await worker_b.get("hot") == "v2"
+
+    await cache_b.stop_invalidation_listener()
+
+
+class StubPubSub:
+    def __init__(self, messages):
+        self.messages = list(messages)
+
+    async def get_message(self, ignore_subscribe_messages: bool, timeout: float):
+        if self.messages:
+            return self.messages.pop(0)
+        raise asyncio.CancelledError
+
+    async def aclose(self):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_listener_decodes_binary_keyspace_notifications():
+    cache = make_cache()
+    cache.set("a", "v")
+    cache.set("b", "v")
+    cache.set("c", "v")
+    pubsub = StubPubSub(
+        [
+            {"type": "pmessage", "channel": b"__keyspace@0__:a", "data": b"set"},
+            {"type": "message", "channel": b"l1:invalidate", "data": b"b"},
+        ]
+    )
+
+    await cache._listen(pubsub)
+
+    assert cache.get("a") is None
+    assert cache.get("b") is None
+    # Only the named keys go: a listener failure would have cleared the whole tier.
+    assert cache.get("c") == "v"
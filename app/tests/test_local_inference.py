@@ -0,0 +1,91 @@
+import asyncio
+import io
+
+import numpy as np
+import pytest
+from fakeredis import aioredis
+from fastapi import UploadFile
+from PIL import Image
+
+from app.core.inference_executor import InferenceExecutor
+from app.core.local_inference import DetectionModel, LocalInferenceBackend
+from app.core.redis_client import RedisService
+from app.models.inference_dto import InferenceResultDTO
+from app.services.inference_service import InferenceService
+
+
+class StubModel(DetectionModel):
+    # Two overlapping boxes in the centre of the input; NMS must keep only the stronger one.
+
+    def __init__(self, fail: bool = False):
+        super().__init__(input_size=64, class_names=["person"])
+        self.batch_sizes = []
+        self.fail = fail
+
+    def forward(self, batch: np.ndarray) -> np.ndarray:
+        self.batch_sizes.append(batch.shape[0])
+        if self.fail:
+            raise RuntimeError("model crashed")
+
+        output = np.zeros((batch.shape[0], 5, 16), dtype=np.float32)
+        output[:, :, 0] = [32, 32, 20, 10, 0.9]
+        output[:, :, 1] = [33, 32, 20, 10, 0.8]
+        output[:, :, 2] = [5, 5, 4, 4, 0.1]
+        return output
+
+
+@pytest.fixture
+async def executor():
+    pool = InferenceExecutor(max_workers=2, max_queue=8, timeout=5)
+    yield pool
+    pool.shutdown()
+
+
+def make_backend(model: DetectionModel, executor: InferenceExecutor) -> LocalInferenceBackend:
+    return LocalInferenceBackend(model, "local/stub", max_batch=8, max_wait_ms=50, executor=executor)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_one_forward_pass(executor):
+    model = StubModel()
+    backend = make_backend(model, executor)
+    image = np.zeros((160, 320, 3), dtype=np.uint8)
+
+    results = await asyncio.gather(*(backend.infer(image) for _ in range(4)))
+    await backend.close()
+
+    assert model.batch_sizes == [4]
+    assert backend.snapshot()["avg_batch_size"] == 4
+
+    result = InferenceResultDTO(**results[0])
+    assert (result.image.width, result.image.height) == (320, 160)
+    [prediction] = result.predictions
+    # Letterbox at 64px scales by 0.2 and pads 16px vertically; boxes map back to the original.
+    assert (prediction.x, prediction.y) == pytest.approx((160, 80))
+    assert (prediction.width, prediction.height) == pytest.approx((100, 50))
+    assert prediction.class_name == "person"
+
+
+@pytest.mark.asyncio
+async def test_failed_forward_pass_fails_every_caller(executor):
+    backend = make_backend(StubModel(fail=True), executor)
+    image = np.zeros((32, 32, 3), dtype=np.uint8)
+
+    results = await asyncio.gather(backend.infer(image), backend.infer(image), return_exceptions=True)
+    await backend.close()
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_inference_service_runs_on_local_backend(executor):
+    backend = make_backend(StubModel(), executor)
+    service = InferenceService(RedisService(aioredis.FakeRedis(decode_responses=True)), backend=backend)
+
+    buffer = io.BytesIO()
+    Image.new("RGB", (64, 64), "white").save(buffer, format="PNG")
+    summary = await service.run_processed_with_cache(UploadFile(file=io.BytesIO(buffer.getvalue()), filename="a.png"))
+    await backend.close()
+
+    assert summary["total_people"] == 1
+    assert summary["source"] == "api"
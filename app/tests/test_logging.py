@@ -0,0 +1,60 @@
+import io
+import json
+import logging
+import threading
+
+from app.core.logging.context import RequestContextFilter, request_id_var
+from app.core.logging.formatters import JsonFormatter
+from app.core.logging.handlers import AsyncLogHandler
+
+
+class BlockingStream(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.released = threading.Event()
+
+    def write(self, text):
+        self.released.wait(timeout=5)
+        return super().write(text)
+
+
+def make_logger(handler: logging.Handler) -> logging.Logger:
+    logger = logging.getLogger(f"test.async.{id(handler)}")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    logger.addHandler(handler)
+    return logger
+
+
+def test_async_handler_writes_structured_json_with_request_context():
+    stream = io.StringIO()
+    handler = AsyncLogHandler(queue_size=100, batch_size=10, flush_interval=0.05, stream=stream)
+    handler.setFormatter(JsonFormatter())
+    handler.addFilter(RequestContextFilter())
+    logger = make_logger(handler)
+
+    token = request_id_var.set("req-1")
+    logger.info("done %s", "ok", extra={"operation": "REDIS: GET", "duration_ms": 1.5})
+    request_id_var.reset(token)
+    handler.close()
+
+    entry = json.loads(stream.getvalue().strip())
+    assert entry["message"] == "done ok"
+    assert entry["request_id"] == "req-1"
+    assert entry["operation"] == "REDIS: GET"
+    assert entry["duration_ms"] == 1.5
+
+
+def test_async_handler_drops_and_counts_when_queue_is_full():
+    stream = BlockingStream()
+    handler = AsyncLogHandler(queue_size=5, batch_size=1, flush_interval=0.05, stream=stream)
+    logger = make_logger(handler)
+
+    for i in range(50):
+        logger.info("record %d", i)
+
+    assert handler.dropped > 0
+    stream.released.set()
+    handler.close()
+
+    assert len(stream.getvalue().splitlines()) == 50 - handler.dropped
@@ -0,0 +1,30 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from app.core.metrics import record_cache_lookup
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_exposes_route_latency_and_cache_counters(async_client):
+    await async_client.get("/health")
+    record_cache_lookup("inference", "hit")
+
+    response = await async_client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'app_http_request_duration_seconds_count{method="GET",route="/health",status="200"}' in response.text
+    assert 'app_cache_requests_total{cache="inference",result="hit"}' in response.text
+    assert "app_inference_queue_depth" in response.text
+
+
+def test_multiprocess_dir_is_created_outside_gunicorn(tmp_path):
+    # initial_setup.py and the job worker run from the same image without gunicorn's hooks.
+    directory = tmp_path / "prometheus"
+    env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(directory)}
+    subprocess.run([sys.executable, "-c", "import app.core.metrics"], env=env, check=True)
+
+    assert directory.is_dir()
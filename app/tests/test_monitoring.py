@@ -0,0 +1,65 @@
+import logging
+from unittest.mock import patch
+
+import pytest
+
+from app.core.logging.decorators import logger, monitor_async
+from app.core.logging.histogram import LatencyHistogram, latency_registry
+
+
+@pytest.fixture
+def perf_records(caplog):
+    # The "app" logger does not propagate, so the capture handler is attached directly.
+    logger.addHandler(caplog.handler)
+    yield caplog
+    logger.removeHandler(caplog.handler)
+
+
+def test_histogram_percentiles_are_within_bucket_precision():
+    histogram = LatencyHistogram("test")
+    for value_ms in range(1, 1001):
+        histogram.record(value_ms * 1_000_000)
+
+    assert histogram.count == 1000
+    assert histogram.percentile(50) == pytest.approx(500e6, rel=0.125)
+    assert histogram.percentile(99) == pytest.approx(990e6, rel=0.125)
+    assert histogram.percentile(100) <= histogram.max_ns
+
+
+@pytest.mark.asyncio
+async def test_monitor_records_latency_without_logging_unsampled_calls(perf_records):
+    @monitor_async(operation_name="TEST: Unsampled", log_args=True, sample_rate=0.0)
+    async def operation(value):
+        return value * 2
+
+    with perf_records.at_level(logging.DEBUG, logger="app.performance"):
+        assert await operation(21) == 42
+
+    assert perf_records.records == []
+    assert latency_registry.histogram("TEST: Unsampled").count == 1
+
+
+@pytest.mark.asyncio
+async def test_monitor_applies_per_operation_overrides_and_counts_errors(perf_records):
+    with patch("app.core.logging.decorators.settings.MONITOR_OPERATIONS", {"TEST:": {"level": "WARNING"}}):
+
+        @monitor_async(operation_name="TEST: Override")
+        async def operation(fail=False):
+            if fail:
+                raise ValueError("boom")
+
+    with perf_records.at_level(logging.INFO, logger="app.performance"):
+        await operation()
+        with pytest.raises(ValueError):
+            await operation(fail=True)
+
+    assert [record.levelname for record in perf_records.records] == ["WARNING", "ERROR"]
+    assert latency_registry.histogram("TEST: Override").errors == 1
+
+
+def test_disabled_monitor_returns_the_original_function():
+    async def operation():
+        return None
+
+    with patch("app.core.logging.decorators.settings.MONITOR_ENABLED", False):
+        assert monitor_async(operation_name="TEST: Disabled")(operation) is operation
@@ -0,0 +1,58 @@
+import pytest
+from fastapi import HTTPException
+
+from app.core.pagination import InvalidCursorError, decode_cursor, encode_cursor
+from app.models.user import User
+from app.repositories.user_repo import UserRepository
+from app.services.user_service import UserService
+
+
+@pytest.fixture
+async def user_service(db_session):
+    db_session.add_all(
+        User(email=f"user{i:02d}@{'test' if i % 2 else 'other'}.com", is_active=i % 3 != 0) for i in range(1, 26)
+    )
+    await db_session.commit()
+    return UserService(UserRepository(db_session))
+
+
+def test_cursor_round_trip_and_rejects_garbage():
+    assert decode_cursor(encode_cursor(42)) == 42
+
+    for cursor in ("not base64!", encode_cursor("42"), "e30"):
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(cursor)
+
+
+@pytest.mark.asyncio
+async def test_keyset_pages_cover_every_row_once(user_service):
+    seen, cursor = [], None
+    while True:
+        page, cursor = await user_service.get_users_page(cursor, limit=10)
+        seen.extend(user.id for user in page)
+        if cursor is None:
+            break
+
+    assert seen == list(range(1, 26))
+
+
+@pytest.mark.asyncio
+async def test_keyset_pages_apply_filters(user_service):
+    page, cursor = await user_service.get_users_page(limit=100, is_active=True, email_prefix="user0")
+
+    assert cursor is None
+    assert [user.id for user in page] == [1, 2, 4, 5, 7, 8]
+
+    with pytest.raises(HTTPException) as exc:
+        await user_service.get_users_page("garbage", limit=10)
+    assert exc.value.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_export_streams_csv_and_ndjson(user_service):
+    csv_body = "".join([chunk async for chunk in user_service.export_users("csv")])
+    ndjson_body = "".join([chunk async for chunk in user_service.export_users("ndjson", is_active=False)])
+
+    assert csv_body.splitlines()[0] == "email,full_name,id,is_active"
+    assert len(csv_body.splitlines()) == 26
+    assert len(ndjson_body.splitlines()) == 8
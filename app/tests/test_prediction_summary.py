@@ -0,0 +1,99 @@
+import io
+import random
+from unittest.mock import patch
+
+import pytest
+from fakeredis import aioredis
+from fastapi import UploadFile
+from PIL import Image
+
+from app.core.inference_client import get_backend
+from app.core.prediction_summary import SummaryOptions, summarize
+from app.core.redis_client import RedisService
+from app.models.inference_dto import InferenceResultDTO
+from app.services.inference_service import InferenceService
+
+
+def make_result(boxes, width=100, height=100):
+    return {
+        "inference_id": "abc",
+        "time": 0.1234,
+        "image": {"width": width, "height": height},
+        "predictions": [
+            {
+                "x": x,
+                "y": y,
+                "width": w,
+                "height": h,
+                "confidence": confidence,
+                "class": name,
+                "class_id": class_id,
+                "detection_id": f"d{i}",
+            }
+            for i, (x, y, w, h, confidence, name, class_id) in enumerate(boxes)
+        ],
+    }
+
+
+def test_summary_matches_dto_summary():
+    rng = random.Random(1)
+    raw = make_result(
+        [(rng.uniform(0, 100), rng.uniform(0, 100), 10, 20, rng.uniform(0.3, 1), "person", 0) for _ in range(500)]
+    )
+
+    summary = summarize(raw)
+    expected = InferenceResultDTO(**raw).summary()
+
+    assert {key: summary[key] for key in expected} == expected
+    assert summary["class_counts"] == {"person": 500}
+    assert summary["confidence_percentiles_%"]["p50"] <= summary["confidence_percentiles_%"]["p90"]
+
+
+def test_confidence_filter_nms_and_heatmap():
+    raw = make_result(
+        [
+            (20, 20, 10, 10, 0.9, "person", 0),
+            (21, 20, 10, 10, 0.8, "person", 0),
+            (21, 20, 10, 10, 0.7, "bag", 1),
+            (80, 80, 10, 10, 0.2, "person", 0),
+        ]
+    )
+
+    summary = summarize(raw, SummaryOptions(min_confidence=0.5, iou=0.5, heatmap_grid=2, details=False))
+
+    assert summary["total_people"] == 2
+    assert summary["class_counts"] == {"person": 1, "bag": 1}
+    assert summary["heatmap"]["counts"] == [[2, 0], [0, 0]]
+    assert "detailed_confidences" not in summary
+
+
+def test_empty_prediction_set():
+    summary = summarize(make_result([]), SummaryOptions(heatmap_grid=2))
+
+    assert summary["total_people"] == 0
+    assert summary["avg_confidence_%"] == 0
+    assert summary["confidence_percentiles_%"] == {}
+    assert summary["heatmap"]["counts"] == [[0, 0], [0, 0]]
+
+
+@pytest.mark.asyncio
+async def test_cached_summary_skips_inference_and_parsing():
+    service = InferenceService(RedisService(aioredis.FakeRedis(decode_responses=True)))
+    buffer = io.BytesIO()
+    Image.new("RGB", (32, 32), "white").save(buffer, format="PNG")
+    raw = make_result([(10, 10, 5, 5, 0.9, "person", 0)], width=32, height=32)
+
+    with patch.object(get_backend(), "infer", return_value=raw) as mock_infer:
+        first = await service.run_processed_with_cache(UploadFile(file=io.BytesIO(buffer.getvalue())))
+        with patch("app.services.inference_service.summarize") as mock_summarize:
+            second = await service.run_processed_with_cache(UploadFile(file=io.BytesIO(buffer.getvalue())))
+        filtered = await service.run_processed_with_cache(
+            UploadFile(file=io.BytesIO(buffer.getvalue())), SummaryOptions(min_confidence=0.95)
+        )
+
+    assert first["source"] == "api"
+    assert second == {**first, "source": "cache:summary"}
+    mock_summarize.assert_not_called()
+    assert filtered["source"] == "cache"
+    assert filtered["total_people"] == 0
+    assert mock_infer.call_count == 1
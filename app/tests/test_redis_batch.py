@@ -0,0 +1,46 @@
+import pytest
+from fakeredis import aioredis
+
+from app.core.local_cache import LocalCache
+from app.core.redis_client import RedisService, get_redis_service
+from app.main import app
+
+
+@pytest.fixture
+def redis_service():
+    return RedisService(aioredis.FakeRedis(decode_responses=True))
+
+
+@pytest.mark.asyncio
+async def test_batch_runs_in_one_round_trip_and_invalidates_local_copies():
+    local = LocalCache(max_entries=10, max_bytes=1024, ttl=30, negative_ttl=5)
+    service = RedisService(aioredis.FakeRedis(decode_responses=True), local_cache=local)
+    await service.set("a", "old")
+    assert await service.get("a") == "old"
+
+    async with service.batch(transaction=True) as batch:
+        batch.set("a", "new").incr("counter").get("a").exists("missing")
+
+    assert batch.results == [True, 1, "new", 0]
+    assert await service.get("a") == "new"
+
+
+@pytest.mark.asyncio
+async def test_set_many_applies_per_key_ttl(redis_service):
+    await redis_service.set_many({"short": "1", "forever": "2"}, ex={"short": 10})
+
+    assert 0 < await redis_service.client.ttl("short") <= 10
+    assert await redis_service.client.ttl("forever") == -1
+
+
+@pytest.mark.asyncio
+async def test_multi_key_cache_endpoints(async_client, redis_service):
+    app.dependency_overrides[get_redis_service] = lambda: redis_service
+    try:
+        response = await async_client.post("/cache/mset", json={"values": {"a": "1", "b": "2"}, "ex": 60})
+        assert response.status_code == 200
+
+        response = await async_client.get("/cache/mget", params=[("keys", "a"), ("keys", "b"), ("keys", "c")])
+        assert response.json() == {"values": {"a": "1", "b": "2", "c": None}, "missing": ["c"]}
+    finally:
+        app.dependency_overrides.pop(get_redis_service)
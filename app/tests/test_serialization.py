@@ -0,0 +1,62 @@
+import io
+import json
+from unittest.mock import patch
+
+import pytest
+from fakeredis import aioredis
+from fastapi import Response, UploadFile
+from PIL import Image
+
+from app.core.config import settings
+from app.core.inference_client import get_backend
+from app.core.redis_client import RedisService
+from app.core.serialization import json_envelope, model_response, read_model
+from app.schemas.user import UserRead
+from app.services.inference_service import InferenceService
+
+RAW_RESULT = {"inference_id": "abc", "time": 0.1, "image": {"width": 8, "height": 8}, "predictions": []}
+
+
+def test_json_envelope_splices_encoded_data():
+    assert json.loads(json_envelope(b'{"a":[1,2]}', source="cache", content_hash="h")) == {
+        "source": "cache",
+        "content_hash": "h",
+        "data": {"a": [1, 2]},
+    }
+    assert json.loads(json_envelope(b"[]")) == {"data": []}
+
+
+def test_model_response_is_opt_in(monkeypatch):
+    user = UserRead(id=1, email="a@test.com", full_name=None, is_active=True)
+    assert model_response(user) is user
+
+    monkeypatch.setattr(settings, "FAST_SERIALIZATION", True)
+    response = model_response(user, status_code=201)
+    assert isinstance(response, Response)
+    assert response.status_code == 201
+    assert json.loads(response.body) == user.model_dump()
+
+
+def test_read_model_trusts_stored_rows_only_when_enabled(monkeypatch):
+    row = {"id": 1, "email": "not-an-email", "full_name": None, "is_active": True}
+    with pytest.raises(ValueError):
+        read_model(UserRead, row)
+
+    monkeypatch.setattr(settings, "FAST_SERIALIZATION", True)
+    assert read_model(UserRead, row).email == "not-an-email"
+
+
+@pytest.mark.asyncio
+async def test_cached_inference_result_is_returned_as_stored_bytes():
+    service = InferenceService(RedisService(aioredis.FakeRedis(decode_responses=True)))
+    buffer = io.BytesIO()
+    Image.new("RGB", (8, 8), "white").save(buffer, format="PNG")
+
+    with patch.object(get_backend(), "infer", return_value=RAW_RESULT) as mock_infer:
+        first, content_hash = await service.run_inference_json(UploadFile(file=io.BytesIO(buffer.getvalue())))
+        with patch.object(service.redis.codec, "decode", side_effect=AssertionError("decoded")):
+            second, _ = await service.run_inference_json(UploadFile(file=io.BytesIO(buffer.getvalue())))
+
+    assert mock_infer.call_count == 1
+    assert json.loads(first) == {"source": "api", "content_hash": content_hash, "data": RAW_RESULT}
+    assert json.loads(second) == {**json.loads(first), "source": "cache"}
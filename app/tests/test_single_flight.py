@@ -0,0 +1,56 @@
+import asyncio
+
+import pytest
+from fakeredis import FakeServer, aioredis
+
+from app.core.single_flight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_collapse_into_one_call_in_process():
+    flight = SingleFlight(namespace="test", lock_ttl=5, wait_timeout=5)
+    calls = 0
+
+    async def produce():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return "value"
+
+    async def recheck():
+        return None
+
+    results = await asyncio.gather(*(flight.run("key", produce, recheck) for _ in range(10)))
+
+    assert calls == 1
+    assert [value for value, _ in results] == ["value"] * 10
+    assert sum(coalesced for _, coalesced in results) == 9
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_collapse_across_workers_via_redis():
+    server = FakeServer()
+    worker_a = SingleFlight(namespace="test", lock_ttl=5, wait_timeout=5, poll_interval=0.05)
+    worker_b = SingleFlight(namespace="test", lock_ttl=5, wait_timeout=5, poll_interval=0.05)
+    client_a = aioredis.FakeRedis(server=server, decode_responses=True)
+    client_b = aioredis.FakeRedis(server=server, decode_responses=True)
+    calls = 0
+
+    async def produce():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.1)
+        await client_a.set("result", "value")
+        return "value"
+
+    async def recheck():
+        return await client_b.get("result")
+
+    leader = asyncio.create_task(worker_a.run("key", produce, recheck, redis_client=client_a))
+    await asyncio.sleep(0.02)
+    follower = await worker_b.run("key", produce, recheck, redis_client=client_b)
+
+    assert await leader == ("value", False)
+    assert follower == ("value", True)
+    assert calls == 1
+    assert not await client_a.exists("singleflight:test:lock:key")
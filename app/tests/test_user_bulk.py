@@ -0,0 +1,65 @@
+import pytest
+from fastapi import HTTPException
+
+from app.repositories.user_repo import UserRepository
+from app.schemas.user import UserBulkUpdate, UserCreate
+from app.services.user_service import UserService
+
+
+@pytest.fixture
+def user_service(db_session):
+    return UserService(UserRepository(db_session))
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_inserts_updates_and_reports_duplicates(user_service):
+    await user_service.bulk_upsert_users([UserCreate(email="a@test.com", full_name="A")])
+
+    result = await user_service.bulk_upsert_users(
+        [
+            UserCreate(email="a@test.com", full_name="A2"),
+            UserCreate(email="b@test.com", full_name="B"),
+            UserCreate(email="b@test.com", full_name="B again"),
+        ]
+    )
+
+    assert result.processed == 2
+    assert {(u.email, u.full_name) for u in result.items} == {("a@test.com", "A2"), ("b@test.com", "B")}
+    assert [error.index for error in result.errors] == [2]
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_skip_reports_existing_emails(user_service):
+    await user_service.bulk_upsert_users([UserCreate(email="a@test.com", full_name="A")])
+
+    result = await user_service.bulk_upsert_users(
+        [UserCreate(email="c@test.com"), UserCreate(email="a@test.com", full_name="ignored")], on_conflict="skip"
+    )
+
+    assert [u.email for u in result.items] == ["c@test.com"]
+    assert [(e.index, e.detail) for e in result.errors] == [(1, "User with email a@test.com already exists.")]
+
+    with pytest.raises(HTTPException) as exc:
+        await user_service.bulk_upsert_users([UserCreate(email="d@test.com")], use_copy=True)
+    assert exc.value.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_and_delete_report_per_item_errors(user_service):
+    created = await user_service.bulk_upsert_users([UserCreate(email=f"u{i}@test.com") for i in range(3)])
+    ids = sorted(u.id for u in created.items)
+
+    result = await user_service.bulk_update_users(
+        [
+            UserBulkUpdate(id=ids[0], full_name="First", is_active=False),
+            UserBulkUpdate(id=ids[1], email="u2@test.com"),
+            UserBulkUpdate(id=999, full_name="Ghost"),
+        ]
+    )
+
+    assert [(u.id, u.full_name, u.is_active) for u in result.items] == [(ids[0], "First", False)]
+    assert sorted(e.index for e in result.errors) == [1, 2]
+
+    deleted = await user_service.bulk_delete_users([ids[0], 999, ids[2]])
+    assert deleted.processed == 2
+    assert [(e.index, e.detail) for e in deleted.errors] == [(1, "User 999 not found.")]
@@ -0,0 +1,85 @@
+from unittest.mock import patch
+
+import pytest
+from fakeredis import aioredis
+from fastapi import HTTPException
+
+from app.core.redis_client import RedisService
+from app.repositories.user_repo import UserRepository
+from app.schemas.user import UserCreate, UserUpdate
+from app.services.user_cache import UserCache
+from app.services.user_service import UserService
+
+
+@pytest.fixture
+def redis_service():
+    return RedisService(aioredis.FakeRedis(decode_responses=True))
+
+
+@pytest.fixture
+def user_service(db_session, redis_service):
+    return UserService(UserRepository(db_session), UserCache(redis_service, ttl=60, list_ttl=5))
+
+
+@pytest.mark.asyncio
+async def test_lookups_are_served_from_cache_until_a_write(user_service):
+    created = await user_service.create_user(UserCreate(email="a@test.com", full_name="A"))
+
+    with patch.object(UserRepository, "get_by_id", side_effect=AssertionError("database hit")):
+        assert (await user_service.get_user_by_id(created.id)).full_name == "A"
+        assert (await user_service.get_user_by_email("a@test.com")).id == created.id
+
+    await user_service.update_user(created.id, UserUpdate(email="b@test.com", full_name="B"))
+
+    assert (await user_service.get_user_by_id(created.id)).full_name == "B"
+    # The old email pointer still exists but must not resolve to the renamed user.
+    with pytest.raises(HTTPException) as exc:
+        await user_service.get_user_by_email("a@test.com")
+    assert exc.value.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_fill_is_rejected_when_a_write_raced_with_the_read(user_service, redis_service):
+    created = await user_service.create_user(UserCreate(email="a@test.com", full_name="A"))
+    cache = user_service.cache
+    await cache.invalidate([created.id])
+
+    version = await cache.version(created.id)
+    await cache.invalidate([created.id])
+    await cache.fill(created, version)
+
+    assert await cache.get(created.id) is None
+    await cache.fill(created, await cache.version(created.id))
+    assert (await cache.get(created.id)).email == "a@test.com"
+
+
+@pytest.mark.asyncio
+async def test_email_lookup_does_not_cache_a_row_overtaken_by_a_write(user_service):
+    created = await user_service.create_user(UserCreate(email="a@test.com", full_name="A"))
+    cache = user_service.cache
+    await cache.invalidate([created.id])
+    load_row = UserRepository.get_by_id
+
+    async def load_then_concurrent_write(repository, user_id, primary=False):
+        row = await load_row(repository, user_id, primary=primary)
+        await cache.invalidate([user_id])
+        return row
+
+    with patch.object(UserRepository, "get_by_id", load_then_concurrent_write):
+        assert (await user_service.get_user_by_email("a@test.com")).id == created.id
+
+    assert await cache.get(created.id) is None
+
+
+@pytest.mark.asyncio
+async def test_list_pages_are_cached_and_retired_by_writes(user_service):
+    await user_service.create_user(UserCreate(email="a@test.com"))
+    page, _ = await user_service.get_users_page(limit=10)
+
+    with patch.object(UserRepository, "get_page", side_effect=AssertionError("database hit")):
+        cached_page, _ = await user_service.get_users_page(limit=10)
+    assert cached_page == page
+
+    await user_service.create_user(UserCreate(email="b@test.com"))
+    page, _ = await user_service.get_users_page(limit=10)
+    assert [u.email for u in page] == ["a@test.com", "b@test.com"]
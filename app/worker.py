@@ -0,0 +1,102 @@
+import argparse
+import asyncio
+import logging
+import os
+import signal
+import socket
+
+from fastapi import HTTPException
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.http_client import outbound_http
+from app.core.inference_client import close_backend
+from app.core.inference_executor import inference_executor
+from app.core.job_queue import JobQueue
+from app.core.logging.config import setup_logging
+from app.core.redis_client import RedisService, redis_manager
+from app.services.inference_service import InferenceService
+
+logger = logging.getLogger("app.worker")
+
+
+async def process_message(queue: JobQueue, service: InferenceService, message_id: str, job_id: str) -> None:
+    job = await queue.start(job_id)
+    if job is None:
+        # The job hash expired while the message waited; nothing left to report to.
+        await queue.acknowledge(message_id)
+        return
+
+    data = await queue.load_image(job.content_hash)
+    if data is None:
+        await queue.fail(message_id, job, "Submitted image has expired", retryable=False)
+        return
+
+    try:
+        outcome = await service.infer_image(memoryview(data), job.content_hash)
+    except HTTPException as e:
+        # 4xx means the input itself is bad (undecodable image): retrying cannot help.
+        await queue.fail(message_id, job, str(e.detail), retryable=e.status_code >= 500)
+    except Exception as e:
+        logger.exception(f"Job {job_id} crashed")
+        await queue.fail(message_id, job, f"Worker error: {e}")
+    else:
+        await queue.complete(message_id, job_id, outcome["data"], outcome["source"])
+
+
+async def consume(queue: JobQueue, service: InferenceService, consumer: str, stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        try:
+            messages = await queue.claim(consumer, count=1, block_ms=1000)
+        except RedisError as e:
+            logger.error(f"Failed to read jobs: {e}")
+            await asyncio.sleep(1)
+            continue
+
+        for message_id, job_id in messages:
+            try:
+                await process_message(queue, service, message_id, job_id)
+            except RedisError as e:
+                # The message stays pending and is reclaimed after the visibility timeout.
+                logger.error(f"Failed to record result of job {job_id}: {e}")
+
+
+async def run_worker(concurrency: int) -> None:
+    await redis_manager.connect()
+    inference_executor.start()
+    outbound_http.start()
+
+    redis_service = RedisService(redis_manager.client)
+    queue = JobQueue(redis_service)
+    await queue.ensure_group()
+    service = InferenceService(redis_service=redis_service)
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop.set)
+
+    prefix = f"{socket.gethostname()}-{os.getpid()}"
+    logger.info(f">>> Inference worker {prefix} started: concurrency={concurrency}, stream={queue.stream}")
+    try:
+        # Each consumer finishes the job it holds before exiting, so SIGTERM does not lose work.
+        await asyncio.gather(*(consume(queue, service, f"{prefix}-{i}", stop) for i in range(concurrency)))
+    finally:
+        await close_backend()
+        await outbound_http.close()
+        inference_executor.shutdown()
+        await redis_manager.close()
+        logger.info(">>> Inference worker stopped.")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Consume queued inference jobs.")
+    parser.add_argument("--concurrency", type=int, default=settings.JOB_WORKER_CONCURRENCY)
+    args = parser.parse_args()
+
+    setup_logging()
+    asyncio.run(run_worker(args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
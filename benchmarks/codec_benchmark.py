@@ -0,0 +1,101 @@
+"""Compare cache codecs on Roboflow-shaped inference results.
+
+PYTHONPATH=. python -m benchmarks.codec_benchmark [--sizes 10 100 1000] [--json]
+"""
+
+import argparse
+import json
+import os
+import random
+import timeit
+
+for name, value in {
+    "DATABASE_URL": "sqlite+aiosqlite:///:memory:",
+    "REDIS_URL": "redis://localhost:6379/0",
+    "ROBOFLOW_API_KEY": "benchmark",
+    "ROBOFLOW_MODEL_ID": "benchmark/1",
+}.items():
+    os.environ.setdefault(name, value)
+
+from app.core.cache_codec import COMPRESSORS, SERIALIZERS, CacheCodec  # noqa: E402
+
+
+def make_inference_result(predictions: int, seed: int = 42) -> dict:
+    rng = random.Random(seed)
+    return {
+        "inference_id": "6c0d3d4f-8d1c-4f0e-9a59-0f3b2d7c1e55",
+        "time": 0.0734,
+        "image": {"width": 1920, "height": 1080},
+        "predictions": [
+            {
+                "x": rng.uniform(0, 1920),
+                "y": rng.uniform(0, 1080),
+                "width": rng.uniform(20, 200),
+                "height": rng.uniform(40, 400),
+                "confidence": rng.uniform(0.3, 0.99),
+                "class": "person",
+                "class_id": 0,
+                "detection_id": f"{rng.getrandbits(128):032x}",
+            }
+            for _ in range(predictions)
+        ],
+    }
+
+
+def available_codecs():
+    for serializer in SERIALIZERS:
+        for compression in COMPRESSORS:
+            try:
+                SERIALIZERS[serializer][1]()
+                COMPRESSORS[compression][1]()
+            except ImportError:
+                continue
+            yield serializer, compression
+
+
+def run(sizes, repeat: int):
+    rows = []
+    for size in sizes:
+        payload = make_inference_result(size)
+        for serializer, compression in available_codecs():
+            codec = CacheCodec(serializer, compression, compress_threshold=0, binary=True)
+            encoded = codec.encode(payload)
+            assert codec.decode(encoded) == payload
+
+            number = max(1, 20000 // max(size, 1))
+            encode_us = min(timeit.repeat(lambda: codec.encode(payload), number=number, repeat=repeat)) / number
+            decode_us = min(timeit.repeat(lambda: codec.decode(encoded), number=number, repeat=repeat)) / number
+            rows.append(
+                {
+                    "predictions": size,
+                    "codec": f"{serializer}+{compression}",
+                    "bytes": len(encoded),
+                    "encode_us": round(encode_us * 1e6, 1),
+                    "decode_us": round(decode_us * 1e6, 1),
+                }
+            )
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", action="store_true", help="print machine-readable rows")
+    args = parser.parse_args()
+
+    rows = run(args.sizes, args.repeat)
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+
+    print(f"{'predictions':>11}  {'codec':<16}{'bytes':>10}{'encode us':>12}{'decode us':>12}")
+    for row in rows:
+        print(
+            f"{row['predictions']:>11}  {row['codec']:<16}{row['bytes']:>10}"
+            f"{row['encode_us']:>12}{row['decode_us']:>12}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Import-time profile of the app from `python -X importtime`: slowest modules and heavy dependencies.
+
+PYTHONPATH=. python -m benchmarks.import_benchmark [--module app.main] [--top 25] [--repeat 5] [--json]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ENV = {
+    "DATABASE_URL": "sqlite+aiosqlite:///:memory:",
+    "REDIS_URL": "redis://localhost:6379/0",
+    "ROBOFLOW_API_KEY": "benchmark",
+    "ROBOFLOW_MODEL_ID": "benchmark/1",
+}
+HEAVY_MODULES = ("numpy", "cv2", "PIL", "onnxruntime", "sentry_sdk", "inference_sdk", "matplotlib", "scipy")
+
+
+def import_profile(module: str) -> dict:
+    # One fresh interpreter per run: module -> (self us, cumulative us), in import order.
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env={**os.environ, **{name: os.environ.get(name, value) for name, value in ENV.items()}},
+        check=True,
+    )
+
+    profile = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        own, cumulative, name = line.removeprefix("import time:").split("|")
+        profile[name.strip()] = (int(own), int(cumulative))
+    return profile
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--top", type=int, default=25, help="slowest modules to list, by cumulative time")
+    parser.add_argument("--repeat", type=int, default=5, help="interpreter runs; times are medians")
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    runs = [import_profile(args.module) for _ in range(args.repeat)]
+    names = set(runs[0]).intersection(*runs[1:])
+    rows = [
+        {
+            "module": name,
+            "self_ms": round(statistics.median(run[name][0] for run in runs) / 1000, 2),
+            "cumulative_ms": round(statistics.median(run[name][1] for run in runs) / 1000, 2),
+        }
+        for name in names
+    ]
+    rows.sort(key=lambda row: row["cumulative_ms"], reverse=True)
+    report = {
+        "module": args.module,
+        "total_ms": next(row["cumulative_ms"] for row in rows if row["module"] == args.module),
+        "modules": len(runs[0]),
+        "heavy_loaded": [name for name in HEAVY_MODULES if name in runs[0]],
+        "top": rows[: args.top],
+    }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"{args.module}: {report['total_ms']} ms, {report['modules']} modules imported")
+    print(f"heavy dependencies loaded: {', '.join(report['heavy_loaded']) or 'none'}")
+    print(f"{'module':<60}{'self ms':>10}{'cumulative ms':>15}")
+    for row in report["top"]:
+        print(f"{row['module']:<60}{row['self_ms']:>10}{row['cumulative_ms']:>15}")
+
+
+if __name__ == "__main__":
+    main()
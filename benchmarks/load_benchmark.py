@@ -0,0 +1,444 @@
+"""Offline load test of the API: throughput, p50/p99 latency and memory per scenario and concurrency.
+
+PYTHONPATH=. python -m benchmarks.load_benchmark [--mode asgi|uvicorn] [--concurrency 1 8 32] [--duration 5]
+    [--scenarios crud_create crud_read ...] [--redis fake|URL] [--database URL]
+    [--inference-latency-ms 50] [--inference-predictions 20] [--output results.json]
+    [--baseline previous.json --tolerance 0.15] [--json]
+
+Redis is an in-process fakeredis TCP server unless a URL is given, the database a temporary SQLite
+file unless a URL is given, and Roboflow a local stub server (benchmarks.stub_inference). In asgi
+mode the app runs in this process behind httpx's ASGI transport (no sockets, client and server
+share one event loop); in uvicorn mode it runs as `uvicorn app.main:app` in a subprocess and is
+driven over TCP. With --baseline the run exits with status 1 when a scenario's throughput drops
+or its p99 grows by more than --tolerance.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+import httpx
+
+SEED_USERS = 200
+SEED_KEYS = 200
+
+
+@dataclass
+class Scenario:
+    name: str
+    # Builds the request for the n-th call: (method, url, httpx keyword arguments).
+    request: Callable[[int], tuple]
+    ok_statuses: tuple = (200,)
+
+
+def png_bytes(index: int) -> bytes:
+    # A distinct, valid image per index so inference misses are real upstream calls.
+    from PIL import Image
+
+    buffer = io.BytesIO()
+    Image.new("RGB", (64, 64), (index % 256, (index // 256) % 256, (index // 65536) % 256)).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def build_scenarios(run_id: str, user_ids: List[int]) -> Dict[str, Scenario]:
+    hit_image = png_bytes(0)
+    miss_offset = int(run_id[:6], 16)
+    return {
+        "crud_create": Scenario(
+            "crud_create",
+            lambda n: ("POST", "/users/", {"json": {"email": f"load-{run_id}-{n}@example.com", "full_name": "Load"}}),
+            ok_statuses=(201,),
+        ),
+        "crud_read": Scenario("crud_read", lambda n: ("GET", f"/users/{user_ids[n % len(user_ids)]}", {})),
+        "crud_list": Scenario("crud_list", lambda n: ("GET", "/users/", {"params": {"limit": 50}})),
+        "cache_set": Scenario(
+            "cache_set", lambda n: ("POST", "/cache/set", {"params": {"key": f"load:{run_id}:{n}", "value": "v"}})
+        ),
+        "cache_get": Scenario("cache_get", lambda n: ("GET", f"/cache/get/seed:{run_id}:{n % SEED_KEYS}", {})),
+        "infer_hit": Scenario(
+            "infer_hit", lambda n: ("POST", "/infer/raw", {"files": {"file": ("hit.png", hit_image, "image/png")}})
+        ),
+        "infer_miss": Scenario(
+            "infer_miss",
+            lambda n: (
+                "POST",
+                "/infer/raw",
+                {"files": {"file": ("miss.png", png_bytes(miss_offset + n + 1), "image/png")}},
+            ),
+        ),
+    }
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    rank = (len(sorted_values) - 1) * q / 100
+    low = int(rank)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (rank - low)
+
+
+def rss_mb(pid: int) -> Optional[float]:
+    # Resident memory of the process and its direct children (uvicorn --workers), Linux only.
+    pids = [pid]
+    with contextlib.suppress(OSError):
+        with open(f"/proc/{pid}/task/{pid}/children") as f:
+            pids += [int(child) for child in f.read().split()]
+
+    total = 0
+    for process in pids:
+        try:
+            with open(f"/proc/{process}/status") as f:
+                total += next(int(line.split()[1]) for line in f if line.startswith("VmRSS:"))
+        except (OSError, StopIteration):
+            if process == pid:
+                return None
+    return round(total / 1024, 1)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def run_scenario(
+    client: httpx.AsyncClient, scenario: Scenario, concurrency: int, duration: float, counter: List[int]
+) -> dict:
+    latencies: List[float] = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async def worker():
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            n = counter[0]
+            counter[0] += 1
+            method, url, kwargs = scenario.request(n)
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, url, **kwargs)
+                ok = response.status_code in scenario.ok_statuses
+            except httpx.HTTPError:
+                ok = False
+            latencies.append(time.perf_counter() - started)
+            errors += not ok
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "scenario": scenario.name,
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "max_ms": round(latencies[-1] * 1000, 2) if latencies else 0.0,
+    }
+
+
+async def seed(client: httpx.AsyncClient, run_id: str) -> List[int]:
+    items = [{"email": f"seed-{run_id}-{i}@example.com", "full_name": f"Seed {i}"} for i in range(SEED_USERS)]
+    response = await client.post("/users/bulk", json=items)
+    response.raise_for_status()
+    response = await client.post(
+        "/cache/mset", json={"values": {f"seed:{run_id}:{i}": f"value-{i}" for i in range(SEED_KEYS)}, "ex": 3600}
+    )
+    response.raise_for_status()
+
+    # The bulk result carries counts, not ids: read them back through the export stream.
+    export = await client.get("/users/export", params={"email_prefix": f"seed-{run_id}-"})
+    return [user["id"] for user in map(json.loads, export.text.splitlines())]
+
+
+async def drive(client: httpx.AsyncClient, args, server_pid: int) -> List[dict]:
+    run_id = uuid.uuid4().hex
+    user_ids = await seed(client, run_id)
+    if not user_ids:
+        raise RuntimeError("Seeding users failed: no ids returned by /users/export")
+
+    scenarios = build_scenarios(run_id, user_ids)
+    counter = [0]
+    rows = []
+    for name in args.scenarios:
+        scenario = scenarios[name]
+        for concurrency in args.concurrency:
+            if args.warmup:
+                await run_scenario(client, scenario, concurrency, args.warmup, counter)
+            row = await run_scenario(client, scenario, concurrency, args.duration, counter)
+            row["rss_mb"] = rss_mb(server_pid)
+            rows.append(row)
+            if not args.json:
+                print_row(row)
+    return rows
+
+
+def prepare_environment(args, tmpdir: str) -> Dict[str, str]:
+    env = {
+        "DATABASE_URL": args.database or f"sqlite+aiosqlite:///{tmpdir}/load.db",
+        "REDIS_URL": args.redis_url,
+        "ROBOFLOW_API_URL": args.stub_url,
+        "ROBOFLOW_API_KEY": "load-test",
+        "ROBOFLOW_MODEL_ID": "load-test/1",
+        "INFERENCE_BACKEND": "roboflow",
+        "ENVIRONMENT": "load-test",
+        # A single client address would otherwise be rate limited after the first burst.
+        "ADMISSION_ENABLED": "true" if args.admission else "false",
+        "SENTRY_DSN": "",
+    }
+    os.environ.update(env)
+    return env
+
+
+def create_tables() -> None:
+    from app.core.database import dispose_engines
+    from app.initial_setup import init_db
+
+    async def create():
+        # Disposing closes the connection opened on this short-lived loop; an open aiosqlite
+        # connection would also keep its worker thread, and the interpreter, alive at exit.
+        await init_db()
+        await dispose_engines()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        asyncio.run(create())
+
+
+async def run_asgi(args, log_file) -> List[dict]:
+    # Logging is configured when app.main is imported; pointing stdout at the log file for the
+    # import keeps app logs out of the results while still paying for them.
+    with contextlib.redirect_stdout(log_file):
+        from app.main import app
+
+    limits = httpx.Limits(max_connections=None)
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://load", limits=limits, timeout=60) as client:
+            return await drive(client, args, os.getpid())
+
+
+async def wait_healthy(client: httpx.AsyncClient, process: subprocess.Popen, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with status {process.returncode}, see the log file")
+        with contextlib.suppress(httpx.HTTPError):
+            if (await client.get("/health")).status_code == 200:
+                return
+        await asyncio.sleep(0.1)
+    raise RuntimeError("uvicorn did not become healthy in time")
+
+
+async def run_uvicorn(args, env: Dict[str, str], log_file) -> List[dict]:
+    port = free_port()
+    command = [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--workers", str(args.workers)]
+    command += ["--log-level", "warning", "--no-access-log"]
+    process = subprocess.Popen(
+        command, env={**os.environ, **env, "PYTHONPATH": os.getcwd()}, stdout=log_file, stderr=subprocess.STDOUT
+    )
+    limits = httpx.Limits(max_connections=max(args.concurrency), max_keepalive_connections=max(args.concurrency))
+    try:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=60) as client:
+            await wait_healthy(client, process)
+            return await drive(client, args, process.pid)
+    finally:
+        process.terminate()
+        with contextlib.suppress(subprocess.TimeoutExpired):
+            process.wait(timeout=10)
+        if process.poll() is None:
+            process.kill()
+
+
+def start_fake_redis():
+    from fakeredis import TcpFakeServer
+    from fakeredis._tcp_server import Reader, TCPFakeRequestHandler
+
+    class BulkSafeReader(Reader):
+        # fakeredis strips whitespace off bulk strings, which corrupts Lua scripts (EVAL bodies
+        # end in a newline) and values with trailing whitespace; only the CRLF is dropped here.
+        def load(self):
+            line = self.reader.readline().rstrip(b"\r\n")
+            prefix, rest = line[:1], line[1:]
+            if prefix == b"*":
+                return [self.load() for _ in range(int(rest))]
+            if prefix == b"$":
+                return self.reader.read(int(rest) + 2)[:-2]
+            if prefix == b":":
+                return int(rest)
+            if prefix == b"+":
+                return rest
+            return None
+
+    class Handler(TCPFakeRequestHandler):
+        def setup(self):
+            super().setup()
+            self.reader = BulkSafeReader(self.rfile)
+
+    server = TcpFakeServer(("127.0.0.1", free_port()), server_type="redis")
+    server.RequestHandlerClass = Handler
+    threading.Thread(target=server.serve_forever, name="fake-redis", daemon=True).start()
+    host, port = server.server_address
+    return server, f"redis://{host}:{port}/0"
+
+
+def compare(rows: List[dict], baseline: List[dict], tolerance: float) -> List[str]:
+    previous = {(row["scenario"], row["concurrency"]): row for row in baseline}
+    regressions = []
+    for row in rows:
+        before = previous.get((row["scenario"], row["concurrency"]))
+        if before is None:
+            continue
+        label = f"{row['scenario']} @ {row['concurrency']}"
+        if row["rps"] < before["rps"] * (1 - tolerance):
+            regressions.append(f"{label}: throughput {before['rps']} -> {row['rps']} req/s")
+        if row["p99_ms"] > before["p99_ms"] * (1 + tolerance):
+            regressions.append(f"{label}: p99 {before['p99_ms']} -> {row['p99_ms']} ms")
+        if row["errors"] > before["errors"]:
+            regressions.append(f"{label}: errors {before['errors']} -> {row['errors']}")
+    return regressions
+
+
+def git_revision() -> Optional[str]:
+    with contextlib.suppress(OSError, subprocess.CalledProcessError):
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    return None
+
+
+def print_header():
+    print(
+        f"{'scenario':<13}{'conc':>6}{'requests':>10}{'errors':>8}{'req/s':>10}"
+        f"{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}{'rss MB':>9}"
+    )
+
+
+def print_row(row: dict):
+    print(
+        f"{row['scenario']:<13}{row['concurrency']:>6}{row['requests']:>10}{row['errors']:>8}{row['rps']:>10}"
+        f"{row['p50_ms']:>10}{row['p99_ms']:>10}{row['max_ms']:>10}{str(row['rss_mb']):>9}",
+        flush=True,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mode", choices=["asgi", "uvicorn"], default="asgi")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument(
+        "--scenarios",
+        nargs="+",
+        default=["crud_create", "crud_read", "crud_list", "cache_set", "cache_get", "infer_hit", "infer_miss"],
+        choices=list(build_scenarios("0" * 32, [0])),
+    )
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--duration", type=float, default=5.0, help="measured seconds per scenario and concurrency")
+    parser.add_argument("--warmup", type=float, default=1.0, help="unmeasured seconds before each measurement")
+    parser.add_argument("--redis", default="fake", help="'fake' for an in-process fakeredis server, or a Redis URL")
+    parser.add_argument("--database", help="database URL (default: a temporary SQLite file)")
+    parser.add_argument("--inference-latency-ms", type=float, default=50.0)
+    parser.add_argument("--inference-jitter-ms", type=float, default=0.0)
+    parser.add_argument("--inference-predictions", type=int, default=20)
+    parser.add_argument("--admission", action="store_true", help="keep admission control (rate limits) enabled")
+    parser.add_argument("--log-file", help="keep the app's logs in this file (default: discarded)")
+    parser.add_argument("--output", help="write results and run metadata to this JSON file")
+    parser.add_argument("--baseline", help="results file of a previous run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="allowed relative regression")
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    redis_server = None
+    if args.redis == "fake":
+        redis_server, args.redis_url = start_fake_redis()
+    else:
+        args.redis_url = args.redis
+
+    args.stub_url = f"http://127.0.0.1:{free_port()}"
+
+    with (
+        tempfile.TemporaryDirectory(prefix="load-benchmark-") as tmpdir,
+        open(args.log_file or f"{tmpdir}/app.log", "w") as log_file,
+    ):
+        # Settings are read once, on the first import of app.core.config (the stub's payload
+        # helper imports it too), so the environment has to be in place before anything app-side.
+        env = prepare_environment(args, tmpdir)
+        from benchmarks.stub_inference import StubServer, create_stub_app
+
+        stub_app = create_stub_app(args.inference_latency_ms, args.inference_jitter_ms, args.inference_predictions)
+        stub = StubServer(stub_app, port=int(args.stub_url.rsplit(":", 1)[1])).start()
+        create_tables()
+        if not args.json:
+            print(f"mode={args.mode} redis={args.redis} database={env['DATABASE_URL']} stub={args.stub_url}")
+            print_header()
+        try:
+            if args.mode == "asgi":
+                rows = asyncio.run(run_asgi(args, log_file))
+            else:
+                rows = asyncio.run(run_uvicorn(args, env, log_file))
+        except Exception:
+            log_file.flush()
+            with open(log_file.name) as f:
+                print("".join(f.readlines()[-40:]), file=sys.stderr)
+            raise
+        finally:
+            stub.stop()
+            if redis_server is not None:
+                redis_server.shutdown()
+
+    result = {
+        "meta": {
+            "revision": git_revision(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "mode": args.mode,
+            "workers": args.workers,
+            "redis": args.redis,
+            "database": "sqlite" if args.database is None else args.database.split(":", 1)[0],
+            "duration": args.duration,
+            "inference_latency_ms": args.inference_latency_ms,
+            "inference_predictions": args.inference_predictions,
+            "upstream_requests": stub_app.state.stats["requests"],
+        },
+        "results": rows,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+    if args.json:
+        print(json.dumps(result, indent=2))
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        for field in ("mode", "workers", "redis", "database", "inference_latency_ms", "inference_predictions"):
+            if baseline["meta"].get(field) != result["meta"][field]:
+                print(
+                    f"WARNING baseline {field}={baseline['meta'].get(field)!r} differs from this run", file=sys.stderr
+                )
+        regressions = compare(rows, baseline["results"], args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
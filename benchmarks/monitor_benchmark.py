@@ -0,0 +1,104 @@
+"""Measure the per-call overhead of monitor_async.
+
+PYTHONPATH=. python -m benchmarks.monitor_benchmark [--calls 200000] [--json]
+"""
+
+import argparse
+import asyncio
+import functools
+import io
+import json
+import logging
+import os
+import time
+
+for name, value in {
+    "DATABASE_URL": "sqlite+aiosqlite:///:memory:",
+    "REDIS_URL": "redis://localhost:6379/0",
+    "ROBOFLOW_API_KEY": "benchmark",
+    "ROBOFLOW_MODEL_ID": "benchmark/1",
+}.items():
+    os.environ.setdefault(name, value)
+
+from app.core.config import settings  # noqa: E402
+from app.core.logging.decorators import logger, monitor_async  # noqa: E402
+
+
+def legacy_monitor_async(operation_name: str, log_args: bool = False):
+    # The decorator as it was before lazy formatting and sampling, kept as the baseline.
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            extra_info = f"args={args} kwargs={kwargs}" if log_args else ""
+            logger.info(f"[START] {operation_name} {extra_info}")
+            start_time = time.time()
+            result = await func(*args, **kwargs)
+            execution_time = time.time() - start_time
+            logger.info(f"[SUCCESS] {operation_name} - Duration: {execution_time:.4f}s")
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+async def redis_get(key: str, default=None):
+    return default
+
+
+def build_variants():
+    variants = {"bare": redis_get}
+    variants["legacy (INFO, log_args)"] = legacy_monitor_async("REDIS: GET", log_args=True)(redis_get)
+    variants["monitor (INFO, log_args)"] = monitor_async("REDIS: GET", log_args=True)(redis_get)
+    variants["monitor (sampled 1%)"] = monitor_async("REDIS: GET", log_args=True, sample_rate=0.01)(redis_get)
+    variants["monitor (histogram only)"] = monitor_async("REDIS: GET", log_args=True, sample_rate=0.0)(redis_get)
+
+    settings.MONITOR_ENABLED = False
+    variants["monitor (disabled)"] = monitor_async("REDIS: GET", log_args=True)(redis_get)
+    settings.MONITOR_ENABLED = True
+    return variants
+
+
+async def measure(func, calls: int) -> float:
+    start = time.perf_counter_ns()
+    for _ in range(calls):
+        await func("inference:model:abc")
+    return (time.perf_counter_ns() - start) / calls
+
+
+async def run(calls: int):
+    # Log records are fully formatted into memory so the cost of building them is counted,
+    # without terminal I/O dominating the numbers.
+    handler = logging.StreamHandler(io.StringIO())
+    handler.setFormatter(logging.Formatter("%(asctime)s [%(levelname)s] [%(name)s] - %(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+    rows = []
+    variants = build_variants()
+    baseline = await measure(variants["bare"], calls)
+    for name, func in variants.items():
+        per_call = await measure(func, calls)
+        rows.append({"variant": name, "ns_per_call": round(per_call), "overhead_ns": round(per_call - baseline)})
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200_000)
+    parser.add_argument("--json", action="store_true", help="print machine-readable rows")
+    args = parser.parse_args()
+
+    rows = asyncio.run(run(args.calls))
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+
+    print(f"{'variant':<28}{'ns/call':>10}{'overhead ns':>14}")
+    for row in rows:
+        print(f"{row['variant']:<28}{row['ns_per_call']:>10}{row['overhead_ns']:>14}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Requests/sec of user list and inference responses, default FastAPI path vs fast serialization.
+
+PYTHONPATH=. python -m benchmarks.serialization_benchmark [--sizes 10 100 1000 10000] [--json]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from types import SimpleNamespace
+
+for name, value in {
+    "DATABASE_URL": "sqlite+aiosqlite:///:memory:",
+    "REDIS_URL": "redis://localhost:6379/0",
+    "ROBOFLOW_API_KEY": "benchmark",
+    "ROBOFLOW_MODEL_ID": "benchmark/1",
+}.items():
+    os.environ.setdefault(name, value)
+
+import orjson  # noqa: E402
+from fastapi import FastAPI, Response  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+from httpx import ASGITransport, AsyncClient  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+
+from app.core.cache_codec import CacheCodec  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.serialization import json_envelope, read_model  # noqa: E402
+from app.schemas.user import UserRead  # noqa: E402
+from benchmarks.codec_benchmark import make_inference_result  # noqa: E402
+
+USER_LIST = TypeAdapter(list[UserRead])
+
+
+def make_app(size: int) -> FastAPI:
+    # Rows stand in for ORM objects; the stored inference value is what Redis would return.
+    rows = [
+        SimpleNamespace(id=i, email=f"user{i}@example.com", full_name=f"User {i}", is_active=True) for i in range(size)
+    ]
+    codec = CacheCodec("json", "none", binary=False)
+    stored_envelope = codec.encode({"__swr__": 1, "v": make_inference_result(size), "t": time.time(), "d": 0.1})
+    stored_json = orjson.dumps(make_inference_result(size))
+
+    app = FastAPI()
+
+    @app.get("/users/default", response_model=list[UserRead])
+    async def users_default():
+        return [UserRead.model_validate(row) for row in rows]
+
+    @app.get("/users/fast", response_model=list[UserRead])
+    async def users_fast():
+        settings.FAST_SERIALIZATION = True
+        try:
+            users = [read_model(UserRead, row) for row in rows]
+        finally:
+            settings.FAST_SERIALIZATION = False
+        return Response(content=USER_LIST.dump_json(users), media_type="application/json")
+
+    @app.get("/infer/default")
+    async def infer_default():
+        data = codec.decode(stored_envelope)["v"]
+        return JSONResponse(content={"source": "cache", "content_hash": "h", "data": data})
+
+    @app.get("/infer/fast")
+    async def infer_fast():
+        return Response(
+            content=json_envelope(stored_json, source="cache", content_hash="h"), media_type="application/json"
+        )
+
+    return app
+
+
+async def measure(client: AsyncClient, path: str, requests: int) -> float:
+    await client.get(path)
+    started = time.perf_counter()
+    for _ in range(requests):
+        response = await client.get(path)
+        response.raise_for_status()
+    return requests / (time.perf_counter() - started)
+
+
+async def run(sizes, duration_requests: int):
+    rows = []
+    for size in sizes:
+        app = make_app(size)
+        requests = max(5, duration_requests // max(1, size // 10))
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+            for endpoint in ("users", "infer"):
+                default = await measure(client, f"/{endpoint}/default", requests)
+                fast = await measure(client, f"/{endpoint}/fast", requests)
+                rows.append(
+                    {
+                        "endpoint": endpoint,
+                        "items": size,
+                        "default_rps": round(default, 1),
+                        "fast_rps": round(fast, 1),
+                        "speedup": round(fast / default, 2),
+                    }
+                )
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument("--requests", type=int, default=500, help="requests per variant at 10 items")
+    parser.add_argument("--json", action="store_true", help="print machine-readable rows")
+    args = parser.parse_args()
+
+    rows = asyncio.run(run(args.sizes, args.requests))
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+
+    print(f"{'endpoint':<10}{'items':>8}{'default req/s':>16}{'fast req/s':>14}{'speedup':>10}")
+    for row in rows:
+        print(
+            f"{row['endpoint']:<10}{row['items']:>8}{row['default_rps']:>16}"
+            f"{row['fast_rps']:>14}{row['speedup']:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Stand-in for the hosted Roboflow inference API with configurable latency and payload size.
+
+PYTHONPATH=. python -m benchmarks.stub_inference [--port 9001] [--latency-ms 50] [--jitter-ms 0] [--predictions 20]
+"""
+
+import argparse
+import asyncio
+import random
+import threading
+import time
+
+import orjson
+import uvicorn
+from fastapi import FastAPI, Request, Response
+
+from benchmarks.codec_benchmark import make_inference_result
+
+
+def create_stub_app(latency_ms: float = 50.0, jitter_ms: float = 0.0, predictions: int = 20) -> FastAPI:
+    # The response body is encoded once: the stub should cost the app its network wait, not the
+    # stub's own CPU time. Stats let the harness tell cache hits from real upstream calls.
+    body = orjson.dumps(make_inference_result(predictions))
+    app = FastAPI()
+    app.state.stats = {"requests": 0, "bytes_in": 0}
+
+    @app.post("/{project}/{version}")
+    async def infer(project: str, version: str, request: Request):
+        payload = await request.body()
+        app.state.stats["requests"] += 1
+        app.state.stats["bytes_in"] += len(payload)
+
+        delay = latency_ms + (random.uniform(-jitter_ms, jitter_ms) if jitter_ms else 0.0)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+        return Response(content=body, media_type="application/json")
+
+    @app.get("/stats")
+    async def stats():
+        return app.state.stats
+
+    return app
+
+
+class StubServer:
+    # Runs a uvicorn server on a background thread so the harness and the app under test can
+    # share one process (ASGI mode) or point a subprocess at it (uvicorn mode).
+
+    def __init__(self, app: FastAPI, port: int, host: str = "127.0.0.1"):
+        config = uvicorn.Config(app, host=host, port=port, log_level="warning", lifespan="off")
+        self.server = uvicorn.Server(config)
+        self.thread = threading.Thread(target=self.server.run, name="stub-inference", daemon=True)
+
+    def start(self, timeout: float = 10.0) -> "StubServer":
+        self.thread.start()
+        deadline = time.monotonic() + timeout
+        while not self.server.started:
+            if time.monotonic() > deadline or not self.thread.is_alive():
+                raise RuntimeError("Stub inference server failed to start")
+            time.sleep(0.01)
+        return self
+
+    def stop(self) -> None:
+        self.server.should_exit = True
+        self.thread.join(timeout=5)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9001)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--predictions", type=int, default=20, help="detections per response")
+    args = parser.parse_args()
+
+    app = create_stub_app(args.latency_ms, args.jitter_ms, args.predictions)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Compare the pydantic DTO summary with the columnar numpy summary.
+
+PYTHONPATH=. python -m benchmarks.summary_benchmark [--sizes 10 100 1000 10000] [--json]
+"""
+
+import argparse
+import json
+import os
+import timeit
+
+for name, value in {
+    "DATABASE_URL": "sqlite+aiosqlite:///:memory:",
+    "REDIS_URL": "redis://localhost:6379/0",
+    "ROBOFLOW_API_KEY": "benchmark",
+    "ROBOFLOW_MODEL_ID": "benchmark/1",
+}.items():
+    os.environ.setdefault(name, value)
+
+from app.core.prediction_summary import SummaryOptions, summarize  # noqa: E402
+from app.models.inference_dto import InferenceResultDTO  # noqa: E402
+from benchmarks.codec_benchmark import make_inference_result  # noqa: E402
+
+
+def run(sizes, repeat: int):
+    variants = {
+        "dto": lambda raw: InferenceResultDTO(**raw).summary(),
+        "columnar": summarize,
+        "columnar-no-details": lambda raw: summarize(raw, SummaryOptions(details=False)),
+    }
+    rows = []
+    for size in sizes:
+        raw = make_inference_result(size)
+        number = max(1, 20000 // max(size, 1))
+        for name, func in variants.items():
+            seconds = min(timeit.repeat(lambda: func(raw), number=number, repeat=repeat)) / number
+            rows.append({"predictions": size, "variant": name, "us": round(seconds * 1e6, 1)})
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", action="store_true", help="print machine-readable rows")
+    args = parser.parse_args()
+
+    rows = run(args.sizes, args.repeat)
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+
+    print(f"{'predictions':>11}  {'variant':<22}{'us':>12}")
+    for row in rows:
+        print(f"{row['predictions']:>11}  {row['variant']:<22}{row['us']:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+import os
+import shutil
+
+from prometheus_client import multiprocess
+
+# gunicorn loads this file from the working directory automatically. The hooks keep the
+# Prometheus multiprocess directory consistent with the set of live workers.
+
+
+def env_flag(name: str) -> bool:
+    return os.environ.get(name, "").lower() in ("1", "true", "yes")
+
+
+# GUNICORN_PRELOAD=true imports the app once in the master, so forked workers share those
+# modules copy-on-write instead of each importing them. Nothing connects at import time:
+# Redis, the executor and the outbound client are started per worker in the lifespan.
+preload_app = env_flag("GUNICORN_PRELOAD")
+
+
+def on_starting(server):
+    path = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if path:
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path, exist_ok=True)
+
+
+def child_exit(server, worker):
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        multiprocess.mark_process_dead(worker.pid)
+
+
+def when_ready(server):
+    # The inference stack (numpy, OpenCV, the local runtime) is imported lazily on the first
+    # inference request. Inference-serving deployments can import it in the master as well.
+    # Only modules are loaded here; the backend itself is still created in each worker.
+    if preload_app and env_flag("GUNICORN_PRELOAD_INFERENCE"):
+        import app.services.inference_service  # noqa: F401
+        from app.core.config import settings
+
+        if settings.INFERENCE_BACKEND == "local":
+            import app.core.local_inference  # noqa: F401